@@ -1,23 +1,77 @@
-from asyncio import get_event_loop
+from asyncio import ensure_future, gather, get_event_loop
+from hashlib import sha1
 from logging import getLogger
 
+from aiohttp import ClientSession
+
 import weakref
 from service_client import ServiceClient
-from service_client.plugins import QueryParams
+from service_client.plugins import Headers, QueryParams
 from service_client.utils import build_parameter_object
 
+from aioslackbot.cache import LRUCache
+from aioslackbot.codec import get_codec
+from aioslackbot.connection import DEFAULT_DNS_CACHE_TTL, DEFAULT_KEEPALIVE_TIMEOUT, DEFAULT_POOL_SIZE, \
+    DEFAULT_POOL_SIZE_PER_HOST, get_connector_options
+from aioslackbot.dedupe import DEFAULT_WINDOW_SIZE, DedupeWindow
+from aioslackbot.dispatcher import EventDispatcher
 from aioslackbot.models import *
-from aioslackbot.utils import return_model
+from aioslackbot.outbox import Outbox
+from aioslackbot.paging import PageError, iter_items, next_cursor_request, next_history_request, next_paging_request
+from aioslackbot.ratelimit import TierRateLimit
+from aioslackbot.state import WorkspaceState
+from aioslackbot.streaming import ResponseStream, StreamResponse
+from aioslackbot.rtm import DEFAULT_BACKFILL_CONCURRENCY, DEFAULT_BACKFILL_LIMIT, DEFAULT_PING_INTERVAL, \
+    DEFAULT_PING_TIMEOUT, DEFAULT_QUEUE_SIZE, RtmSession
+from aioslackbot.utils import build_call_table, return_model
 
 __version__ = '0.1.0'
 
 SLACK_BOT_API_BASEPATH = 'https://slack.com/api'
 
+DEFAULT_RATE_LIMIT_RETRIES = 3
+"""
+Default number of times a call is retried after a ``429 Too Many Requests`` response.
+"""
+
+RTM_START_STREAM_FIELDS = ('users', 'channels', 'groups', 'mpims', 'ims', 'bots')
+"""
+Fields of :class:`~aioslackbot.models.RtmStartResponse` streamed by :meth:`RtmModule.stream_start`.
+"""
+
+
+class lazy_attribute:
+    """
+    Attribute built the first time it is used on each instance.
+
+    :param factory: Function which receives instance and returns attribute value.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.factory(instance)
+        return value
+
 
 class BaseModule:
+    name = None
+    """
+    Module name on endpoint names. By default, lower case class name without ``Module`` suffix.
+    """
+
     def __init__(self, parent, method_prefix=''):
         self._parent = weakref.ref(parent)
-        self._method_prefix = method_prefix + self.__name__[:-len('Module')]
+        self._method_prefix = method_prefix + (self.name or self.__class__.__name__[:-len('Module')].lower())
+        self._endpoints = parent.call_table.get(self._method_prefix, {})
+        self._in_flight = {}
 
     @property
     def parent(self):
@@ -55,7 +109,7 @@ class AuthModule(BaseModule):
         pass
 
     @build_parameter_object
-    @return_model
+    @return_model(single_flight=True)
     async def test(self, request: AuthTestRequest) -> AuthTestResponse:
         """
         This method checks authentication and tells you who you are.
@@ -70,7 +124,7 @@ class AuthModule(BaseModule):
 
 class BotsModule(BaseModule):
     @build_parameter_object
-    @return_model
+    @return_model(single_flight=True)
     async def info(self, request: BotsInfoRequest) -> BotsInfoResponse:
         """
         This method returns information about a bot user.
@@ -86,6 +140,21 @@ class BotsModule(BaseModule):
         """
         pass
 
+    async def get(self, bot_id):
+        """
+        Returns bot from workspace state. If it is not there, it is requested using :meth:`info`
+        and stored on state.
+
+        :param bot_id: Bot identifier.
+        :return: :class:`~aioslackbot.models.Bot` or ``None`` if it does not exist.
+        """
+        bot = self.parent.state.get_bot(bot_id)
+        if bot is None:
+            bot = (await self.info(bot=bot_id)).bot
+            if bot is not None:
+                self.parent.state.set_bot(bot)
+        return bot
+
 
 class BaseChannelsModule(BaseModule):
     """
@@ -151,7 +220,39 @@ class BaseChannelsModule(BaseModule):
         pass
 
     @build_parameter_object
-    @return_model
+    def iter_history(self, request: ChannelsHistoryRequest):
+        """
+        Iterates over messages of channel history, from newest to oldest.
+
+        Pages are requested transparently and next page is fetched while current one is processed.
+
+        .. code-block:: python
+
+            async for message in bot.channels.iter_history(channel='C1234567890'):
+                ...
+
+        :param request: Request model for first page.
+        :return: Asynchronous iterator of :class:`~aioslackbot.models.Message`.
+        :raise ~aioslackbot.paging.PageError: When a page could not be read.
+        """
+        return iter_items(self.history, request, next_history_request, 'messages')
+
+    @build_parameter_object
+    def stream_history(self, request: ChannelsHistoryRequest, raw=False):
+        """
+        Calls :meth:`history` parsing its response while it is read.
+
+        .. seealso:: :class:`~aioslackbot.streaming.ResponseStream`
+
+        :param request: Request model.
+        :param raw: Whether messages are yielded as decoded JSON instead of models.
+        :return: :class:`~aioslackbot.streaming.ResponseStream` of messages.
+        """
+        return ResponseStream(self.parent, self._endpoints['history'].name, request, ChannelsHistoryResponse,
+                              ('messages',), raw=raw)
+
+    @build_parameter_object
+    @return_model(single_flight=True)
     async def info(self, request: ChannelsInfoRequest) -> ChannelsInfoResponse:
         """
         This method returns information about a team channel.
@@ -204,7 +305,7 @@ class BaseChannelsModule(BaseModule):
         pass
 
     @build_parameter_object
-    @return_model
+    @return_model(single_flight=True)
     async def list(self, request: ChannelsListRequest) -> ChannelsListResponse:
         """
         This method returns a list of all channels in the team. This includes channels 
@@ -333,6 +434,21 @@ class ChannelsModule(BaseChannelsModule):
         """
         pass
 
+    async def get(self, channel_id):
+        """
+        Returns channel from workspace state. If it is not there, it is requested using :meth:`info`
+        and stored on state.
+
+        :param channel_id: Channel identifier.
+        :return: :class:`~aioslackbot.models.Channel` or ``None`` if it does not exist.
+        """
+        channel = self.parent.state.get_channel(channel_id)
+        if channel is None:
+            channel = (await self.info(channel=channel_id)).channel
+            if channel is not None:
+                self.parent.state.set_channel(channel)
+        return channel
+
 
 class ChatModule(BaseModule):
     @build_parameter_object
@@ -439,7 +555,7 @@ class DndModule(BaseModule):
         pass
 
     @build_parameter_object
-    @return_model
+    @return_model(single_flight=True)
     async def info(self, request: DndInfoRequest) -> DndInfoResponse:
         """
         Provides information about a user's current Do Not Disturb settings.
@@ -467,7 +583,7 @@ class DndModule(BaseModule):
         pass
 
     @build_parameter_object
-    @return_model
+    @return_model(single_flight=True)
     async def team_info(self, request: DndTeamInfoRequest) -> DndTeamInfoResponse:
         """
         Provides information about the current Do Not Disturb
@@ -483,7 +599,7 @@ class DndModule(BaseModule):
 
 class EmojiModule(BaseModule):
     @build_parameter_object
-    @return_model
+    @return_model(single_flight=True)
     async def list(self, request: EmojiListRequest) -> EmojiListResponse:
         """
         This method lists the custom emoji for a team.
@@ -515,7 +631,7 @@ class FilesModule(BaseModule):
         pass
 
     @build_parameter_object
-    @return_model
+    @return_model(single_flight=True)
     async def info(self, request: FilesInfoRequest) -> FilesInfoResponse:
         """
         This method returns information about a file in your team.
@@ -541,6 +657,24 @@ class FilesModule(BaseModule):
         """
         pass
 
+    @build_parameter_object
+    def iter_list(self, request: FilesListRequest):
+        """
+        Iterates over files of team.
+
+        Pages are requested transparently and next page is fetched while current one is processed.
+
+        .. code-block:: python
+
+            async for file in bot.files.iter_list(channel='C1234567890'):
+                ...
+
+        :param request: Request model for first page.
+        :return: Asynchronous iterator of :class:`~aioslackbot.models.File`.
+        :raise ~aioslackbot.paging.PageError: When a page could not be read.
+        """
+        return iter_items(self.list, request, next_paging_request, 'files')
+
     @build_parameter_object
     @return_model
     async def revoke_public_url(self, request: FilesRevokePublicURLRequest) -> FilesRevokePublicURLResponse:
@@ -582,6 +716,8 @@ class FilesModule(BaseModule):
 
 
 class FilesCommentsModule(BaseModule):
+    name = 'comments'
+
     @build_parameter_object
     @return_model
     async def add(self, request: FilesCommentsAddRequest) -> FilesCommentsAddResponse:
@@ -671,7 +807,7 @@ class GroupsModule(BaseChannelsModule):
         pass
 
     @build_parameter_object
-    @return_model
+    @return_model(single_flight=True)
     async def info(self, request: GroupsInfoRequest) -> GroupsInfoResponse:
         """
         This method returns information about a private channel.
@@ -683,6 +819,21 @@ class GroupsModule(BaseChannelsModule):
         """
         pass
 
+    async def get(self, group_id):
+        """
+        Returns private channel from workspace state. If it is not there, it is requested using :meth:`info`
+        and stored on state.
+
+        :param group_id: Private channel identifier.
+        :return: :class:`~aioslackbot.models.Group` or ``None`` if it does not exist.
+        """
+        group = self.parent.state.get_group(group_id)
+        if group is None:
+            group = (await self.info(channel=group_id)).group
+            if group is not None:
+                self.parent.state.set_group(group)
+        return group
+
     @build_parameter_object
     @return_model
     async def invite(self, request: GroupsInviteRequest) -> GroupsInviteResponse:
@@ -702,7 +853,7 @@ class GroupsModule(BaseChannelsModule):
         pass
 
     @build_parameter_object
-    @return_model
+    @return_model(single_flight=True)
     async def list(self, request: GroupsListRequest) -> GroupsListResponse:
         """
         This method returns a list of private channels in the team that the caller 
@@ -791,7 +942,39 @@ class ImModule(BaseModule):
         pass
 
     @build_parameter_object
-    @return_model
+    def iter_history(self, request: ImHistoryRequest):
+        """
+        Iterates over messages of direct message channel history, from newest to oldest.
+
+        Pages are requested transparently and next page is fetched while current one is processed.
+
+        .. code-block:: python
+
+            async for message in bot.im.iter_history(channel='D1234567890'):
+                ...
+
+        :param request: Request model for first page.
+        :return: Asynchronous iterator of :class:`~aioslackbot.models.Message`.
+        :raise ~aioslackbot.paging.PageError: When a page could not be read.
+        """
+        return iter_items(self.history, request, next_history_request, 'messages')
+
+    @build_parameter_object
+    def stream_history(self, request: ImHistoryRequest, raw=False):
+        """
+        Calls :meth:`history` parsing its response while it is read.
+
+        .. seealso:: :class:`~aioslackbot.streaming.ResponseStream`
+
+        :param request: Request model.
+        :param raw: Whether messages are yielded as decoded JSON instead of models.
+        :return: :class:`~aioslackbot.streaming.ResponseStream` of messages.
+        """
+        return ResponseStream(self.parent, self._endpoints['history'].name, request, ImHistoryResponse,
+                              ('messages',), raw=raw)
+
+    @build_parameter_object
+    @return_model(single_flight=True)
     async def list(self, request: ImListRequest) -> ImListResponse:
         """
         This method returns a list of all im channels that the user has.
@@ -880,7 +1063,39 @@ class MpimModule(BaseModule):
         pass
 
     @build_parameter_object
-    @return_model
+    def iter_history(self, request: MpimHistoryRequest):
+        """
+        Iterates over messages of multiparty direct message channel history, from newest to oldest.
+
+        Pages are requested transparently and next page is fetched while current one is processed.
+
+        .. code-block:: python
+
+            async for message in bot.mpim.iter_history(channel='G1234567890'):
+                ...
+
+        :param request: Request model for first page.
+        :return: Asynchronous iterator of :class:`~aioslackbot.models.Message`.
+        :raise ~aioslackbot.paging.PageError: When a page could not be read.
+        """
+        return iter_items(self.history, request, next_history_request, 'messages')
+
+    @build_parameter_object
+    def stream_history(self, request: MpimHistoryRequest, raw=False):
+        """
+        Calls :meth:`history` parsing its response while it is read.
+
+        .. seealso:: :class:`~aioslackbot.streaming.ResponseStream`
+
+        :param request: Request model.
+        :param raw: Whether messages are yielded as decoded JSON instead of models.
+        :return: :class:`~aioslackbot.streaming.ResponseStream` of messages.
+        """
+        return ResponseStream(self.parent, self._endpoints['history'].name, request, MpimHistoryResponse,
+                              ('messages',), raw=raw)
+
+    @build_parameter_object
+    @return_model(single_flight=True)
     async def list(self, request: MpimListRequest) -> MpimListResponse:
         """
         This method returns a list of all multiparty direct message channels 
@@ -988,7 +1203,7 @@ class PinsModule(BaseModule):
         pass
 
     @build_parameter_object
-    @return_model
+    @return_model(single_flight=True)
     async def list(self, request: PinsListRequest) -> PinsListResponse:
         """
         This method lists the items pinned to a channel.
@@ -1037,7 +1252,7 @@ class ReactionsModule(BaseModule):
         pass
 
     @build_parameter_object
-    @return_model
+    @return_model(single_flight=True)
     async def get(self, request: ReactionsGetRequest) -> ReactionsGetResponse:
         """
         This method returns a list of all reactions for a single item (file, 
@@ -1064,6 +1279,24 @@ class ReactionsModule(BaseModule):
         """
         pass
 
+    @build_parameter_object
+    def iter_list(self, request: ReactionsListRequest):
+        """
+        Iterates over items reacted to by a user.
+
+        Pages are requested transparently and next page is fetched while current one is processed.
+
+        .. code-block:: python
+
+            async for item in bot.reactions.iter_list(user='U1234567890'):
+                ...
+
+        :param request: Request model for first page.
+        :return: Asynchronous iterator of :class:`~aioslackbot.models.Message`.
+        :raise ~aioslackbot.paging.PageError: When a page could not be read.
+        """
+        return iter_items(self.list, request, next_paging_request, 'items')
+
     @build_parameter_object
     @return_model
     async def remove(self, request: ReactionsRemoveRequest) -> ReactionsRemoveResponse:
@@ -1125,7 +1358,7 @@ class RemindersModule(BaseModule):
         pass
 
     @build_parameter_object
-    @return_model
+    @return_model(single_flight=True)
     async def info(self, request: RemindersInfoRequest) -> RemindersInfoResponse:
         """
         This method returns information about a reminder.
@@ -1138,7 +1371,7 @@ class RemindersModule(BaseModule):
         pass
 
     @build_parameter_object
-    @return_model
+    @return_model(single_flight=True)
     async def list(self, request: RemindersListRequest) -> RemindersListResponse:
         """
         This method lists all reminders created by or for a given user.
@@ -1156,6 +1389,49 @@ class RtmModule(BaseModule):
     RTM module
     """
 
+    def __init__(self, parent, method_prefix=''):
+        super(RtmModule, self).__init__(parent, method_prefix=method_prefix)
+        self.session = None
+
+    def create_session(self, queue_size=DEFAULT_QUEUE_SIZE, backfill_concurrency=DEFAULT_BACKFILL_CONCURRENCY,
+                       backfill_limit=DEFAULT_BACKFILL_LIMIT, ping_interval=DEFAULT_PING_INTERVAL,
+                       ping_timeout=DEFAULT_PING_TIMEOUT):
+        """
+        Creates a new Real Time Messaging session.
+
+        :param queue_size: Maximum number of frames waiting to be consumed.
+        :param backfill_concurrency: Maximum number of channel histories requested at the same time
+            to backfill missed messages after a reconnection.
+        :param backfill_limit: Maximum number of missed messages recovered by channel.
+        :param ping_interval: Seconds without receiving frames before a ``ping`` is sent.
+            ``None`` disables keepalive.
+        :param ping_timeout: Seconds to wait for a ``pong`` before websocket is considered stalled.
+        :return: :class:`~aioslackbot.rtm.RtmSession`
+        """
+        return RtmSession(self, queue_size=queue_size, backfill_concurrency=backfill_concurrency,
+                          backfill_limit=backfill_limit, ping_interval=ping_interval, ping_timeout=ping_timeout)
+
+    async def run(self, request: RtmConnectRequest = None, queue_size=DEFAULT_QUEUE_SIZE, reconnect=False,
+                  backfill_concurrency=DEFAULT_BACKFILL_CONCURRENCY, backfill_limit=DEFAULT_BACKFILL_LIMIT,
+                  ping_interval=DEFAULT_PING_INTERVAL, ping_timeout=DEFAULT_PING_TIMEOUT):
+        """
+        Opens a Real Time Messaging session and routes events through bot dispatcher until it is closed.
+
+        :param request: Optional request model for :meth:`connect`.
+        :param queue_size: Maximum number of frames waiting to be dispatched.
+        :param reconnect: Whether session reconnects (and backfills missed messages) when connection is lost.
+        :param backfill_concurrency: Maximum number of channel histories requested at the same time on backfill.
+        :param backfill_limit: Maximum number of missed messages recovered by channel.
+        :param ping_interval: Seconds without receiving frames before a ``ping`` is sent.
+            ``None`` disables keepalive.
+        :param ping_timeout: Seconds to wait for a ``pong`` before websocket is considered stalled.
+        """
+        self.session = self.create_session(queue_size=queue_size, backfill_concurrency=backfill_concurrency,
+                                           backfill_limit=backfill_limit, ping_interval=ping_interval,
+                                           ping_timeout=ping_timeout)
+        await gather(self.session.run(request, reconnect=reconnect),
+                     self.parent.dispatcher.consume(self.session))
+
     @build_parameter_object
     @return_model
     async def connect(self, request: RtmConnectRequest) -> RtmConnectResponse:
@@ -1206,31 +1482,229 @@ class RtmModule(BaseModule):
         """
         pass
 
+    @build_parameter_object
+    def stream_start(self, request: RtmStartRequest):
+        """
+        Calls :meth:`start` parsing its response while it is read.
+
+        .. seealso:: :class:`~aioslackbot.streaming.ResponseStream`
+
+        :param request: Request model.
+        :return: :class:`~aioslackbot.streaming.ResponseStream` of users, channels, groups, mpims,
+            ims and bots.
+        """
+        return ResponseStream(self.parent, self._endpoints['start'].name, request, RtmStartResponse,
+                              RTM_START_STREAM_FIELDS)
+
+
+class UsersModule(BaseModule):
+    """
+    Get info on members of your Slack team.
+    """
+
+    @build_parameter_object
+    @return_model(single_flight=True)
+    async def info(self, request: UsersInfoRequest) -> UsersInfoResponse:
+        """
+        This method returns information about a member of a workspace.
+
+        .. seealso:: https://api.slack.com/methods/users.info
+
+        :param request: Request model.
+        :return: Response model.
+        """
+        pass
+
+    async def get(self, user_id):
+        """
+        Returns user from workspace state. If it is not there, it is requested using :meth:`info`
+        and stored on state.
+
+        :param user_id: User identifier.
+        :return: :class:`~aioslackbot.models.User` or ``None`` if it does not exist.
+        """
+        user = self.parent.state.get_user(user_id)
+        if user is None:
+            user = (await self.info(user=user_id)).user
+            if user is not None:
+                self.parent.state.set_user(user)
+        return user
+
+    @build_parameter_object
+    @return_model(single_flight=True)
+    async def list(self, request: UsersListRequest) -> UsersListResponse:
+        """
+        This method returns a list of all users in the workspace.
+
+        .. seealso:: https://api.slack.com/methods/users.list
+
+        :param request: Request model.
+        :return: Response model.
+        """
+        pass
+
+    @build_parameter_object
+    def iter_list(self, request: UsersListRequest):
+        """
+        Iterates over users of workspace.
+
+        Pages are requested transparently and next page is fetched while current one is processed.
+
+        .. code-block:: python
+
+            async for user in bot.users.iter_list(limit=200):
+                ...
+
+        :param request: Request model for first page.
+        :return: Asynchronous iterator of :class:`~aioslackbot.models.User`.
+        :raise ~aioslackbot.paging.PageError: When a page could not be read.
+        """
+        return iter_items(self.list, request, next_cursor_request, 'members')
+
+    @build_parameter_object
+    async def stream_list(self, request: UsersListRequest):
+        """
+        Iterates over users of workspace parsing each page while it is read. It is useful when
+        users are requested without ``limit``, so whole workspace comes on a single page.
+
+        :param request: Request model for first page.
+        :return: Asynchronous iterator of :class:`~aioslackbot.models.User`.
+        :raise ~aioslackbot.paging.PageError: When a page could not be read.
+        """
+        while request is not None:
+            stream = self.stream_list_page(request)
+            async for _, user in stream:
+                yield user
+            if not stream.response.ok:
+                raise PageError(stream.response)
+            request = next_cursor_request(request, stream.response)
+
+    @build_parameter_object
+    def stream_list_page(self, request: UsersListRequest, raw=False):
+        """
+        Calls :meth:`list` parsing its response while it is read.
+
+        .. seealso:: :class:`~aioslackbot.streaming.ResponseStream`
+
+        :param request: Request model.
+        :param raw: Whether users are yielded as decoded JSON instead of models.
+        :return: :class:`~aioslackbot.streaming.ResponseStream` of members.
+        """
+        return ResponseStream(self.parent, self._endpoints['list'].name, request, UsersListResponse,
+                              ('members',), raw=raw)
+
+
 class Bot:
+    # Modules are built on first use, so idle bots (for example, on a BotPool) stay small.
+    api = lazy_attribute(APIModule)
+    auth = lazy_attribute(AuthModule)
+    bots = lazy_attribute(BotsModule)
+    channels = lazy_attribute(ChannelsModule)
+    chat = lazy_attribute(ChatModule)
+    dnd = lazy_attribute(DndModule)
+    emoji = lazy_attribute(EmojiModule)
+    files = lazy_attribute(FilesModule)
+    groups = lazy_attribute(GroupsModule)
+    im = lazy_attribute(ImModule)
+    mpim = lazy_attribute(MpimModule)
+    oauth = lazy_attribute(OauthModule)
+    pins = lazy_attribute(PinsModule)
+    reactions = lazy_attribute(ReactionsModule)
+    rtm = lazy_attribute(RtmModule)
+    users = lazy_attribute(UsersModule)
+
+    outbox = lazy_attribute(lambda bot: Outbox(bot.chat, loop=bot.loop))
+
     def __init__(self, token, base_path=SLACK_BOT_API_BASEPATH,
-                 client_name='SlackBot', spec=None, logger=None, loop=None):
+                 client_name='SlackBot', spec=None, lazy_events=False, rate_limit=True,
+                 rate_limit_retries=DEFAULT_RATE_LIMIT_RETRIES, cache=None, connector=None,
+                 pool_size=DEFAULT_POOL_SIZE, pool_size_per_host=DEFAULT_POOL_SIZE_PER_HOST,
+                 keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT, dns_cache_ttl=DEFAULT_DNS_CACHE_TTL,
+                 ssl_context=None, codec=None, state=None, dedupe_window=DEFAULT_WINDOW_SIZE, call_table=None,
+                 logger=None, loop=None):
         from .slack_api_spec import spec as default_spec
         spec = spec or default_spec
 
+        self.token = token
         self.loop = loop or get_event_loop()
         self.logger = logger or getLogger('slack-bot')
-        plugins = [QueryParams()]
+        self.codec = get_codec(codec)
+        plugins = [QueryParams(),
+                   Headers({'Authorization': 'Bearer {}'.format(token)}),
+                   StreamResponse()]
+
+        if cache is None:
+            cache = LRUCache()
+        elif cache is False:
+            cache = None
+        self.cache = cache
+        # Cached responses belong to a workspace, so cache keys are prefixed by a hash of the token.
+        # Bots could share a cache (for example, on a BotPool) without reading each other's data.
+        self.cache_namespace = sha1(token.encode()).hexdigest()
+
+        self.rate_limit_retries = rate_limit_retries
+        self.rate_limiter = None
+        if rate_limit:
+            self.rate_limiter = TierRateLimit()
+            plugins.append(self.rate_limiter)
+
+        config = {}
+        if connector is None:
+            config['connector'] = get_connector_options(pool_size=pool_size,
+                                                        pool_size_per_host=pool_size_per_host,
+                                                        keepalive_timeout=keepalive_timeout,
+                                                        dns_cache_ttl=dns_cache_ttl,
+                                                        ssl_context=ssl_context)
+
+        # Bots using the same spec could share one call table (see BotPool)
+        self.call_table = call_table or build_call_table(spec)
 
         self.service_client = ServiceClient(name=client_name,
                                             spec=spec,
                                             base_path=base_path,
-                                            plugins=plugins)
-
-        self.api = APIModule(self)
-        self.auth = AuthModule(self)
-        self.bots = BotsModule(self)
-        self.channels = ChannelsModule(self)
-        self.chat = ChatModule(self)
-        self.dnd = DndModule(self)
-        self.emoji = EmojiModule(self)
-        self.files = FilesModule(self)
-        self.groups = GroupsModule(self)
-        self.im = ImModule(self)
-        self.mpim = MpimModule(self)
-        self.oauth = OauthModule(self)
-        self.pins = PinsModule(self)
+                                            plugins=plugins,
+                                            parser=self.codec.parse,
+                                            serializer=self.codec.serialize,
+                                            config=config,
+                                            loop=self.loop)
+
+        if connector is not None:
+            self._use_connector(connector)
+
+        # Duplicated events (for example, after a RTM reconnection) are dropped before being routed
+        dedupe = DedupeWindow(dedupe_window) if dedupe_window else None
+        self.dispatcher = EventDispatcher(lazy=lazy_events, dedupe=dedupe, logger=self.logger)
+        self.state = state or WorkspaceState()
+        self.state.register(self.dispatcher)
+
+    def _use_connector(self, connector):
+        # Service client always builds its own connector, so it is closed and replaced by the shared one.
+        # It never opened a connection, so it is closed at once.
+        unused = self.service_client.connector
+        self.service_client.session.detach()
+        ensure_future(unused.close(), loop=self.loop)
+
+        self.service_client.connector = connector
+        self.service_client.session = ClientSession(connector=connector,
+                                                    connector_owner=False,
+                                                    loop=self.loop,
+                                                    response_class=self.service_client.create_response)
+
+    async def close(self):
+        """
+        Closes bot HTTP session. Shared connectors are not closed.
+        """
+        if not self.service_client.session.closed:
+            await self.service_client.session.close()
+        self.service_client.close()
+
+    def on(self, event_type, subtype=None):
+        """
+        Decorator to register an event handler on bot dispatcher.
+
+        .. seealso:: :meth:`~aioslackbot.dispatcher.EventDispatcher.on`
+
+        :param event_type: :class:`~aioslackbot.models.EventTypeEnum` or raw event type.
+        :param subtype: Optional :class:`~aioslackbot.models.MessageSubtypeEnum` or raw subtype.
+        """
+        return self.dispatcher.on(event_type, subtype=subtype)
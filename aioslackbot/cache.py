@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from time import monotonic
+
+DEFAULT_CACHE_SIZE = 1000
+"""
+Default maximum number of responses stored on :class:`LRUCache`.
+"""
+
+
+class BaseCache:
+    """
+    Response cache interface.
+
+    Implementations must define :meth:`load`, :meth:`store` and :meth:`delete`. It could be
+    used to share cached responses between processes (for example, using Redis or Memcached).
+    Hits and misses are counted on :meth:`get`.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key):
+        """
+        Returns cached value.
+
+        :param key: Cache key.
+        :raise KeyError: When key is not cached or it expired.
+        """
+        try:
+            value = await self.load(key)
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        return value
+
+    async def set(self, key, value, ttl):
+        """
+        Stores a value.
+
+        :param key: Cache key.
+        :param value: Value to store.
+        :param ttl: Time to live in seconds.
+        """
+        await self.store(key, value, ttl)
+
+    async def load(self, key):  # pragma: no cover
+        raise NotImplementedError()
+
+    async def store(self, key, value, ttl):  # pragma: no cover
+        raise NotImplementedError()
+
+    async def delete(self, key):  # pragma: no cover
+        raise NotImplementedError()
+
+
+class LRUCache(BaseCache):
+    """
+    In process cache which evicts least recently used entries when it is full.
+
+    :param max_size: Maximum number of entries.
+    :param clock: Function which returns current time in seconds.
+    """
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE, clock=monotonic):
+        super(LRUCache, self).__init__()
+        self.max_size = max_size
+        self.clock = clock
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    async def load(self, key):
+        expires, value = self._data[key]
+        if expires <= self.clock():
+            del self._data[key]
+            raise KeyError(key)
+        self._data.move_to_end(key)
+        return value
+
+    async def store(self, key, value, ttl):
+        self._data[key] = (self.clock() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    async def delete(self, key):
+        self._data.pop(key, None)
+
+    async def clear(self):
+        self._data.clear()
@@ -0,0 +1,180 @@
+"""
+JSON codecs used to encode Web API requests and decode Web API responses and RTM frames.
+
+Standard library :mod:`json` is always available. `orjson <https://github.com/ijl/orjson>`_ and
+`ujson <https://github.com/ultrajson/ultrajson>`_ are used when they are installed.
+"""
+import json
+from datetime import datetime
+from enum import Enum
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+
+def _default(obj):
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return '{:.6f}'.format(obj.timestamp())
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(obj).__name__))
+
+
+def _prepare(obj):
+    # Values unknown by ujson must be converted before encoding
+    if isinstance(obj, dict):
+        return {k: _prepare(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_prepare(v) for v in obj]
+    if isinstance(obj, (Enum, datetime)):
+        return _default(obj)
+    return obj
+
+
+class JsonCodec:
+    """
+    Standard library JSON codec.
+
+    Instances are used as :class:`~service_client.ServiceClient` parser (:meth:`parse`) and
+    serializer (:meth:`serialize`). Slack only accepts JSON bodies on write methods, so requests
+    of endpoints flagged with ``form_encoded`` on spec are sent as form arguments instead.
+    """
+
+    name = 'json'
+    content_type = 'application/json; charset=utf-8'
+
+    def loads(self, data):
+        """
+        Decodes JSON document.
+
+        :param data: JSON document as ``bytes`` or ``str``.
+        """
+        return json.loads(data)
+
+    def dumps(self, obj):
+        """
+        Encodes an object as JSON document.
+
+        :param obj: Object to encode.
+        :return: JSON document as ``str`` or ``bytes``.
+        """
+        return json.dumps(obj, default=_default)
+
+    def parse(self, content, *args, **kwargs):
+        if not content:
+            return None
+        return self.loads(content)
+
+    def encode_form(self, data):
+        """
+        Encodes a dictionary as form arguments. Nested values are encoded as JSON documents.
+
+        :param data: Dictionary to encode.
+        :return: Dictionary of argument name to string value.
+        """
+        form = {}
+        for key, value in data.items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = 'true' if value else 'false'
+            elif isinstance(value, (dict, list, tuple)):
+                value = self.dumps(value)
+                if isinstance(value, bytes):
+                    value = value.decode('utf-8')
+            elif isinstance(value, (Enum, datetime)):
+                value = str(_default(value))
+            else:
+                value = str(value)
+            form[key] = value
+        return form
+
+    def serialize(self, payload, *args, endpoint_desc=None, request_params=None, **kwargs):
+        try:
+            payload = payload.export_data()
+        except AttributeError:
+            pass
+
+        if endpoint_desc is not None and endpoint_desc.get('form_encoded'):
+            return self.encode_form(payload)
+
+        if request_params is not None:
+            request_params.setdefault('headers', {})['Content-Type'] = self.content_type
+        return self.dumps(payload)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    orjson codec. It is the fastest one.
+    """
+
+    name = 'orjson'
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+    def dumps(self, obj):
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+class UjsonCodec(JsonCodec):
+    """
+    ujson codec.
+    """
+
+    name = 'ujson'
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+    def dumps(self, obj):
+        return ujson.dumps(_prepare(obj))
+
+
+CODECS = {JsonCodec.name: JsonCodec,
+          OrjsonCodec.name: OrjsonCodec,
+          UjsonCodec.name: UjsonCodec}
+"""
+Codec classes by name.
+"""
+
+
+def get_available_codecs():
+    """
+    Returns names of codecs which could be used, fastest first.
+    """
+    names = []
+    if orjson is not None:
+        names.append(OrjsonCodec.name)
+    if ujson is not None:
+        names.append(UjsonCodec.name)
+    names.append(JsonCodec.name)
+    return names
+
+
+def get_codec(codec=None):
+    """
+    Returns a codec.
+
+    :param codec: Codec instance, codec name or ``None`` to use fastest available codec.
+    :return: :class:`JsonCodec` instance.
+    :raise ImportError: When codec library is not installed.
+    :raise KeyError: When codec name is unknown.
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+
+    if codec is None:
+        codec = get_available_codecs()[0]
+
+    codec_class = CODECS[codec]
+    if codec not in get_available_codecs():
+        raise ImportError('JSON codec {} is not installed'.format(codec))
+    return codec_class()
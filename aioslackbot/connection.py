@@ -0,0 +1,80 @@
+import ssl
+
+from aiohttp import TCPConnector
+
+DEFAULT_POOL_SIZE = 100
+"""
+Default maximum number of open connections.
+"""
+
+DEFAULT_POOL_SIZE_PER_HOST = 0
+"""
+Default maximum number of open connections to same host. ``0`` means no limit.
+"""
+
+DEFAULT_KEEPALIVE_TIMEOUT = 30
+"""
+Default seconds an idle connection is kept open to be reused.
+"""
+
+DEFAULT_DNS_CACHE_TTL = 300
+"""
+Default seconds DNS resolutions are cached.
+"""
+
+_ssl_context = None
+
+
+def get_ssl_context():
+    """
+    Returns default SSL context shared by every connector, so certificates are loaded once and
+    TLS sessions could be reused between connectors.
+    """
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+def get_connector_options(pool_size=DEFAULT_POOL_SIZE, pool_size_per_host=DEFAULT_POOL_SIZE_PER_HOST,
+                          keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT, dns_cache_ttl=DEFAULT_DNS_CACHE_TTL,
+                          ssl_context=None):
+    """
+    Builds :class:`aiohttp.TCPConnector` keyword arguments.
+
+    :param pool_size: Maximum number of open connections.
+    :param pool_size_per_host: Maximum number of open connections to same host.
+    :param keepalive_timeout: Seconds an idle connection is kept open. ``None`` disables keep-alive.
+    :param dns_cache_ttl: Seconds DNS resolutions are cached. ``None`` caches them forever and
+        ``0`` disables DNS cache.
+    :param ssl_context: SSL context. By default, a context shared by every connector.
+    :return: Dictionary of keyword arguments.
+    """
+    options = {'limit': pool_size,
+               'limit_per_host': pool_size_per_host,
+               'use_dns_cache': dns_cache_ttl != 0,
+               'ttl_dns_cache': dns_cache_ttl or None,
+               'ssl': ssl_context or get_ssl_context()}
+
+    if keepalive_timeout is None:
+        options['force_close'] = True
+    else:
+        options['keepalive_timeout'] = keepalive_timeout
+    return options
+
+
+def create_connector(loop=None, **kwargs):
+    """
+    Creates a connector which could be shared by several :class:`~aioslackbot.Bot`.
+
+    .. code-block:: python
+
+        connector = create_connector(pool_size=200)
+        bots = [Bot(token, connector=connector) for token in tokens]
+
+    Keyword arguments are the same as :func:`get_connector_options`.
+
+    :param loop: Event loop.
+    :return: :class:`aiohttp.TCPConnector`.
+    """
+    return TCPConnector(loop=loop, **get_connector_options(**kwargs))
@@ -0,0 +1,95 @@
+"""
+Duplicated event detection.
+
+Slack could deliver an event more than once, for example after a RTM reconnection. :class:`DedupeWindow`
+remembers keys of last events in a fixed size ring, so duplicates are detected in constant time
+and memory never grows over window size.
+"""
+from .models import EventTypeEnum
+
+DEFAULT_WINDOW_SIZE = 10000
+"""
+Default number of event keys remembered.
+"""
+
+
+def event_key(data):
+    """
+    Returns identity key of a decoded frame.
+
+    Messages are identified by ``channel`` and ``ts``. Other events are identified by ``type``
+    and ``event_ts``.
+
+    :param data: Decoded JSON frame.
+    :return: Hashable key or ``None`` if frame has no identity.
+    """
+    event_type = data.get('type')
+    if event_type == EventTypeEnum.MESSAGE.value:
+        ts = data.get('ts')
+        if ts is not None:
+            return data.get('channel'), ts
+
+    event_ts = data.get('event_ts')
+    if event_ts is not None:
+        return event_type, event_ts
+    return None
+
+
+class DedupeWindow:
+    """
+    Remembers last event keys to detect duplicated events.
+
+    :param size: Maximum number of keys remembered. When it is reached, oldest key is forgotten.
+    """
+
+    def __init__(self, size=DEFAULT_WINDOW_SIZE):
+        if size < 1:
+            raise ValueError('Window size must be greater than 0')
+        self.size = size
+        self._ring = [None] * size
+        self._keys = set()
+        self._pos = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def add(self, key):
+        """
+        Remembers a key.
+
+        :param key: Hashable key.
+        :return: Whether key was already remembered.
+        """
+        if key in self._keys:
+            return True
+
+        old = self._ring[self._pos]
+        if old is not None:
+            self._keys.discard(old)
+        self._ring[self._pos] = key
+        self._keys.add(key)
+        self._pos = (self._pos + 1) % self.size
+        return False
+
+    def is_duplicate(self, data):
+        """
+        Checks whether a decoded frame was already seen, and remembers it otherwise.
+
+        :param data: Decoded JSON frame.
+        :return: Whether frame is a duplicate. Frames without identity are never duplicates.
+        """
+        key = event_key(data)
+        if key is None:
+            return False
+        return self.add(key)
+
+    def clear(self):
+        """
+        Forgets every key.
+        """
+        self._ring = [None] * self.size
+        self._keys.clear()
+        self._pos = 0
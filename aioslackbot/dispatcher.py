@@ -0,0 +1,152 @@
+from enum import Enum
+from logging import getLogger
+
+from .rtm import decode_event
+
+
+def _raw_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+class EventDispatcher:
+    """
+    Routes decoded frames to registered handlers.
+
+    Handlers are indexed by raw ``type`` and ``subtype`` strings, so frames are routed
+    with a dictionary lookup and event models are only built when someone is subscribed.
+    When ``lazy`` is set, handlers receive :class:`~aioslackbot.lazy.LazyModel` wrappers
+    which decode fields on first access.
+
+    .. code-block:: python
+
+        @bot.on(EventTypeEnum.MESSAGE, subtype=MessageSubtypeEnum.CHANNEL_JOIN)
+        async def on_join(event):
+            ...
+
+    :param lazy: Whether handlers receive lazy event models.
+    :param dedupe: Optional :class:`~aioslackbot.dedupe.DedupeWindow`. Frames already seen
+        on it are dropped before being routed.
+    :param logger: Logger.
+    """
+
+    def __init__(self, lazy=False, dedupe=None, logger=None):
+        self.lazy = lazy
+        self.dedupe = dedupe
+        self.logger = logger or getLogger('slack-bot.dispatcher')
+        self._handlers = {}
+        self._index = {}
+
+    def add_handler(self, handler, event_type, subtype=None, raw=False):
+        """
+        Registers a handler.
+
+        :param handler: Coroutine function which receives event model.
+        :param event_type: :class:`~aioslackbot.models.EventTypeEnum` or raw event type.
+        :param subtype: Optional :class:`~aioslackbot.models.MessageSubtypeEnum` or raw subtype.
+            Handlers without subtype receive every subtype of event type.
+        :param raw: Whether handler receives decoded JSON frame instead of event model.
+        """
+        key = (_raw_value(event_type), _raw_value(subtype))
+        self._handlers.setdefault(key, []).append((handler, raw))
+        self._build_index()
+
+    def remove_handler(self, handler, event_type, subtype=None):
+        """
+        Unregisters a handler.
+
+        :param handler: Coroutine function previously registered.
+        :param event_type: :class:`~aioslackbot.models.EventTypeEnum` or raw event type.
+        :param subtype: Optional :class:`~aioslackbot.models.MessageSubtypeEnum` or raw subtype.
+        """
+        key = (_raw_value(event_type), _raw_value(subtype))
+        try:
+            handlers = self._handlers[key]
+        except KeyError:
+            return
+        handlers[:] = [(h, raw) for h, raw in handlers if h != handler]
+        if not handlers:
+            del self._handlers[key]
+        self._build_index()
+
+    def on(self, event_type, subtype=None, raw=False):
+        """
+        Decorator to register a handler.
+
+        :param event_type: :class:`~aioslackbot.models.EventTypeEnum` or raw event type.
+        :param subtype: Optional :class:`~aioslackbot.models.MessageSubtypeEnum` or raw subtype.
+        :param raw: Whether handler receives decoded JSON frame instead of event model.
+        """
+        def decorator(func):
+            self.add_handler(func, event_type, subtype=subtype, raw=raw)
+            return func
+
+        return decorator
+
+    def _build_index(self):
+        index = {}
+        for (event_type, subtype), handlers in self._handlers.items():
+            if subtype is None:
+                continue
+            index[(event_type, subtype)] = tuple(self._handlers.get((event_type, None), []) + handlers)
+
+        for (event_type, subtype), handlers in self._handlers.items():
+            if subtype is None:
+                index[(event_type, None)] = tuple(handlers)
+
+        self._index = index
+
+    def get_handlers(self, event_type, subtype=None):
+        """
+        Returns handlers subscribed to a raw event type and subtype.
+
+        :param event_type: Raw event type.
+        :param subtype: Raw subtype.
+        :return: Tuple of ``(handler, raw)`` pairs.
+        """
+        try:
+            return self._index[(event_type, subtype)]
+        except KeyError:
+            return self._index.get((event_type, None), ())
+
+    async def dispatch(self, data):
+        """
+        Routes a decoded frame to its handlers.
+
+        :param data: Decoded JSON frame.
+        :return: Whether any handler was subscribed to event. Duplicated frames are not routed.
+        """
+        if self.dedupe is not None and self.dedupe.is_duplicate(data):
+            return False
+
+        handlers = self.get_handlers(data.get('type'), data.get('subtype'))
+        if not handlers:
+            return False
+
+        event = None
+        for handler, raw in handlers:
+            if raw:
+                arg = data
+            else:
+                if event is None:
+                    event = decode_event(data, lazy=self.lazy)
+                arg = event
+
+            try:
+                await handler(arg)
+            except Exception as ex:
+                self.logger.exception(ex)
+        return True
+
+    async def consume(self, session):
+        """
+        Dispatches frames from a RTM session until it is closed.
+
+        :param session: :class:`~aioslackbot.rtm.RtmSession`.
+        """
+        while True:
+            data = await session.get_raw()
+            if data is None:
+                break
+            await self.dispatch(data)
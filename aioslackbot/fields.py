@@ -0,0 +1,91 @@
+from datetime import datetime, timezone
+from sys import intern
+
+from dirty_models.fields import BaseField, StringIdField as BaseStringIdField
+
+
+class StringIdField(BaseStringIdField):
+    """
+    Identifier field. Values are interned, so every model (and array item) using same
+    identifier shares a single string object.
+    """
+
+    def use_value(self, value, creating=False):
+        value = super(StringIdField, self).use_value(value, creating=creating)
+        try:
+            return intern(value)
+        except TypeError:
+            return value
+
+
+class SlackTs(str):
+    """
+    Slack timestamp, like ``"1234567890.123456"``. It identifies messages on a channel, so it is
+    kept as original string. Slack timestamps have fixed width, so string comparison sorts them
+    chronologically.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_timestamp(cls, timestamp):
+        """
+        Builds a Slack timestamp from a POSIX timestamp.
+
+        :param timestamp: Seconds since epoch.
+        """
+        return cls('{:.6f}'.format(timestamp))
+
+    @classmethod
+    def from_datetime(cls, value):
+        """
+        Builds a Slack timestamp from a datetime. Naive datetimes are taken as UTC.
+
+        :param value: Datetime.
+        """
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return cls.from_timestamp(value.timestamp())
+
+    @property
+    def timestamp(self):
+        """
+        POSIX timestamp.
+        """
+        return float(self)
+
+    @property
+    def datetime(self):
+        """
+        UTC datetime. It is computed each time it is read.
+        """
+        return datetime.fromtimestamp(float(self), timezone.utc)
+
+
+class SlackTsField(BaseField):
+    """
+    It allows to use a :class:`SlackTs` as value in a field.
+
+    **Automatic cast from:**
+
+    * :class:`str`
+
+    * :class:`int`
+
+    * :class:`float`
+
+    * :class:`~datetime.datetime`
+    """
+
+    def convert_value(self, value):
+        if isinstance(value, datetime):
+            return SlackTs.from_datetime(value)
+        if isinstance(value, (int, float)):
+            return SlackTs.from_timestamp(value)
+        return SlackTs(value)
+
+    def check_value(self, value):
+        return isinstance(value, SlackTs)
+
+    def can_use_value(self, value):
+        return isinstance(value, (str, int, float, datetime)) and not isinstance(value, bool)
@@ -0,0 +1,99 @@
+"""
+Rolling latency metrics.
+
+:class:`LatencyWindow` keeps last round-trip times (for example, RTM ``ping``/``pong`` ones, see
+:attr:`aioslackbot.rtm.RtmSession.latency`) and summarizes them as percentiles or a histogram,
+ready to be exported to a metrics system.
+"""
+from bisect import bisect_left
+from collections import deque
+
+DEFAULT_WINDOW_SIZE = 100
+"""
+Default number of samples kept.
+"""
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+"""
+Default histogram bucket upper bounds, in seconds.
+"""
+
+
+class LatencyWindow:
+    """
+    Last latency samples, in seconds.
+
+    :param size: Maximum number of samples kept. Oldest ones are dropped first.
+    :param buckets: Sorted histogram bucket upper bounds.
+    """
+
+    def __init__(self, size=DEFAULT_WINDOW_SIZE, buckets=DEFAULT_BUCKETS):
+        self.samples = deque(maxlen=size)
+        self.buckets = tuple(buckets)
+        self.total = 0
+
+    def __len__(self):
+        return len(self.samples)
+
+    def add(self, seconds):
+        """
+        Adds a sample.
+
+        :param seconds: Latency in seconds.
+        """
+        self.samples.append(seconds)
+        self.total += 1
+
+    @property
+    def last(self):
+        """
+        Last sample or ``None``.
+        """
+        return self.samples[-1] if self.samples else None
+
+    @property
+    def mean(self):
+        """
+        Mean of samples or ``None``.
+        """
+        if not self.samples:
+            return None
+        return sum(self.samples) / len(self.samples)
+
+    def percentile(self, percent):
+        """
+        Returns a percentile of samples (nearest rank).
+
+        :param percent: Percentile, from 0 to 100.
+        :return: Latency in seconds or ``None`` if there are no samples.
+        """
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = max(int(round(percent / 100 * len(ordered))) - 1, 0)
+        return ordered[min(index, len(ordered) - 1)]
+
+    def histogram(self):
+        """
+        Counts samples by bucket.
+
+        :return: List of ``(upper bound, count)`` tuples. Last bucket upper bound is ``inf``.
+        """
+        counts = [0] * (len(self.buckets) + 1)
+        for sample in self.samples:
+            counts[bisect_left(self.buckets, sample)] += 1
+        return list(zip(self.buckets + (float('inf'),), counts))
+
+    def export_data(self):
+        """
+        Exports a summary of samples.
+
+        :return: Dictionary with ``count``, ``total``, ``last``, ``mean``, ``p50``, ``p90`` and ``p99``.
+        """
+        return {'count': len(self.samples),
+                'total': self.total,
+                'last': self.last,
+                'mean': self.mean,
+                'p50': self.percentile(50),
+                'p90': self.percentile(90),
+                'p99': self.percentile(99)}
@@ -0,0 +1,87 @@
+class LazyModel:
+    """
+    Read only wrapper which decodes model fields on demand.
+
+    It keeps raw decoded data and only builds field values (including nested models
+    and arrays) the first time they are accessed. Decoded values are cached, so
+    each field is built at most once.
+
+    .. code-block:: python
+
+        message = LazyModel(Message, data)
+        message.channel  # Only ``channel`` field is decoded.
+
+    Fields which are not defined on model class are returned as raw values, so it
+    behaves like a dynamic model for them.
+    """
+
+    __slots__ = ('_model_class', '_data', '_cache')
+
+    def __init__(self, model_class, data):
+        self._model_class = model_class
+        self._data = data
+        self._cache = {}
+
+    @property
+    def model_class(self):
+        return self._model_class
+
+    @property
+    def raw_data(self):
+        """
+        Raw decoded data.
+        """
+        return self._data
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        try:
+            return self._cache[name]
+        except KeyError:
+            pass
+
+        field = self._model_class.get_field_obj(name)
+        if field is None:
+            value = self._data.get(name)
+        else:
+            try:
+                value = self._data[field.name]
+            except KeyError:
+                value = self._model_class.__default_data__.get(field.name)
+            value = _decode_field_value(field, value)
+
+        self._cache[name] = value
+        return value
+
+    def __setattr__(self, name, value):
+        if name in self.__slots__:
+            object.__setattr__(self, name, value)
+            return
+        raise AttributeError("Lazy models are read only")
+
+    def __contains__(self, item):
+        return item in self._data
+
+    def materialize(self):
+        """
+        Builds complete model.
+
+        :return: Instance of wrapped model class.
+        """
+        return self._model_class(data=self._data)
+
+    def export_data(self):
+        return self.materialize().export_data()
+
+    def __repr__(self):
+        return 'Lazy{0}({1!r})'.format(self._model_class.__name__, self._data)
+
+
+def _decode_field_value(field, value):
+    if value is None:
+        return None
+    if field.check_value(value) or field.can_use_value(value):
+        return field.use_value(value)
+    return None
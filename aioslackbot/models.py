@@ -1,18 +1,22 @@
 from enum import Enum
 
-from dirty_models.fields import StringIdField, BooleanField, ModelField, StringField, DateTimeField, ArrayField, \
+from dirty_models.fields import BooleanField, ModelField, StringField, DateTimeField, ArrayField, \
     IntegerField, EnumField, MultiTypeField, HashMapField
+# Not interned: URLs, cursors, colors and free text are rarely repeated, but empty strings still mean unset.
+from dirty_models.fields import StringIdField as BaseStringIdField
 from dirty_models.models import FastDynamicModel, BaseModel
 
+from .fields import SlackTsField, StringIdField
+
 
 class BaseEntity(BaseModel):
     id = StringIdField(read_only=True)
 
 
 class Icons(BaseModel):
-    image_36 = StringIdField()
-    image_48 = StringIdField()
-    image_72 = StringIdField()
+    image_36 = BaseStringIdField()
+    image_48 = BaseStringIdField()
+    image_72 = BaseStringIdField()
 
 
 class Topic(BaseModel):
@@ -23,7 +27,7 @@ class Topic(BaseModel):
 
 class Edited(BaseModel):
     user = StringIdField()
-    ts = DateTimeField()
+    ts = SlackTsField()
 
 
 class MessageSubtypeEnum(Enum):
@@ -162,7 +166,7 @@ class ItemTypeEnum(Enum):
 
 class ReplyInfo(BaseModel):
     user = StringIdField()
-    ts = DateTimeField()
+    ts = SlackTsField()
 
 
 class Field(BaseModel):
@@ -184,7 +188,7 @@ class ActionTypeEnum(Enum):
 
 class ActionConfirm(BaseModel):
     title = StringField()
-    text = StringIdField()
+    text = BaseStringIdField()
     ok_text = StringField(default='Okay')
     dismiss_text = StringField(default='Cancel')
 
@@ -226,19 +230,19 @@ class Action(BaseModel):
 
 class Attachment(BaseEntity):
     fallback = StringField()
-    color = StringIdField()
+    color = BaseStringIdField()
     pretext = StringField()
     author_name = StringField()
-    author_link = StringIdField()
-    author_icon = StringIdField()
+    author_link = BaseStringIdField()
+    author_icon = BaseStringIdField()
     title = StringField()
-    title_link = StringIdField()
+    title_link = BaseStringIdField()
     text = StringField()
     fields = ArrayField(field_type=ModelField(model_class=Field))
-    image_url = StringIdField()
-    thumb_url = StringIdField()
+    image_url = BaseStringIdField()
+    thumb_url = BaseStringIdField()
     footer = StringField()
-    footer_icon = StringIdField()
+    footer_icon = BaseStringIdField()
     ts = DateTimeField()
 
     callback_id = StringIdField()
@@ -560,6 +564,12 @@ class FileModeEnum(Enum):
     POST = 'post'
 
 
+class Reaction(BaseModel):
+    name = StringIdField()
+    count = IntegerField()
+    users = ArrayField(field_type=StringIdField())
+
+
 class FileComment(BaseEntity):
     created = DateTimeField()
     timestamp = DateTimeField()
@@ -569,16 +579,10 @@ class FileComment(BaseEntity):
     reactions = ArrayField(field_type=ModelField(model_class=Reaction))
 
 
-class Reaction(BaseModel):
-    name = StringIdField()
-    count = IntegerField()
-    users = ArrayField(field_type=StringIdField())
-
-
 class File(BaseEntity):
     created = DateTimeField()
     timestamp = DateTimeField()
-    name = StringIdField()
+    name = BaseStringIdField()
     title = StringField()
     mimetype = StringIdField()
     filetype = EnumField(enum_class=FileTypeEnum)
@@ -590,23 +594,23 @@ class File(BaseEntity):
     external_type = StringField()
     username = StringIdField()
     size = IntegerField()
-    url_private = StringIdField()
-    url_private_download = StringIdField()
-    thumb_64 = StringIdField()
-    thumb_80 = StringIdField()
-    thumb_360 = StringIdField()
-    thumb_360_gif = StringIdField()
+    url_private = BaseStringIdField()
+    url_private_download = BaseStringIdField()
+    thumb_64 = BaseStringIdField()
+    thumb_80 = BaseStringIdField()
+    thumb_360 = BaseStringIdField()
+    thumb_360_gif = BaseStringIdField()
     thumb_360_w = IntegerField()
     thumb_360_h = IntegerField()
-    thumb_480 = StringIdField()
+    thumb_480 = BaseStringIdField()
     thumb_480_w = IntegerField()
     thumb_480_h = IntegerField()
-    thumb_160 = StringIdField()
-    permalink = StringIdField()
-    permalink_public = StringIdField()
-    edit_link = StringIdField()
-    preview = StringIdField()
-    preview_highlight = StringIdField()
+    thumb_160 = BaseStringIdField()
+    permalink = BaseStringIdField()
+    permalink_public = BaseStringIdField()
+    edit_link = BaseStringIdField()
+    preview = BaseStringIdField()
+    preview_highlight = BaseStringIdField()
     lines = IntegerField()
     lines_more = IntegerField()
     is_public = BooleanField()
@@ -1024,7 +1028,7 @@ class ItemTypeEnum(Enum):
     FILE_COMMENT = 'file_comment'
 
 
-class Event(BaseModel):
+class Event(FastDynamicModel):
     type = EnumField(enum_class=EventTypeEnum, read_only=True)
 
 
@@ -1034,10 +1038,10 @@ class Message(BaseModel):
     channel = StringIdField()
     user = StringIdField()
     text = StringField()
-    ts = DateTimeField()
-    deleted_ts = DateTimeField()
-    thread_ts = DateTimeField()
-    event_ts = DateTimeField()
+    ts = SlackTsField()
+    deleted_ts = SlackTsField()
+    thread_ts = SlackTsField()
+    event_ts = SlackTsField()
 
     hidden = BooleanField(default=False)
 
@@ -1068,7 +1072,7 @@ class Message(BaseModel):
     reply_count = IntegerField()
     replies = ArrayField(field_type=ModelField(model_class=ReplyInfo))
     subscribed = BooleanField()
-    last_read = DateTimeField()
+    last_read = SlackTsField()
     unread_count = IntegerField()
 
     attachments = ArrayField(field_type=ModelField(model_class=Attachment))
@@ -1113,7 +1117,7 @@ class Im(BaseEntity):
     Whether the DM channel is open. 
     """
 
-    last_read = DateTimeField()
+    last_read = SlackTsField()
     """
     It is the timestamp for the last message the calling user has read in this channel
     """
@@ -1170,7 +1174,7 @@ class Mpim(BaseEntity):
     Members of multiparty direct message channel.
     """
 
-    last_read = DateTimeField()
+    last_read = SlackTsField()
     """
     It is the timestamp for the last message the calling user has read in this channel
     """
@@ -1197,15 +1201,15 @@ class UserProfile(BaseModel):
     User profile.
     """
 
-    avatar_hash = StringIdField()
+    avatar_hash = BaseStringIdField()
     status_emoji = StringField()
     status_text = StringField()
-    first_name = StringIdField()
+    first_name = BaseStringIdField()
     last_name = StringField()
     real_name = StringField()
     email = StringField()
     skype = StringField()
-    phone = StringIdField()
+    phone = BaseStringIdField()
     image_24 = StringField()
     image_32 = StringField()
     image_48 = StringField()
@@ -1235,7 +1239,7 @@ class EnterpriseUser(BaseEntity):
     The unique ID for this particular Enterprise Organization.
     """
 
-    enterprise_name = StringIdField()
+    enterprise_name = BaseStringIdField()
     """
     The name of this umbrella organization.
     """
@@ -1259,7 +1263,7 @@ class EnterpriseUser(BaseEntity):
 class User(BaseEntity):
     name = StringIdField()
     deleted = BooleanField()
-    color = StringIdField()
+    color = BaseStringIdField()
     is_admin = BooleanField(default=False)
     is_owner = BooleanField(default=False)
     is_primary_owner = BooleanField(default=False)
@@ -1365,7 +1369,7 @@ class BaseChannel(BaseEntity):
     It will be true if the calling member is part of the channel.
     """
 
-    last_read = DateTimeField()
+    last_read = SlackTsField()
     """
     It is the timestamp for the last message the calling user has read in this channel
     """
@@ -1450,6 +1454,13 @@ class Paging(BaseModel):
     pages = IntegerField()
 
 
+class ResponseMetadata(BaseModel):
+    next_cursor = BaseStringIdField()
+    """
+    Cursor to fetch next page. It is empty when there are no more pages.
+    """
+
+
 class TeamInfo(BaseEntity):
     name = StringField()
     email_domain = StringField()
@@ -1476,6 +1487,10 @@ class BaseRequest(BaseModel):
 
 class BaseResponse(BaseModel):
     ok = BooleanField()
+    error = StringIdField()
+    """
+    Error code when response is not ok.
+    """
 
 
 class ApiTestRequest(FastDynamicModel):
@@ -1524,7 +1539,7 @@ class AuthTestResponse(BaseResponse):
     Response for :meth:`~aioslackbot.AuthModule.test`.
     """
 
-    url = StringIdField()
+    url = BaseStringIdField()
     team = StringField()
     user = StringField()
     team_id = StringIdField()
@@ -1588,12 +1603,12 @@ class ChannelsHistoryRequest(BaseRequest):
     Channel to fetch history for.
     """
 
-    latest = DateTimeField()
+    latest = SlackTsField()
     """
     End of time range of messages to include in results.
     """
 
-    oldest = DateTimeField(default=0)
+    oldest = SlackTsField(default='0')
     """
     Start of time range of messages to include in results.
     """
@@ -1619,7 +1634,7 @@ class ChannelsHistoryResponse(BaseResponse):
     Response for :meth:`~aioslackbot.ChannelsModule.history`.
     """
 
-    latest = DateTimeField()
+    latest = SlackTsField()
     messages = ArrayField(field_type=ModelField(model_class=Message))
     """
     The messages array contains up to 100 messages between latest and oldest.
@@ -1783,7 +1798,7 @@ class ChannelsMarkRequest(BaseRequest):
     Channel to set reading cursor in.
     """
 
-    ts = DateTimeField()
+    ts = SlackTsField()
     """
     Timestamp of the most recently seen message.
     """
@@ -1840,7 +1855,7 @@ class ChannelsRepliesRequest(BaseRequest):
     Channel to fetch thread from.
     """
 
-    thread_ts = DateTimeField()
+    thread_ts = SlackTsField()
     """
     Unique identifier of a thread's parent message
     """
@@ -1932,7 +1947,7 @@ class ChatDeleteRequest(BaseRequest):
     Request for :meth:`~aioslackbot.ChatModule.delete`.
     """
 
-    ts = DateTimeField()
+    ts = SlackTsField()
     """
     Timestamp of the message to be deleted.
     """
@@ -1954,7 +1969,7 @@ class ChatDeleteResponse(BaseResponse):
     Response for :meth:`~aioslackbot.ChatModule.delete`.
     """
 
-    s = DateTimeField()
+    ts = SlackTsField()
     """
     Timestamp of the message deleted.
     """
@@ -1987,7 +2002,7 @@ class ChatMeMessageResponse(BaseResponse):
     Response for :meth:`~aioslackbot.ChatModule.me_message`.
     """
 
-    s = DateTimeField()
+    ts = SlackTsField()
     """
     Timestamp of the message sent.
     """
@@ -2008,7 +2023,7 @@ class ChatPostMessageRequest(BaseRequest):
     Request for :meth:`~aioslackbot.ChatModule.post_message`.
     """
 
-    s = DateTimeField()
+    s = SlackTsField()
     """
     Timestamp of the message sent.
     """
@@ -2018,6 +2033,11 @@ class ChatPostMessageRequest(BaseRequest):
     Channel containing the message sent.
     """
 
+    text = StringField()
+    """
+    Text of the message to send.
+    """
+
     parse = EnumField(enum_class=TextParse, default=TextParse.NONE)
     """
     Change how messages are treated.
@@ -2054,7 +2074,7 @@ class ChatPostMessageRequest(BaseRequest):
     Pass true to post the message as the authed user, instead of as a bot.
     """
 
-    icon_url = StringIdField()
+    icon_url = BaseStringIdField()
     """
     URL to an image to use as the icon for this message. Must be used in 
     conjunction with ``as_user`` set to false, otherwise ignored.
@@ -2066,7 +2086,7 @@ class ChatPostMessageRequest(BaseRequest):
     used in conjunction with as_user set to false, otherwise ignored.
     """
 
-    thread_ts = DateTimeField()
+    thread_ts = SlackTsField()
     """
     Provide another message's ts value to make this message a reply. 
     Avoid using a reply's ts value; use its parent instead.
@@ -2084,7 +2104,7 @@ class ChatPostMessageResponse(BaseResponse):
     Response for :meth:`~aioslackbot.ChatModule.post_message`.
     """
 
-    ts = DateTimeField()
+    ts = SlackTsField()
     """
     Message timestamp.
     """
@@ -2110,7 +2130,7 @@ class ChatUnfurlRequest(BaseRequest):
     Channel ID of the message.
     """
 
-    ts = DateTimeField()
+    ts = SlackTsField()
     """
     Timestamp of the message to add unfurl behavior to.
     """
@@ -2139,7 +2159,7 @@ class ChatUpdateRequest(BaseRequest):
     Request for :meth:`~aioslackbot.ChatModule.update`.
     """
 
-    ts = DateTimeField()
+    ts = SlackTsField()
     """
     Timestamp of the message to be updated.
     """
@@ -2188,7 +2208,7 @@ class ChatUpdateResponse(BaseResponse):
     Channel where message was updated.
     """
 
-    ts = DateTimeField()
+    ts = SlackTsField()
     """
     Message timestamp.
     """
@@ -2567,7 +2587,7 @@ class FilesUploadRequest(BaseRequest):
     you must submit content. Used for binary files.
     """
 
-    content = StringIdField()
+    content = BaseStringIdField()
     """
     File contents via a POST variable. If omitting this parameter, 
     you must provide a file. Used for text files.
@@ -2578,7 +2598,7 @@ class FilesUploadRequest(BaseRequest):
     A file type identifier.
     """
 
-    filename = StringIdField()
+    filename = BaseStringIdField()
     """
     Filename of file.
     """
@@ -3095,17 +3115,17 @@ class OauthAccessRequest(BaseRequest):
     Issued when you created your application.
     """
 
-    client_secret = StringIdField()
+    client_secret = BaseStringIdField()
     """
     Issued when you created your application.
     """
 
-    code = StringIdField()
+    code = BaseStringIdField()
     """
     The code param returned via the OAuth callback.
     """
 
-    redirect_uri = StringIdField()
+    redirect_uri = BaseStringIdField()
     """
     This must match the originally submitted URI (if one was sent).
     """
@@ -3116,7 +3136,7 @@ class OauthAccessResponse(BaseResponse):
     Response for :meth:`~aioslackbot.OauthModule.access`.
     """
 
-    access_token = StringIdField()
+    access_token = BaseStringIdField()
     scope = StringIdField()
 
 
@@ -3140,7 +3160,7 @@ class PinsAddRequest(BaseRequest):
     File comment to pin.
     """
 
-    timestamp = DateTimeField()
+    timestamp = SlackTsField()
     """
     Timestamp of the message to pin.
     """
@@ -3192,7 +3212,7 @@ class PinsRemoveRequest(BaseRequest):
     File comment to un-pin.
     """
 
-    timestamp = DateTimeField()
+    timestamp = SlackTsField()
     """
     Timestamp of the message to un-pin.
     """
@@ -3230,7 +3250,7 @@ class ReactionsAddRequest(BaseRequest):
     File comment to add reaction to.
     """
 
-    timestamp = DateTimeField()
+    timestamp = SlackTsField()
     """
     Timestamp of the message to add reaction to.
     """
@@ -3263,7 +3283,7 @@ class ReactionsGetRequest(BaseRequest):
     File comment to get reactions for.
     """
 
-    timestamp = DateTimeField()
+    timestamp = SlackTsField()
     """
     Timestamp of the message to get reactions for.
     """
@@ -3346,7 +3366,7 @@ class ReactionsRemoveRequest(BaseRequest):
     Channel where the message to remove reaction from was posted.
     """
 
-    timestamp = DateTimeField()
+    timestamp = SlackTsField()
     """
     Timestamp of the message to remove reaction from.
     """
@@ -3473,7 +3493,7 @@ class RtmConnectResponse(BaseResponse):
     Response for :meth:`~aioslackbot.RtmModule.connect`.
     """
 
-    url = StringIdField()
+    url = BaseStringIdField()
     """
     URL to connect via websocket.
     """
@@ -3514,7 +3534,7 @@ class RtmStartResponse(BaseResponse):
     Response for :meth:`~aioslackbot.RtmModule.start`.
     """
 
-    url = StringIdField()
+    url = BaseStringIdField()
     """
     URL to connect via websocket.
     """
@@ -3572,3 +3592,64 @@ class RtmStartResponse(BaseResponse):
     """
 
 
+class UsersInfoRequest(BaseRequest):
+    """
+    Request for :meth:`~aioslackbot.UsersModule.info`.
+    """
+
+    user = StringIdField()
+    """
+    User to get info on.
+    """
+
+    include_locale = BooleanField()
+    """
+    Set this to true to receive the locale for this user.
+    """
+
+
+class UsersInfoResponse(BaseResponse):
+    """
+    Response for :meth:`~aioslackbot.UsersModule.info`.
+    """
+
+    user = ModelField(model_class=User)
+
+
+class UsersListRequest(BaseRequest):
+    """
+    Request for :meth:`~aioslackbot.UsersModule.list`.
+    """
+
+    cursor = BaseStringIdField()
+    """
+    Paginate through collections of data by setting the cursor parameter to a
+    next_cursor attribute returned by a previous request's response_metadata.
+    """
+
+    limit = IntegerField()
+    """
+    The maximum number of items to return.
+    """
+
+    presence = BooleanField()
+    """
+    Whether to include presence data in the output.
+    """
+
+    include_locale = BooleanField()
+    """
+    Set this to true to receive the locale for users.
+    """
+
+
+class UsersListResponse(BaseResponse):
+    """
+    Response for :meth:`~aioslackbot.UsersModule.list`.
+    """
+
+    members = ArrayField(field_type=ModelField(model_class=User))
+
+    cache_ts = DateTimeField()
+
+    response_metadata = ModelField(model_class=ResponseMetadata)
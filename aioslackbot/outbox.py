@@ -0,0 +1,152 @@
+from asyncio import CancelledError, Semaphore, gather
+from collections import deque
+
+from .models import ChatPostMessageRequest
+
+DEFAULT_CONCURRENCY = 10
+"""
+Default number of channels sending a message at the same time.
+"""
+
+DEFAULT_MAX_MERGE_LENGTH = 4000
+"""
+Default maximum text length of a merged message.
+"""
+
+
+class Outbox:
+    """
+    Message outbox. It sends messages using :meth:`~aioslackbot.ChatModule.post_message`.
+
+    Messages to same channel are sent one by one in the same order they were posted, while
+    different channels are sent in parallel up to ``concurrency`` limit. When ``merge`` is enabled,
+    consecutive text messages to same channel with same options are sent as a single message.
+
+    .. code-block:: python
+
+        outbox = Outbox(bot.chat, merge=True)
+        futures = [outbox.post(channel='C1', text=line) for line in lines]
+        await outbox.flush()
+
+    :param chat_module: :class:`~aioslackbot.ChatModule` of bot.
+    :param concurrency: Maximum number of messages being sent at the same time.
+    :param merge: Whether consecutive text messages to same channel must be merged.
+    :param max_merge_length: Maximum text length of a merged message.
+    :param loop: Event loop.
+    """
+
+    def __init__(self, chat_module, concurrency=DEFAULT_CONCURRENCY, merge=False,
+                 max_merge_length=DEFAULT_MAX_MERGE_LENGTH, loop=None):
+        self.chat_module = chat_module
+        self.merge = merge
+        self.max_merge_length = max_merge_length
+        self.loop = loop or chat_module.parent.loop
+
+        self._semaphore = Semaphore(concurrency)
+        self._queues = {}
+        self._workers = {}
+
+    @property
+    def pending(self):
+        """
+        Number of messages waiting to be sent.
+        """
+        return sum(len(queue) for queue in self._queues.values())
+
+    def post(self, request=None, **kwargs):
+        """
+        Enqueues a message.
+
+        :param request: :class:`~aioslackbot.models.ChatPostMessageRequest`. If it is not
+            given, it is built using keyword arguments.
+        :return: Future resolved with :class:`~aioslackbot.models.ChatPostMessageResponse`
+            once message is sent. Merged messages share response.
+        """
+        if request is None:
+            request = ChatPostMessageRequest(data=kwargs)
+
+        future = self.loop.create_future()
+        channel = request.channel
+        try:
+            queue = self._queues[channel]
+        except KeyError:
+            queue = self._queues[channel] = deque()
+        queue.append((request, future))
+
+        if channel not in self._workers:
+            self._workers[channel] = self.loop.create_task(self._drain(channel, queue))
+        return future
+
+    async def flush(self):
+        """
+        Waits until every enqueued message is sent.
+        """
+        while self._workers:
+            await gather(*list(self._workers.values()), return_exceptions=True)
+
+    async def close(self):
+        """
+        Stops sending messages. Pending messages futures are cancelled.
+        """
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await gather(*workers, return_exceptions=True)
+
+        # Workers cancelled before they started never clean up by themselves
+        for channel in list(self._workers):
+            del self._workers[channel]
+            for _, future in self._queues.pop(channel, ()):
+                future.cancel()
+
+    def _can_merge(self, request, other):
+        if request.attachments or other.attachments or request.text is None or other.text is None:
+            return False
+
+        if len(request.text) + len(other.text) + 1 > self.max_merge_length:
+            return False
+
+        data = request.export_data()
+        other_data = other.export_data()
+        data.pop('text', None)
+        other_data.pop('text', None)
+        return data == other_data
+
+    def _next_batch(self, queue):
+        request, future = queue.popleft()
+        futures = [future]
+
+        if self.merge:
+            while queue and self._can_merge(request, queue[0][0]):
+                if len(futures) == 1:
+                    request = request.copy()
+                other, future = queue.popleft()
+                request.text = '\n'.join((request.text, other.text))
+                futures.append(future)
+        return request, futures
+
+    async def _drain(self, channel, queue):
+        futures = []
+        try:
+            while queue:
+                request, futures = self._next_batch(queue)
+                try:
+                    async with self._semaphore:
+                        response = await self.chat_module.post_message(request)
+                except CancelledError:
+                    raise
+                except Exception as ex:
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(ex)
+                else:
+                    for future in futures:
+                        if not future.done():
+                            future.set_result(response)
+                futures = []
+        finally:
+            for future in futures + [future for _, future in queue]:
+                future.cancel()
+            queue.clear()
+            self._workers.pop(channel, None)
+            self._queues.pop(channel, None)
@@ -0,0 +1,105 @@
+from asyncio import ensure_future
+
+
+class PageError(Exception):
+    """
+    A page of a listing could not be read, so listing would be incomplete.
+
+    :param response: Failed page response.
+    """
+
+    def __init__(self, response):
+        super(PageError, self).__init__('Page request failed: {}'.format(response.error or 'unknown error'))
+        self.response = response
+        self.error = response.error
+
+
+def next_history_request(request, response):
+    """
+    Builds request for next (older) page of a history method.
+
+    :param request: Current page request.
+    :param response: Current page response.
+    :return: Next page request or ``None`` if there are no more pages.
+    """
+    if not response.has_more or not response.messages:
+        return None
+
+    request = request.copy()
+    request.latest = response.messages[-1].ts
+    request.inclusive = False
+    return request
+
+
+def next_paging_request(request, response):
+    """
+    Builds request for next page of a method using :class:`~aioslackbot.models.Paging`.
+
+    :param request: Current page request.
+    :param response: Current page response.
+    :return: Next page request or ``None`` if there are no more pages.
+    """
+    paging = response.paging
+    if paging is None or not paging.page or not paging.pages or paging.page >= paging.pages:
+        return None
+
+    request = request.copy()
+    request.page = paging.page + 1
+    return request
+
+
+def next_cursor_request(request, response):
+    """
+    Builds request for next page of a method using cursor pagination.
+
+    :param request: Current page request.
+    :param response: Current page response.
+    :return: Next page request or ``None`` if there are no more pages.
+    """
+    metadata = response.response_metadata
+    if metadata is None or not metadata.next_cursor:
+        return None
+
+    request = request.copy()
+    request.cursor = metadata.next_cursor
+    return request
+
+
+async def iter_pages(method, request, next_request):
+    """
+    Yields responses of every page. Next page is requested while current one is being processed.
+
+    :param method: Module method to call.
+    :param request: First page request.
+    :param next_request: Function which builds next page request from current request and response.
+    :raise PageError: When a page response is not ok (``429 Too Many Requests`` responses are
+        retried before).
+    """
+    task = ensure_future(method(request))
+    try:
+        while task is not None:
+            response = await task
+            if not response.ok:
+                task = None
+                raise PageError(response)
+            request = next_request(request, response)
+            task = ensure_future(method(request)) if request is not None else None
+            yield response
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+async def iter_items(method, request, next_request, items_field):
+    """
+    Yields items of every page. Only current and next pages are kept in memory.
+
+    :param method: Module method to call.
+    :param request: First page request.
+    :param next_request: Function which builds next page request from current request and response.
+    :param items_field: Name of response field which contains items.
+    :raise PageError: When a page response is not ok.
+    """
+    async for response in iter_pages(method, request, next_request):
+        for item in getattr(response, items_field) or []:
+            yield item
@@ -0,0 +1,188 @@
+"""
+On-disk snapshots of workspace state.
+
+Loading a workspace from :meth:`~aioslackbot.RtmModule.start` takes a long time on big workspaces.
+:class:`StateStore` saves :class:`~aioslackbot.state.WorkspaceState` entities to a SQLite
+database, so a restarted bot loads them from disk in a fraction of that time and reconciles them
+with Slack in background.
+
+.. code-block:: python
+
+    store = StateStore('workspace.db')
+    await store.restore(bot)
+    await bot.rtm.run()
+
+    ...
+    await store.save(bot.state)
+"""
+import sqlite3
+from asyncio import get_event_loop
+from datetime import datetime
+from enum import Enum
+from time import time
+
+from dirty_models.models import FastDynamicModel
+
+from .codec import get_codec
+from .models import Channel, Group, Im, Mpim, RtmStartRequest, User
+
+SCHEMA_VERSION = 1
+"""
+Version of database schema. Databases with a different version are ignored.
+"""
+
+ENTITY_KINDS = (('users', User, 'set_user'),
+                ('channels', Channel, 'set_channel'),
+                ('groups', Group, 'set_group'),
+                ('ims', Im, 'set_im'),
+                ('mpims', Mpim, 'set_mpim'),
+                ('bots', FastDynamicModel, 'set_bot'))
+"""
+Stored state indexes, with their model class and setter.
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE IF NOT EXISTS entities (kind TEXT NOT NULL, id TEXT NOT NULL, data BLOB NOT NULL,
+                                     PRIMARY KEY (kind, id)) WITHOUT ROWID;
+"""
+
+
+def _storable(obj):
+    # Exported data must be read back by model fields: datetime fields only accept
+    # integer timestamps or ISO strings
+    if isinstance(obj, dict):
+        return {k: _storable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_storable(v) for v in obj]
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        if obj.microsecond:
+            return obj.isoformat()
+        return int(obj.timestamp())
+    return obj
+
+
+class StateStore:
+    """
+    SQLite store of workspace state snapshots.
+
+    Every entity is stored as a row of encoded model data. Database operations run on an executor,
+    so event loop is not blocked while a snapshot is written or read.
+
+    :param path: Database file path.
+    :param codec: :class:`~aioslackbot.codec.JsonCodec` (or its name) used to encode entities.
+        Fastest available one by default.
+    :param loop: Event loop.
+    """
+
+    def __init__(self, path, codec=None, loop=None):
+        self.path = path
+        self.codec = get_codec(codec)
+        self.loop = loop or get_event_loop()
+        self.saved_at = None
+        self.reconcile_task = None
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def _run(self, func, *args):
+        return self.loop.run_in_executor(None, func, *args)
+
+    def _write(self, rows):
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute('DELETE FROM entities')
+                connection.executemany('INSERT INTO entities (kind, id, data) VALUES (?, ?, ?)', rows)
+                connection.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                                       (('version', SCHEMA_VERSION), ('saved_at', self.saved_at)))
+        finally:
+            connection.close()
+
+    def _read(self):
+        connection = self._connect()
+        try:
+            meta = dict(connection.execute('SELECT key, value FROM meta'))
+            if meta.get('version') != SCHEMA_VERSION:
+                return None, []
+
+            model_classes = {kind: model_class for kind, model_class, _ in ENTITY_KINDS}
+            loads = self.codec.loads
+            return meta.get('saved_at'), [(kind, model_classes[kind](data=loads(data)))
+                                          for kind, data in connection.execute('SELECT kind, data FROM entities')
+                                          if kind in model_classes]
+        finally:
+            connection.close()
+
+    async def save(self, state):
+        """
+        Writes a snapshot of workspace state, replacing previous one.
+
+        :param state: :class:`~aioslackbot.state.WorkspaceState`.
+        :return: Number of entities written.
+        """
+        dumps = self.codec.dumps
+        # Entities are exported on event loop, so they do not change while they are read
+        rows = [(kind, entity_id, dumps(_storable(entity.export_data())))
+                for kind, _, _ in ENTITY_KINDS
+                for entity_id, entity in getattr(state, kind).items()]
+        self.saved_at = time()
+        await self._run(self._write, rows)
+        return len(rows)
+
+    async def load(self, state):
+        """
+        Replaces workspace state with last saved snapshot.
+
+        :param state: :class:`~aioslackbot.state.WorkspaceState`.
+        :return: Number of entities loaded. If there is no snapshot, state is not modified
+            and ``0`` is returned.
+        """
+        saved_at, entities = await self._run(self._read)
+        if not entities:
+            return 0
+
+        setters = {kind: getattr(state, setter) for kind, _, setter in ENTITY_KINDS}
+        state.clear()
+        for kind, entity in entities:
+            setters[kind](entity)
+        self.saved_at = saved_at
+        return len(entities)
+
+    async def reconcile(self, bot, request=None):
+        """
+        Updates bot workspace state with a :meth:`~aioslackbot.RtmModule.stream_start` response
+        and saves it.
+
+        :param bot: :class:`~aioslackbot.Bot`.
+        :param request: Optional :class:`~aioslackbot.models.RtmStartRequest`.
+        :return: Response model without entity fields.
+        """
+        response = await bot.state.load_rtm_start_stream(bot.rtm.stream_start(request or RtmStartRequest()),
+                                                         reconcile=True)
+        if response.ok:
+            await self.save(bot.state)
+        return response
+
+    async def restore(self, bot, request=None):
+        """
+        Loads bot workspace state from last saved snapshot and reconciles it in background
+        (see :attr:`reconcile_task`). When there is no snapshot, it waits for reconciliation.
+
+        Use :meth:`~aioslackbot.RtmModule.connect` (not ``rtm.start``) to open RTM session
+        afterwards, so workspace is not downloaded twice.
+
+        :param bot: :class:`~aioslackbot.Bot`.
+        :param request: Optional :class:`~aioslackbot.models.RtmStartRequest` used to reconcile.
+        :return: Number of entities loaded from snapshot.
+        """
+        count = await self.load(bot.state)
+        if count:
+            self.reconcile_task = self.loop.create_task(self.reconcile(bot, request))
+        else:
+            await self.reconcile(bot, request)
+        return count
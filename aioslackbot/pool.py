@@ -0,0 +1,176 @@
+from asyncio import gather, get_event_loop
+from functools import partial
+from logging import getLogger
+
+from . import Bot
+from .connection import create_connector
+from .slack_api_spec import spec as default_spec
+from .utils import build_call_table
+
+
+class BotPool:
+    """
+    Bots for many workspaces on the same event loop.
+
+    Every bot shares HTTP connector (so sockets are reused between workspaces), API spec, call table
+    and event handlers. Bots, and their modules, are only built when a workspace is used for first time.
+    Event handlers receive workspace identifier and event model, so events are routed by team.
+
+    .. code-block:: python
+
+        pool = BotPool()
+        pool.add('T00000001', 'xoxb-...')
+        pool.add('T00000002', 'xoxb-...')
+
+        @pool.on(EventTypeEnum.MESSAGE)
+        async def on_message(team_id, event):
+            await pool[team_id].chat.post_message(channel=event.channel, text='Hello')
+
+        await pool.run_rtm()
+
+    :param connector: Shared :class:`aiohttp.TCPConnector`. By default, one is built using
+        :func:`~aioslackbot.connection.create_connector`.
+    :param logger: Logger.
+    :param loop: Event loop.
+    :param bot_options: Keyword arguments used to build every :class:`~aioslackbot.Bot`.
+    """
+
+    def __init__(self, connector=None, logger=None, loop=None, **bot_options):
+        self.loop = loop or get_event_loop()
+        self.logger = logger or getLogger('slack-bot.pool')
+        self.bot_options = bot_options
+
+        self._connector_owner = connector is None
+        self.connector = connector or create_connector(loop=self.loop)
+
+        self.call_table = build_call_table(bot_options.get('spec') or default_spec)
+
+        self._tokens = {}
+        self._bots = {}
+        self._handlers = []
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def __contains__(self, team_id):
+        return team_id in self._tokens
+
+    def __iter__(self):
+        return iter(self._tokens)
+
+    def __getitem__(self, team_id):
+        return self.get(team_id)
+
+    @property
+    def active_bots(self):
+        """
+        Dictionary of workspace identifier to bots already built.
+        """
+        return dict(self._bots)
+
+    def add(self, team_id, token):
+        """
+        Adds a workspace. If workspace was already added with another token, its bot is closed.
+
+        :param team_id: Workspace identifier.
+        :param token: Workspace bot token.
+        """
+        if self._tokens.get(team_id) not in (None, token):
+            self._discard_bot(team_id)
+        self._tokens[team_id] = token
+
+    def remove(self, team_id):
+        """
+        Removes a workspace and closes its bot.
+
+        :param team_id: Workspace identifier.
+        """
+        del self._tokens[team_id]
+        self._discard_bot(team_id)
+
+    def get(self, team_id):
+        """
+        Returns workspace bot. It is built on first use.
+
+        :param team_id: Workspace identifier.
+        :return: :class:`~aioslackbot.Bot`.
+        :raise KeyError: When workspace was not added.
+        """
+        try:
+            return self._bots[team_id]
+        except KeyError:
+            pass
+
+        bot = self._bots[team_id] = Bot(self._tokens[team_id],
+                                        connector=self.connector,
+                                        call_table=self.call_table,
+                                        loop=self.loop,
+                                        **self.bot_options)
+        for handler, event_type, subtype, raw in self._handlers:
+            bot.dispatcher.add_handler(partial(handler, team_id), event_type, subtype=subtype, raw=raw)
+        return bot
+
+    def add_handler(self, handler, event_type, subtype=None, raw=False):
+        """
+        Registers an event handler on every workspace.
+
+        :param handler: Coroutine function which receives workspace identifier and event.
+        :param event_type: :class:`~aioslackbot.models.EventTypeEnum` or raw event type.
+        :param subtype: Optional :class:`~aioslackbot.models.MessageSubtypeEnum` or raw subtype.
+        :param raw: Whether handler receives decoded JSON frame instead of event model.
+        """
+        self._handlers.append((handler, event_type, subtype, raw))
+        for team_id, bot in self._bots.items():
+            bot.dispatcher.add_handler(partial(handler, team_id), event_type, subtype=subtype, raw=raw)
+
+    def on(self, event_type, subtype=None, raw=False):
+        """
+        Decorator to register an event handler on every workspace.
+
+        :param event_type: :class:`~aioslackbot.models.EventTypeEnum` or raw event type.
+        :param subtype: Optional :class:`~aioslackbot.models.MessageSubtypeEnum` or raw subtype.
+        :param raw: Whether handler receives decoded JSON frame instead of event model.
+        """
+        def decorator(func):
+            self.add_handler(func, event_type, subtype=subtype, raw=raw)
+            return func
+
+        return decorator
+
+    async def run_rtm(self, team_ids=None, **kwargs):
+        """
+        Runs Real Time Messaging sessions of several workspaces until they are closed.
+        A failing session does not stop the others.
+
+        :param team_ids: Workspace identifiers. By default, every workspace.
+        :param kwargs: Keyword arguments for :meth:`~aioslackbot.RtmModule.run`.
+        """
+        team_ids = list(self._tokens if team_ids is None else team_ids)
+        results = await gather(*[self.get(team_id).rtm.run(**kwargs) for team_id in team_ids],
+                               return_exceptions=True)
+
+        for team_id, result in zip(team_ids, results):
+            if isinstance(result, Exception):
+                self.logger.error("RTM session of {} failed: {}".format(team_id, result))
+
+    async def close(self):
+        """
+        Closes every bot. Connector is closed too if it was built by pool.
+        """
+        bots = list(self._bots.values())
+        self._bots.clear()
+        await gather(*[self._close_bot(bot) for bot in bots])
+
+        if self._connector_owner and not self.connector.closed:
+            await self.connector.close()
+
+    def _discard_bot(self, team_id):
+        bot = self._bots.pop(team_id, None)
+        if bot is not None:
+            self.loop.create_task(self._close_bot(bot))
+
+    @staticmethod
+    async def _close_bot(bot):
+        if bot.rtm.session is not None:
+            await bot.rtm.session.close()
+        await bot.close()
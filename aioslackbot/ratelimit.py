@@ -0,0 +1,208 @@
+from asyncio import CancelledError, get_event_loop, sleep
+
+from service_client.plugins import BasePlugin
+
+TIERS = {1: (1, 60, 5),
+         2: (20, 60),
+         3: (50, 60),
+         4: (100, 60),
+         'post_message': (1, 1)}
+"""
+Slack rate limit tiers. Each tier is defined by number of calls allowed by period (in seconds),
+and optionally by number of calls allowed at once. Slack tolerates small bursts on tier 1 methods,
+so ``rtm.connect`` could reconnect right after a dropped session.
+
+.. seealso:: https://api.slack.com/docs/rate-limits
+"""
+
+DEFAULT_TIER = 3
+"""
+Tier used for endpoints without tier on spec.
+"""
+
+DEFAULT_RETRY_AFTER = 1
+"""
+Seconds to wait when a ``429 Too Many Requests`` response has no ``Retry-After`` header.
+"""
+
+PRUNE_INTERVAL = 60
+"""
+Minimum seconds between sweeps of idle buckets.
+"""
+
+
+def get_retry_after(response):
+    """
+    Returns seconds to wait after a ``429 Too Many Requests`` response.
+
+    :param response: HTTP response.
+    :return: ``Retry-After`` header value or :data:`DEFAULT_RETRY_AFTER`.
+    """
+    try:
+        return float(response.headers['Retry-After'])
+    except (KeyError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class TokenBucket:
+    """
+    Token bucket. Calls wait in arrival order until a token is available.
+
+    Each call reserves its token when it arrives (tokens go below zero while calls are waiting),
+    so waiting calls just sleep until their turn and no lock is held meanwhile.
+
+    :param rate: Number of calls allowed by period.
+    :param period: Period in seconds.
+    :param burst: Number of calls allowed at once. By default, ``rate``.
+    :param loop: Event loop used as clock.
+    """
+
+    def __init__(self, rate, period, burst=None, loop=None):
+        self.capacity = burst or rate
+        self.fill_rate = rate / period
+        self.loop = loop or get_event_loop()
+        self.tokens = self.capacity
+        self.updated = self.loop.time()
+        self.blocked_until = 0
+        self.pending = 0
+        self._delayed = 0
+
+    def _refill(self, now):
+        # Bucket does not refill while it is blocked, so updated time could be in future
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+            self.updated = now
+
+    def is_idle(self):
+        """
+        Whether bucket is full, not blocked and nobody waits on it, so it behaves like a new one.
+        """
+        now = self.loop.time()
+        self._refill(now)
+        return self.pending == 0 and self.tokens >= self.capacity and self.blocked_until <= now
+
+    def block(self, seconds):
+        """
+        Blocks bucket. It is used to honour ``Retry-After`` header. Calls already waiting are
+        delayed too.
+
+        :param seconds: Seconds to block bucket.
+        """
+        now = self.loop.time()
+        self._refill(now)
+        self.tokens = min(self.tokens, 0)
+        delay = now + seconds - max(now, self.blocked_until)
+        if delay > 0:
+            self.blocked_until = now + seconds
+            self.updated = max(self.updated, now) + delay
+            self._delayed += delay
+
+    async def acquire(self):
+        """
+        Waits until a token is available and takes it.
+        """
+        now = self.loop.time()
+        self._refill(now)
+        self.tokens -= 1
+        ready = max(now, self.updated) + max(-self.tokens, 0) / self.fill_rate
+        delayed = self._delayed
+
+        self.pending += 1
+        try:
+            while True:
+                delay = ready + self._delayed - delayed - self.loop.time()
+                if delay <= 0:
+                    return
+                await sleep(delay)
+        except CancelledError:
+            self.tokens += 1
+            raise
+        finally:
+            self.pending -= 1
+
+
+class TierRateLimit(BasePlugin):
+    """
+    Client side rate limit plugin using Slack tiers.
+
+    Each endpoint (and optionally each value of its ``rate_limit_key`` request field) has its own
+    token bucket sized by ``tier`` on spec. Calls over limit are queued instead of being sent, and
+    ``429 Too Many Requests`` responses block endpoint bucket as long as ``Retry-After`` header says.
+    """
+
+    SESSION_ATTR_TIME_BLOCKED = 'blocked_by_tier_rate_limit'
+    SESSION_ATTR_RATE_LIMIT_KEY = 'rate_limit_key'
+
+    def __init__(self, tiers=None, default_tier=DEFAULT_TIER):
+        self.tiers = tiers or TIERS
+        self.default_tier = default_tier
+        self._buckets = {}
+        self._next_prune = 0
+
+    @property
+    def pending(self):
+        """
+        Number of calls waiting on any bucket.
+        """
+        return sum(bucket.pending for bucket in self._buckets.values())
+
+    def get_pending(self, endpoint):
+        """
+        Number of calls waiting for an endpoint.
+
+        :param endpoint: Endpoint name on spec.
+        """
+        return sum(bucket.pending for (name, _), bucket in self._buckets.items() if name == endpoint)
+
+    def get_bucket(self, endpoint_desc, key=None):
+        bucket_id = (endpoint_desc['endpoint'], key)
+        try:
+            return self._buckets[bucket_id]
+        except KeyError:
+            self.prune()
+            bucket = self._buckets[bucket_id] = TokenBucket(*self.tiers[endpoint_desc.get('tier', self.default_tier)],
+                                                            loop=self.service_client.loop)
+            return bucket
+
+    def prune(self, force=False):
+        """
+        Drops idle buckets. It runs at most once every :data:`PRUNE_INTERVAL` seconds unless it is forced.
+
+        :param force: Whether to prune even if last sweep was recent.
+        """
+        now = self.service_client.loop.time()
+        if not force and now < self._next_prune:
+            return
+        self._next_prune = now + PRUNE_INTERVAL
+        for bucket_id in [bucket_id for bucket_id, bucket in self._buckets.items() if bucket.is_idle()]:
+            del self._buckets[bucket_id]
+
+    async def prepare_payload(self, endpoint_desc, session, request_params, payload):
+        try:
+            key_field = endpoint_desc['rate_limit_key']
+        except KeyError:
+            return payload
+
+        try:
+            key = payload.get(key_field)
+        except AttributeError:
+            key = getattr(payload, key_field, None)
+        setattr(session, self.SESSION_ATTR_RATE_LIMIT_KEY, key)
+        return payload
+
+    async def before_request(self, endpoint_desc, session, request_params):
+        bucket = self.get_bucket(endpoint_desc, getattr(session, self.SESSION_ATTR_RATE_LIMIT_KEY, None))
+        start = self.service_client.loop.time()
+        try:
+            await bucket.acquire()
+        finally:
+            setattr(session,
+                    self.SESSION_ATTR_TIME_BLOCKED,
+                    self.service_client.loop.time() - start)
+
+    async def on_response(self, endpoint_desc, session, request_params, response):
+        if response.status != 429:
+            return
+
+        self.get_bucket(endpoint_desc,
+                        getattr(session, self.SESSION_ATTR_RATE_LIMIT_KEY, None)).block(get_retry_after(response))
@@ -0,0 +1,396 @@
+from asyncio import CancelledError, Queue, Semaphore, TimeoutError, ensure_future, gather, shield, sleep
+
+from aiohttp import ClientError, WSMsgType
+
+from .latency import LatencyWindow
+from .lazy import LazyModel
+from .models import ChannelsHistoryRequest, Event, EventTypeEnum, Message, RtmConnectRequest, RtmStartRequest
+
+DEFAULT_QUEUE_SIZE = 1000
+"""
+Default maximum number of frames waiting to be consumed.
+"""
+
+DEFAULT_RECONNECT_DELAY = 1
+"""
+Default seconds to wait before reconnecting.
+"""
+
+DEFAULT_BACKFILL_CONCURRENCY = 4
+"""
+Default number of channel histories requested at the same time on backfill.
+"""
+
+DEFAULT_BACKFILL_LIMIT = 1000
+"""
+Default maximum number of missed messages recovered by channel on backfill.
+"""
+
+DEFAULT_PING_INTERVAL = 15
+"""
+Default seconds without receiving frames before a ``ping`` is sent.
+"""
+
+DEFAULT_PING_TIMEOUT = 10
+"""
+Default seconds to wait for a ``pong`` before websocket is considered stalled.
+"""
+
+LATENCY_REFRESH_FACTOR = 4
+"""
+A ``ping`` is sent every ``ping_interval * LATENCY_REFRESH_FACTOR`` seconds on busy sockets,
+so latency is still measured.
+"""
+
+
+class RtmConnectionError(Exception):
+    """
+    Real Time Messaging connection could not be established.
+    """
+    pass
+
+
+def decode_event(data, lazy=False):
+    """
+    Builds event model from a decoded RTM frame.
+
+    :param data: Decoded JSON frame.
+    :param lazy: Whether to wrap frame on a :class:`~aioslackbot.lazy.LazyModel` instead of
+        building whole model tree.
+    :return: :class:`~aioslackbot.models.Message` for messages, :class:`~aioslackbot.models.Event` otherwise.
+    """
+    model_class = Message if data.get('type') == EventTypeEnum.MESSAGE.value else Event
+    if lazy:
+        return LazyModel(model_class, data)
+    return model_class(data=data)
+
+
+class RtmSession:
+    """
+    Real Time Messaging session.
+
+    It opens a websocket to the URL returned by :meth:`~aioslackbot.RtmModule.connect` and puts every
+    decoded frame into a bounded queue. When queue is full, socket reads are paused until consumer
+    catches up. Event models are built when frames are consumed, so a consumer which routes raw
+    frames (like :class:`~aioslackbot.dispatcher.EventDispatcher`) only pays for events it uses.
+
+    .. code-block:: python
+
+        session = bot.rtm.create_session()
+        bot.loop.create_task(session.run())
+
+        async for event in session:
+            ...
+
+    Session remembers ``ts`` of last message seen on each channel (see :attr:`last_seen`). When it
+    reconnects, messages sent meanwhile are requested from channel histories and queued in order
+    before new frames.
+
+    While connected, a ``ping`` is sent when no frame was received for ``ping_interval`` seconds
+    (and from time to time on busy sockets). Round-trip times are kept on :attr:`latency`. When
+    a ``pong`` does not arrive in ``ping_timeout`` seconds, websocket is closed as stalled, so
+    session reconnects without waiting for TCP timeouts.
+
+    :param rtm_module: :class:`~aioslackbot.RtmModule` of bot.
+    :param queue_size: Maximum number of frames waiting to be consumed.
+    :param backfill_concurrency: Maximum number of channel histories requested at the same time.
+    :param backfill_limit: Maximum number of missed messages recovered by channel.
+    :param ping_interval: Seconds without receiving frames before a ``ping`` is sent.
+        ``None`` disables keepalive.
+    :param ping_timeout: Seconds to wait for a ``pong``.
+    """
+
+    def __init__(self, rtm_module, queue_size=DEFAULT_QUEUE_SIZE,
+                 backfill_concurrency=DEFAULT_BACKFILL_CONCURRENCY, backfill_limit=DEFAULT_BACKFILL_LIMIT,
+                 ping_interval=DEFAULT_PING_INTERVAL, ping_timeout=DEFAULT_PING_TIMEOUT):
+        self.rtm_module = rtm_module
+        self.queue = Queue(maxsize=queue_size)
+        self.backfill_concurrency = backfill_concurrency
+        self.backfill_limit = backfill_limit
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.url = None
+        self.websocket = None
+        self.closed = False
+        self.last_seen = {}
+        self.last_received = None
+        self.latency = LatencyWindow()
+
+        self._message_id = 0
+        self._pings = {}
+        self._connect_task = None
+
+    @property
+    def bot(self):
+        return self.rtm_module.parent
+
+    @property
+    def rtt(self):
+        """
+        Last measured round-trip time in seconds, or ``None``.
+        """
+        return self.latency.last
+
+    def next_message_id(self):
+        """
+        Returns a new ``id`` for a frame sent by client.
+        """
+        self._message_id += 1
+        return self._message_id
+
+    async def connect(self, request=None):
+        """
+        Reserves a RTM URL and opens websocket.
+
+        When request is a :class:`~aioslackbot.models.RtmStartRequest`, :meth:`~aioslackbot.RtmModule.stream_start`
+        is used and bot workspace state is loaded while its response is read.
+
+        :param request: Optional :class:`~aioslackbot.models.RtmConnectRequest` or
+            :class:`~aioslackbot.models.RtmStartRequest`.
+        """
+        if isinstance(request, RtmStartRequest):
+            response = await self.bot.state.load_rtm_start_stream(self.rtm_module.stream_start(request))
+        else:
+            response = await self.rtm_module.connect(request or RtmConnectRequest())
+
+        if not response.ok or not response.url:
+            raise RtmConnectionError('Unable to reserve RTM url')
+
+        self.url = response.url
+        self.websocket = await self.bot.service_client.session.ws_connect(self.url)
+
+    async def read_frames(self):
+        """
+        Reads frames until websocket is closed.
+        """
+        async for msg in self.websocket:
+            if msg.type == WSMsgType.TEXT:
+                self.last_received = self.bot.loop.time()
+                data = self.bot.codec.loads(msg.data)
+                if data.get('type') == 'pong':
+                    self._on_pong(data)
+                else:
+                    await self.feed(data)
+            elif msg.type in (WSMsgType.CLOSED, WSMsgType.ERROR):
+                break
+
+    async def ping(self):
+        """
+        Sends a ``ping`` frame. Its round-trip time is added to :attr:`latency` when ``pong`` arrives.
+
+        :return: Frame ``id``.
+        """
+        message_id = self.next_message_id()
+        self._pings[message_id] = self.bot.loop.time()
+        await self.send({'id': message_id, 'type': 'ping'})
+        return message_id
+
+    def _on_pong(self, data):
+        sent = self._pings.pop(data.get('reply_to'), None)
+        if sent is not None:
+            self.latency.add(self.last_received - sent)
+
+    async def keepalive(self):
+        """
+        Sends pings while websocket is open and closes it when a ``pong`` does not arrive on time.
+        """
+        loop = self.bot.loop
+        self.last_received = last_ping = loop.time()
+        while not self.websocket.closed:
+            # Received frames prove socket is alive, so busy sockets are pinged less often
+            due = min(self.last_received + self.ping_interval,
+                      last_ping + self.ping_interval * LATENCY_REFRESH_FACTOR)
+            if loop.time() < due:
+                await sleep(due - loop.time())
+                continue
+
+            message_id = await self.ping()
+            last_ping = loop.time()
+            await sleep(self.ping_timeout)
+
+            # When queue is full, socket is not being read, so a late pong does not mean it is stalled
+            while message_id in self._pings and self.queue.full() and not self.websocket.closed:
+                await sleep(self.ping_timeout)
+
+            if self._pings.pop(message_id, None) is not None:
+                self.bot.logger.warning('RTM websocket stalled: no pong in {} seconds'.format(self.ping_timeout))
+                # Reader stops as soon as close starts, so keepalive is cancelled meanwhile
+                await shield(self.websocket.close())
+                return
+
+    async def _read_connection(self):
+        if not self.ping_interval:
+            await self.read_frames()
+            return
+
+        self._pings.clear()
+        keepalive = ensure_future(self.keepalive())
+        try:
+            await self.read_frames()
+        finally:
+            keepalive.cancel()
+
+    async def feed(self, data):
+        """
+        Puts a frame into queue.
+
+        :param data: Decoded JSON frame.
+        """
+        if data.get('type') == EventTypeEnum.MESSAGE.value:
+            channel_id = data.get('channel')
+            ts = data.get('ts')
+            # Slack timestamps have fixed width, so they are compared as strings
+            if channel_id and ts and ts > self.last_seen.get(channel_id, ''):
+                self.last_seen[channel_id] = ts
+        await self.queue.put(data)
+
+    def _get_history_module(self, channel_id):
+        if channel_id.startswith('C'):
+            return self.bot.channels
+        if channel_id.startswith('D'):
+            return self.bot.im
+        if channel_id in self.bot.state.mpims:
+            return self.bot.mpim
+        return self.bot.groups
+
+    async def _fetch_missed(self, channel_id, oldest, semaphore):
+        module = self._get_history_module(channel_id)
+        request = ChannelsHistoryRequest(data={'channel': channel_id, 'oldest': oldest})
+        messages = []
+
+        async with semaphore:
+            try:
+                while len(messages) < self.backfill_limit:
+                    # Pages answered with 429 Too Many Requests are retried by stream
+                    stream = module.stream_history(request, raw=True)
+                    page = [message async for _, message in stream]
+                    if not stream.response.ok:
+                        self.bot.logger.warning('Unable to backfill channel {}: {}'.format(channel_id,
+                                                                                           stream.response.error))
+                        break
+                    messages.extend(page)
+                    if not stream.response.has_more or not page:
+                        break
+
+                    request = request.copy()
+                    request.latest = page[-1]['ts']
+                else:
+                    self.bot.logger.warning('Too many missed messages on channel {}. '
+                                            'Only last {} are recovered'.format(channel_id, self.backfill_limit))
+            except (ClientError, TimeoutError) as ex:
+                # A channel which could not be read must not end session, like a page which is not ok
+                self.bot.logger.warning('Unable to backfill channel {}: {}'.format(channel_id, ex))
+
+        # History comes from newest to oldest
+        for message in reversed(messages[:self.backfill_limit]):
+            message.setdefault('channel', channel_id)
+            await self.feed(message)
+
+    async def backfill(self):
+        """
+        Requests messages sent after last seen one on every channel and queues them in order.
+        Channel histories are requested concurrently, up to ``backfill_concurrency``.
+        """
+        semaphore = Semaphore(self.backfill_concurrency)
+        await gather(*[self._fetch_missed(channel_id, ts, semaphore)
+                       for channel_id, ts in list(self.last_seen.items())])
+
+    async def run(self, request=None, reconnect=False, reconnect_delay=DEFAULT_RECONNECT_DELAY):
+        """
+        Connects and reads frames until websocket is closed.
+
+        :param request: Optional :class:`~aioslackbot.models.RtmConnectRequest` or
+            :class:`~aioslackbot.models.RtmStartRequest`.
+        :param reconnect: Whether session must reconnect when websocket is closed by server or
+            connection is lost. Missed messages are backfilled on reconnection. Session only
+            finishes when :meth:`close` is called.
+        :param reconnect_delay: Seconds to wait before reconnecting.
+        """
+        try:
+            connected = False
+            while True:
+                # Connection is kept as a task, so close() could cancel it
+                self._connect_task = ensure_future(self.connect(request))
+                try:
+                    await self._connect_task
+                except CancelledError:
+                    if not self.closed or not self._connect_task.cancelled():
+                        raise
+                    break
+                except (RtmConnectionError, ClientError) as ex:
+                    if not reconnect:
+                        raise
+                    self.bot.logger.warning('Unable to connect to RTM: {}'.format(ex))
+                else:
+                    if self.closed:
+                        # Session was closed while it was connecting
+                        await self.websocket.close()
+                        break
+                    if connected:
+                        await self.backfill()
+                    connected = True
+                    await self._read_connection()
+
+                if not reconnect or self.closed:
+                    break
+                await sleep(reconnect_delay)
+                if self.closed:
+                    break
+        finally:
+            await self.close()
+
+    async def send(self, data):
+        """
+        Sends a frame through websocket.
+
+        :param data: Frame data. It must be JSON serializable.
+        """
+        frame = self.bot.codec.dumps(data)
+        if isinstance(frame, bytes):
+            frame = frame.decode('utf-8')
+        await self.websocket.send_str(frame)
+
+    async def close(self):
+        """
+        Cancels a connection in progress, closes websocket and wakes up consumers.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        if self._connect_task is not None:
+            self._connect_task.cancel()
+        if self.websocket is not None:
+            await self.websocket.close()
+        # A full queue already wakes consumers, and they find session closed once it is drained
+        if not self.queue.full():
+            self.queue.put_nowait(None)
+
+    async def get_raw(self):
+        """
+        Waits for next frame.
+
+        :return: Decoded JSON frame or ``None`` when session is closed.
+        """
+        if self.closed and self.queue.empty():
+            return None
+        return await self.queue.get()
+
+    async def get(self):
+        """
+        Waits for next event.
+
+        :return: Event model or ``None`` when session is closed.
+        """
+        data = await self.get_raw()
+        if data is None:
+            return None
+        return decode_event(data)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self.get()
+        if event is None:
+            raise StopAsyncIteration()
+        return event
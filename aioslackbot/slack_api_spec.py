@@ -1,224 +1,389 @@
 spec = {
     'api__test': {'method': 'post',
-                  'path': '/api.test'},
+                  'path': '/api.test',
+                  'tier': 4,
+                  'form_encoded': True},
     'auth__revoke': {'method': 'post',
-                     'path': '/auth.revoke'},
+                     'path': '/auth.revoke',
+                     'tier': 3,
+                     'form_encoded': True},
     'auth__test': {'method': 'post',
-                   'path': '/auth.test'},
+                   'path': '/auth.test',
+                   'tier': 4,
+                   'form_encoded': True},
     'bots__info': {'method': 'post',
-                   'path': '/bots.info'},
+                   'path': '/bots.info',
+                   'tier': 3,
+                   'cache_ttl': 3600,
+                   'form_encoded': True},
     'channels__archive': {'method': 'post',
-                          'path': '/channels.archive'},
+                          'path': '/channels.archive',
+                          'tier': 2},
     'channels__create': {'method': 'post',
-                         'path': '/channels.create'},
+                         'path': '/channels.create',
+                         'tier': 2},
     'channels__history': {'method': 'post',
-                          'path': '/channels.history'},
+                          'path': '/channels.history',
+                          'tier': 3,
+                          'form_encoded': True},
     'channels__info': {'method': 'post',
-                       'path': '/channels.info'},
+                       'path': '/channels.info',
+                       'tier': 3,
+                       'form_encoded': True},
     'channels__invite': {'method': 'post',
-                         'path': '/channels.invite'},
+                         'path': '/channels.invite',
+                         'tier': 3},
     'channels__join': {'method': 'post',
-                       'path': '/channels.join'},
+                       'path': '/channels.join',
+                       'tier': 3},
     'channels__kick': {'method': 'post',
-                       'path': '/channels.kick'},
+                       'path': '/channels.kick',
+                       'tier': 3},
     'channels__leave': {'method': 'post',
-                        'path': '/channels.leave'},
+                        'path': '/channels.leave',
+                        'tier': 3},
     'channels__list': {'method': 'post',
-                       'path': '/channels.list'},
+                       'path': '/channels.list',
+                       'tier': 2,
+                       'form_encoded': True},
     'channels__mark': {'method': 'post',
-                       'path': '/channels.mark'},
+                       'path': '/channels.mark',
+                       'tier': 3},
     'channels__rename': {'method': 'post',
-                         'path': '/channels.rename'},
+                         'path': '/channels.rename',
+                         'tier': 2},
     'channels__replies': {'method': 'post',
-                          'path': '/channels.replies'},
+                          'path': '/channels.replies',
+                          'tier': 3,
+                          'form_encoded': True},
     'channels__set_purpose': {'method': 'post',
-                             'path': '/channels.setPurpose'},
+                             'path': '/channels.setPurpose',
+                             'tier': 2},
     'channels__set_topic': {'method': 'post',
-                           'path': '/channels.setTopic'},
+                           'path': '/channels.setTopic',
+                           'tier': 2},
     'channels__unarchive': {'method': 'post',
-                            'path': '/channels.unarchive'},
+                            'path': '/channels.unarchive',
+                            'tier': 2},
     'chat__delete': {'method': 'post',
-                     'path': '/chat.delete'},
+                     'path': '/chat.delete',
+                     'tier': 3},
     'chat__me_message': {'method': 'post',
-                        'path': '/chat.meMessage'},
+                        'path': '/chat.meMessage',
+                        'tier': 3},
     'chat__post_message': {'method': 'post',
-                          'path': '/chat.postMessage'},
+                          'path': '/chat.postMessage',
+                          'tier': 'post_message',
+                          'rate_limit_key': 'channel'},
     'chat__unfurl': {'method': 'post',
-                     'path': '/chat.unfurl'},
+                     'path': '/chat.unfurl',
+                     'tier': 3},
     'chat__update': {'method': 'post',
-                     'path': '/chat.update'},
+                     'path': '/chat.update',
+                     'tier': 3},
     'dnd__end_dnd': {'method': 'post',
-                    'path': '/dnd.endDnd'},
+                    'path': '/dnd.endDnd',
+                    'tier': 2},
     'dnd__end_snooze': {'method': 'post',
-                       'path': '/dnd.endSnooze'},
+                       'path': '/dnd.endSnooze',
+                       'tier': 2},
     'dnd__info': {'method': 'post',
-                  'path': '/dnd.info'},
+                  'path': '/dnd.info',
+                  'tier': 3,
+                  'form_encoded': True},
     'dnd__set_snooze': {'method': 'post',
-                       'path': '/dnd.setSnooze'},
+                       'path': '/dnd.setSnooze',
+                       'tier': 2},
     'dnd__team_info': {'method': 'post',
-                      'path': '/dnd.teamInfo'},
+                      'path': '/dnd.teamInfo',
+                      'tier': 2,
+                      'form_encoded': True},
     'emoji__list': {'method': 'post',
-                    'path': '/emoji.list'},
+                    'path': '/emoji.list',
+                    'tier': 2,
+                    'cache_ttl': 3600,
+                    'form_encoded': True},
     'files__comments__add': {'method': 'post',
-                             'path': '/files.comments.add'},
+                             'path': '/files.comments.add',
+                             'tier': 2},
     'files__comments__delete': {'method': 'post',
-                                'path': '/files.comments.delete'},
+                                'path': '/files.comments.delete',
+                                'tier': 2},
     'files__comments__edit': {'method': 'post',
-                              'path': '/files.comments.edit'},
+                              'path': '/files.comments.edit',
+                              'tier': 2},
     'files__delete': {'method': 'post',
-                      'path': '/files.delete'},
+                      'path': '/files.delete',
+                      'tier': 3},
     'files__info': {'method': 'post',
-                    'path': '/files.info'},
+                    'path': '/files.info',
+                    'tier': 4,
+                    'form_encoded': True},
     'files__list': {'method': 'post',
-                    'path': '/files.list'},
+                    'path': '/files.list',
+                    'tier': 3,
+                    'form_encoded': True},
     'files__revoke_public_url': {'method': 'post',
-                               'path': '/files.revokePublicURL'},
+                               'path': '/files.revokePublicURL',
+                               'tier': 3},
     'files__shared_public_url': {'method': 'post',
-                               'path': '/files.sharedPublicURL'},
+                               'path': '/files.sharedPublicURL',
+                               'tier': 3},
     'files__upload': {'method': 'post',
-                      'path': '/files.upload'},
+                      'path': '/files.upload',
+                      'tier': 2,
+                      'form_encoded': True},
     'groups__archive': {'method': 'post',
-                        'path': '/groups.archive'},
+                        'path': '/groups.archive',
+                        'tier': 2},
     'groups__close': {'method': 'post',
-                      'path': '/groups.close'},
+                      'path': '/groups.close',
+                      'tier': 3},
     'groups__create': {'method': 'post',
-                       'path': '/groups.create'},
+                       'path': '/groups.create',
+                       'tier': 2},
     'groups__create_child': {'method': 'post',
-                            'path': '/groups.createChild'},
+                            'path': '/groups.createChild',
+                            'tier': 2},
     'groups__history': {'method': 'post',
-                        'path': '/groups.history'},
+                        'path': '/groups.history',
+                        'tier': 3,
+                        'form_encoded': True},
     'groups__info': {'method': 'post',
-                     'path': '/groups.info'},
+                     'path': '/groups.info',
+                     'tier': 3,
+                     'form_encoded': True},
     'groups__invite': {'method': 'post',
-                       'path': '/groups.invite'},
+                       'path': '/groups.invite',
+                       'tier': 3},
     'groups__kick': {'method': 'post',
-                     'path': '/groups.kick'},
+                     'path': '/groups.kick',
+                     'tier': 3},
     'groups__leave': {'method': 'post',
-                      'path': '/groups.leave'},
+                      'path': '/groups.leave',
+                      'tier': 3},
     'groups__list': {'method': 'post',
-                     'path': '/groups.list'},
+                     'path': '/groups.list',
+                     'tier': 3,
+                     'form_encoded': True},
     'groups__mark': {'method': 'post',
-                     'path': '/groups.mark'},
+                     'path': '/groups.mark',
+                     'tier': 3},
     'groups__open': {'method': 'post',
-                     'path': '/groups.open'},
+                     'path': '/groups.open',
+                     'tier': 3},
     'groups__rename': {'method': 'post',
-                       'path': '/groups.rename'},
+                       'path': '/groups.rename',
+                       'tier': 2},
     'groups__replies': {'method': 'post',
-                        'path': '/groups.replies'},
+                        'path': '/groups.replies',
+                        'tier': 3,
+                        'form_encoded': True},
     'groups__set_purpose': {'method': 'post',
-                           'path': '/groups.setPurpose'},
+                           'path': '/groups.setPurpose',
+                           'tier': 2},
     'groups__set_topic': {'method': 'post',
-                         'path': '/groups.setTopic'},
+                         'path': '/groups.setTopic',
+                         'tier': 2},
     'groups__unarchive': {'method': 'post',
-                          'path': '/groups.unarchive'},
+                          'path': '/groups.unarchive',
+                          'tier': 2},
     'im__close': {'method': 'post',
-                  'path': '/im.close'},
+                  'path': '/im.close',
+                  'tier': 2},
     'im__history': {'method': 'post',
-                    'path': '/im.history'},
+                    'path': '/im.history',
+                    'tier': 3,
+                    'form_encoded': True},
     'im__list': {'method': 'post',
-                 'path': '/im.list'},
+                 'path': '/im.list',
+                 'tier': 2,
+                 'form_encoded': True},
     'im__mark': {'method': 'post',
-                 'path': '/im.mark'},
+                 'path': '/im.mark',
+                 'tier': 3},
     'im__open': {'method': 'post',
-                 'path': '/im.open'},
+                 'path': '/im.open',
+                 'tier': 3},
     'im__replies': {'method': 'post',
-                    'path': '/im.replies'},
+                    'path': '/im.replies',
+                    'tier': 3,
+                    'form_encoded': True},
     'mpim__close': {'method': 'post',
-                    'path': '/mpim.close'},
+                    'path': '/mpim.close',
+                    'tier': 2},
     'mpim__history': {'method': 'post',
-                      'path': '/mpim.history'},
+                      'path': '/mpim.history',
+                      'tier': 3,
+                      'form_encoded': True},
     'mpim__list': {'method': 'post',
-                   'path': '/mpim.list'},
+                   'path': '/mpim.list',
+                   'tier': 2,
+                   'form_encoded': True},
     'mpim__mark': {'method': 'post',
-                   'path': '/mpim.mark'},
+                   'path': '/mpim.mark',
+                   'tier': 3},
     'mpim__open': {'method': 'post',
-                   'path': '/mpim.open'},
+                   'path': '/mpim.open',
+                   'tier': 3},
     'mpim__replies': {'method': 'post',
-                      'path': '/mpim.replies'},
+                      'path': '/mpim.replies',
+                      'tier': 3,
+                      'form_encoded': True},
     'oauth__access': {'method': 'post',
-                      'path': '/oauth.access'},
+                      'path': '/oauth.access',
+                      'tier': 4,
+                      'form_encoded': True},
     'pins__add': {'method': 'post',
-                  'path': '/pins.add'},
+                  'path': '/pins.add',
+                  'tier': 2},
     'pins__list': {'method': 'post',
-                   'path': '/pins.list'},
+                   'path': '/pins.list',
+                   'tier': 2,
+                   'form_encoded': True},
     'pins__remove': {'method': 'post',
-                     'path': '/pins.remove'},
+                     'path': '/pins.remove',
+                     'tier': 2},
     'reactions__add': {'method': 'post',
-                       'path': '/reactions.add'},
+                       'path': '/reactions.add',
+                       'tier': 3},
     'reactions__get': {'method': 'post',
-                       'path': '/reactions.get'},
+                       'path': '/reactions.get',
+                       'tier': 3,
+                       'form_encoded': True},
     'reactions__list': {'method': 'post',
-                        'path': '/reactions.list'},
+                        'path': '/reactions.list',
+                        'tier': 2,
+                        'form_encoded': True},
     'reactions__remove': {'method': 'post',
-                          'path': '/reactions.remove'},
+                          'path': '/reactions.remove',
+                          'tier': 2},
     'reminders__add': {'method': 'post',
-                       'path': '/reminders.add'},
+                       'path': '/reminders.add',
+                       'tier': 2},
     'reminders__complete': {'method': 'post',
-                            'path': '/reminders.complete'},
+                            'path': '/reminders.complete',
+                            'tier': 2},
     'reminders__delete': {'method': 'post',
-                          'path': '/reminders.delete'},
+                          'path': '/reminders.delete',
+                          'tier': 2},
     'reminders__info': {'method': 'post',
-                        'path': '/reminders.info'},
+                        'path': '/reminders.info',
+                        'tier': 2,
+                        'form_encoded': True},
     'reminders__list': {'method': 'post',
-                        'path': '/reminders.list'},
+                        'path': '/reminders.list',
+                        'tier': 2,
+                        'form_encoded': True},
     'rtm__connect': {'method': 'post',
-                     'path': '/rtm.connect'},
+                     'path': '/rtm.connect',
+                     'tier': 1,
+                     'form_encoded': True},
     'rtm__start': {'method': 'post',
-                   'path': '/rtm.start'},
+                   'path': '/rtm.start',
+                   'tier': 1,
+                   'form_encoded': True},
     'search__all': {'method': 'post',
-                    'path': '/search.all'},
+                    'path': '/search.all',
+                    'tier': 2,
+                    'form_encoded': True},
     'search__files': {'method': 'post',
-                      'path': '/search.files'},
+                      'path': '/search.files',
+                      'tier': 2,
+                      'form_encoded': True},
     'search__messages': {'method': 'post',
-                         'path': '/search.messages'},
+                         'path': '/search.messages',
+                         'tier': 2,
+                         'form_encoded': True},
     'stars__add': {'method': 'post',
-                   'path': '/stars.add'},
+                   'path': '/stars.add',
+                   'tier': 2},
     'stars__list': {'method': 'post',
-                    'path': '/stars.list'},
+                    'path': '/stars.list',
+                    'tier': 3,
+                    'form_encoded': True},
     'stars__remove': {'method': 'post',
-                      'path': '/stars.remove'},
+                      'path': '/stars.remove',
+                      'tier': 2},
     'team__access_logs': {'method': 'post',
-                         'path': '/team.accessLogs'},
+                         'path': '/team.accessLogs',
+                         'tier': 2,
+                         'form_encoded': True},
     'team__billable_info': {'method': 'post',
-                           'path': '/team.billableInfo'},
+                           'path': '/team.billableInfo',
+                           'tier': 2,
+                           'form_encoded': True},
     'team__info': {'method': 'post',
-                   'path': '/team.info'},
+                   'path': '/team.info',
+                   'tier': 3,
+                   'cache_ttl': 3600,
+                   'form_encoded': True},
     'team__integration_logs': {'method': 'post',
-                              'path': '/team.integrationLogs'},
+                              'path': '/team.integrationLogs',
+                              'tier': 2,
+                              'form_encoded': True},
     'team__profile__get': {'method': 'post',
-                           'path': '/team.profile.get'},
+                           'path': '/team.profile.get',
+                           'tier': 3,
+                           'cache_ttl': 3600,
+                           'form_encoded': True},
     'usergroups__create': {'method': 'post',
-                           'path': '/usergroups.create'},
+                           'path': '/usergroups.create',
+                           'tier': 2},
     'usergroups__disable': {'method': 'post',
-                            'path': '/usergroups.disable'},
+                            'path': '/usergroups.disable',
+                            'tier': 2},
     'usergroups__enable': {'method': 'post',
-                           'path': '/usergroups.enable'},
+                           'path': '/usergroups.enable',
+                           'tier': 2},
     'usergroups__list': {'method': 'post',
-                         'path': '/usergroups.list'},
+                         'path': '/usergroups.list',
+                         'tier': 2,
+                         'form_encoded': True},
     'usergroups__update': {'method': 'post',
-                           'path': '/usergroups.update'},
+                           'path': '/usergroups.update',
+                           'tier': 2},
     'usergroups__users__list': {'method': 'post',
-                                'path': '/usergroups.users.list'},
+                                'path': '/usergroups.users.list',
+                                'tier': 2,
+                                'form_encoded': True},
     'usergroups__users__update': {'method': 'post',
-                                  'path': '/usergroups.users.update'},
+                                  'path': '/usergroups.users.update',
+                                  'tier': 2},
     'users__delete_photo': {'method': 'post',
-                           'path': '/users.deletePhoto'},
+                           'path': '/users.deletePhoto',
+                           'tier': 2},
     'users__get_presence': {'method': 'post',
-                           'path': '/users.getPresence'},
+                           'path': '/users.getPresence',
+                           'tier': 3,
+                           'form_encoded': True},
     'users__identity': {'method': 'post',
-                        'path': '/users.identity'},
+                        'path': '/users.identity',
+                        'tier': 4,
+                        'form_encoded': True},
     'users__info': {'method': 'post',
-                    'path': '/users.info'},
+                    'path': '/users.info',
+                    'tier': 4,
+                    'form_encoded': True},
     'users__list': {'method': 'post',
-                    'path': '/users.list'},
+                    'path': '/users.list',
+                    'tier': 2,
+                    'cache_ttl': 300,
+                    'form_encoded': True},
     'users__set_active': {'method': 'post',
-                         'path': '/users.setActive'},
+                         'path': '/users.setActive',
+                         'tier': 3},
     'users__set_photo': {'method': 'post',
-                        'path': '/users.setPhoto'},
+                        'path': '/users.setPhoto',
+                        'tier': 2},
     'users__set_presence': {'method': 'post',
-                           'path': '/users.setPresence'},
+                           'path': '/users.setPresence',
+                           'tier': 2},
     'users__profile__get': {'method': 'post',
-                            'path': '/users.profile.get'},
+                            'path': '/users.profile.get',
+                            'tier': 4,
+                            'form_encoded': True},
     'users__profile__set': {'method': 'post',
-                            'path': '/users.profile.set'}
+                            'path': '/users.profile.set',
+                            'tier': 3}
 }
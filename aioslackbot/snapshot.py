@@ -0,0 +1,184 @@
+"""
+Compact read-only snapshots of models.
+
+Snapshot classes are generated from model field definitions. They store field values on
+``__slots__``, without dirty tracking, so they take a fraction of model memory. They are
+useful to keep big collections of entities (like workspace users) which are only read. Nested
+dynamic models (like ``prefs``) become :class:`DynamicSnapshot` instances, so whole tree is frozen.
+
+.. code-block:: python
+
+    user = snapshot(User(data=data))
+    user.name
+    user.to_model()
+"""
+from types import MappingProxyType
+
+from dirty_models.models import BaseDynamicModel, BaseModel, ListModel
+
+_snapshot_classes = {}
+
+
+class Snapshot:
+    """
+    Base class of read-only snapshots. Use :func:`snapshot_class` to get snapshot class of a model.
+    """
+
+    __slots__ = ()
+
+    # Names start with underscore (like namedtuple) to avoid clashes with field names
+    _model_class = None
+    """
+    Model class which snapshot is built from.
+    """
+
+    _fields = ()
+    """
+    Field names.
+    """
+
+    def __init__(self, **kwargs):
+        for name in self._fields:
+            object.__setattr__(self, name, kwargs.get(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is read only'.format(type(self).__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError('{} is read only'.format(type(self).__name__))
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields)
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, name) for name in self._fields))
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__,
+                               ', '.join('{}={!r}'.format(name, getattr(self, name))
+                                         for name in self._fields if getattr(self, name) is not None))
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Builds a snapshot from a model.
+
+        :param model: Model instance of :attr:`_model_class`.
+        """
+        return cls(**{name: _freeze(getattr(model, name)) for name in cls._fields})
+
+    @classmethod
+    def from_data(cls, data):
+        """
+        Builds a snapshot from raw data. Data is validated using :attr:`_model_class`.
+
+        :param data: Dictionary of raw data.
+        """
+        return cls.from_model(cls._model_class(data=data))
+
+    def _replace(self, **kwargs):
+        """
+        Returns a new snapshot with some values replaced.
+        """
+        values = {name: getattr(self, name) for name in self._fields}
+        values.update({name: _freeze(value) for name, value in kwargs.items()})
+        return type(self)(**values)
+
+    def export_data(self):
+        """
+        Exports snapshot data like :meth:`dirty_models.models.BaseModel.export_data`.
+        """
+        data = {}
+        for name in self._fields:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = _thaw(value)
+        return data
+
+    def to_model(self):
+        """
+        Builds a full (writable) model.
+        """
+        return self._model_class(data=self.export_data())
+
+
+class DynamicSnapshot(Snapshot):
+    """
+    Base class of read-only snapshots of dynamic models. Their fields are taken from model data, and
+    unknown fields read as ``None`` like on dynamic models.
+    """
+
+    __slots__ = ('_fields', '_values')
+
+    def __init__(self, **kwargs):
+        object.__setattr__(self, '_fields', tuple(kwargs))
+        object.__setattr__(self, '_values', MappingProxyType(kwargs))
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self._values.get(name)
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Builds a snapshot from a dynamic model.
+
+        :param model: Model instance of :attr:`_model_class`.
+        """
+        return cls(**{name: _freeze(model.get_field_value(name)) for name in model.get_fields()})
+
+
+def _freeze(value):
+    if isinstance(value, ListModel):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, BaseModel):
+        return snapshot(value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    if isinstance(value, (Snapshot, BaseModel)):
+        return value.export_data()
+    return value
+
+
+def snapshot_class(model_class):
+    """
+    Returns snapshot class of a model class. It is generated from model fields the first time.
+
+    :param model_class: Model class.
+    :return: :class:`Snapshot` subclass, or :class:`DynamicSnapshot` subclass for dynamic models.
+    """
+    try:
+        return _snapshot_classes[model_class]
+    except KeyError:
+        pass
+
+    if issubclass(model_class, BaseDynamicModel):
+        # Fields of dynamic models are only known by instance
+        namespace = {'__slots__': (), '__module__': __name__, '_model_class': model_class}
+        base = DynamicSnapshot
+    else:
+        fields = tuple(model_class().get_structure())
+        namespace = {'__slots__': fields, '__module__': __name__, '_model_class': model_class,
+                     '_fields': fields}
+        base = Snapshot
+
+    klass = _snapshot_classes[model_class] = type('{}Snapshot'.format(model_class.__name__),
+                                                  (base,), namespace)
+    return klass
+
+
+def snapshot(model):
+    """
+    Builds a read-only snapshot of a model.
+
+    :param model: Model instance.
+    :return: :class:`Snapshot` instance.
+    """
+    return snapshot_class(type(model)).from_model(model)
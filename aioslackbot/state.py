@@ -0,0 +1,353 @@
+from collections import namedtuple
+from datetime import datetime
+
+from .models import Bot, Channel, EventTypeEnum, Group, Im, User, UsersListRequest
+from .paging import next_cursor_request
+from .snapshot import snapshot
+
+
+class UsersSyncResult(namedtuple('UsersSyncResult', ['ok', 'added', 'updated', 'removed', 'unchanged'])):
+    """
+    Summary of :meth:`WorkspaceState.sync_users`.
+    """
+
+    __slots__ = ()
+
+    @property
+    def changed(self):
+        """
+        Number of users added, updated or removed.
+        """
+        return self.added + self.updated + self.removed
+
+
+class WorkspaceState:
+    """
+    In memory store of workspace entities.
+
+    Entities are indexed by ID (and by name for users, channels and groups). It is bulk loaded
+    from :meth:`~aioslackbot.RtmModule.start` response and kept up to date by RTM events once it
+    is registered on an :class:`~aioslackbot.dispatcher.EventDispatcher`.
+
+    :param compact_users: Whether users are stored as read-only :mod:`~aioslackbot.snapshot`
+        instances, which take a fraction of model memory.
+    """
+
+    def __init__(self, compact_users=False):
+        self.compact_users = compact_users
+
+        self.users = {}
+        self.channels = {}
+        self.groups = {}
+        self.ims = {}
+        self.mpims = {}
+        self.bots = {}
+
+        self._users_by_name = {}
+        self._channels_by_name = {}
+        self._groups_by_name = {}
+
+    def clear(self):
+        """
+        Removes every entity.
+        """
+        for index in (self.users, self.channels, self.groups, self.ims, self.mpims, self.bots,
+                      self._users_by_name, self._channels_by_name, self._groups_by_name):
+            index.clear()
+
+    def load_rtm_start(self, response):
+        """
+        Replaces state with entities from a :class:`~aioslackbot.models.RtmStartResponse`.
+
+        :param response: Response of :meth:`~aioslackbot.RtmModule.start`.
+        """
+        self.clear()
+        for user in response.users or []:
+            self.set_user(user)
+        for channel in response.channels or []:
+            self.set_channel(channel)
+        for group in response.groups or []:
+            self.set_group(group)
+        for im in response.ims or []:
+            self.set_im(im)
+        for mpim in response.mpims or []:
+            self.set_mpim(mpim)
+        for bot in response.bots or []:
+            self.set_bot(bot)
+
+    async def load_rtm_start_stream(self, stream, reconcile=False):
+        """
+        Replaces state with entities from a :meth:`~aioslackbot.RtmModule.stream_start` stream.
+        Entities are stored while response is read.
+
+        :param stream: :class:`~aioslackbot.streaming.ResponseStream`.
+        :param reconcile: Whether current entities are kept while response is read, instead of
+            removing them first. Entities which are not on response are removed at the end, so
+            state is usable all the time (for example, after loading a
+            :class:`~aioslackbot.persistence.StateStore` snapshot).
+        :return: Response model without entity fields.
+        """
+        setters = {'users': self.set_user,
+                   'channels': self.set_channel,
+                   'groups': self.set_group,
+                   'ims': self.set_im,
+                   'mpims': self.set_mpim,
+                   'bots': self.set_bot}
+        seen = {field: set() for field in setters}
+
+        if not reconcile:
+            self.clear()
+        async for field, entity in stream:
+            setters[field](entity)
+            seen[field].add(entity.id)
+
+        if reconcile and stream.response.ok:
+            for field, ids in seen.items():
+                for entity_id in set(getattr(self, field)) - ids:
+                    self.remove(field, entity_id)
+        return stream.response
+
+    async def sync_users(self, users_module, request=None, remove=True):
+        """
+        Updates users with :meth:`~aioslackbot.UsersModule.list` pages. Pages are parsed while they
+        are read, and only users whose ``updated`` time changed are decoded and indexed again.
+
+        .. code-block:: python
+
+            result = await bot.state.sync_users(bot.users, UsersListRequest(limit=1000))
+            print(result.changed)
+
+        :param users_module: :class:`~aioslackbot.UsersModule` of bot.
+        :param request: Optional :class:`~aioslackbot.models.UsersListRequest` for first page.
+        :param remove: Whether users which are not listed are removed. They are only removed when
+            every page was read successfully.
+        :return: :class:`UsersSyncResult`.
+        """
+        request = request or UsersListRequest()
+        added = updated = unchanged = 0
+        seen = set()
+
+        while request is not None:
+            stream = users_module.stream_list_page(request, raw=True)
+            async for _, data in stream:
+                user_id = data.get('id')
+                seen.add(user_id)
+                user = self.users.get(user_id)
+                if user is not None and _same_time(user.updated, data.get('updated')):
+                    unchanged += 1
+                    continue
+
+                self.set_user(User(data=data))
+                if user is None:
+                    added += 1
+                else:
+                    updated += 1
+
+            if not stream.response.ok:
+                return UsersSyncResult(False, added, updated, 0, unchanged)
+            request = next_cursor_request(request, stream.response)
+
+        removed = 0
+        if remove:
+            for user_id in set(self.users) - seen:
+                self.remove('users', user_id)
+                removed += 1
+        return UsersSyncResult(True, added, updated, removed, unchanged)
+
+    def remove(self, kind, entity_id):
+        """
+        Removes an entity.
+
+        :param kind: Index name: ``users``, ``channels``, ``groups``, ``ims``, ``mpims`` or ``bots``.
+        :param entity_id: Entity ID.
+        :return: Removed entity or ``None``.
+        """
+        try:
+            name_index = {'users': self._users_by_name,
+                          'channels': self._channels_by_name,
+                          'groups': self._groups_by_name}[kind]
+        except KeyError:
+            return getattr(self, kind).pop(entity_id, None)
+        return self._remove_named(getattr(self, kind), name_index, entity_id)
+
+    @staticmethod
+    def _set_named(index, name_index, entity):
+        try:
+            old = index[entity.id]
+        except KeyError:
+            pass
+        else:
+            if name_index.get(old.name) is old:
+                del name_index[old.name]
+
+        index[entity.id] = entity
+        if entity.name:
+            name_index[entity.name] = entity
+
+    @staticmethod
+    def _remove_named(index, name_index, entity_id):
+        entity = index.pop(entity_id, None)
+        if entity is not None and name_index.get(entity.name) is entity:
+            del name_index[entity.name]
+        return entity
+
+    def set_user(self, user):
+        if self.compact_users:
+            user = snapshot(user)
+        self._set_named(self.users, self._users_by_name, user)
+
+    def get_user(self, user_id):
+        return self.users.get(user_id)
+
+    def get_user_by_name(self, name):
+        return self._users_by_name.get(name)
+
+    def set_channel(self, channel):
+        self._set_named(self.channels, self._channels_by_name, channel)
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    def get_channel_by_name(self, name):
+        return self._channels_by_name.get(name)
+
+    def remove_channel(self, channel_id):
+        return self._remove_named(self.channels, self._channels_by_name, channel_id)
+
+    def set_group(self, group):
+        self._set_named(self.groups, self._groups_by_name, group)
+
+    def get_group(self, group_id):
+        return self.groups.get(group_id)
+
+    def get_group_by_name(self, name):
+        return self._groups_by_name.get(name)
+
+    def remove_group(self, group_id):
+        return self._remove_named(self.groups, self._groups_by_name, group_id)
+
+    def set_im(self, im):
+        self.ims[im.id] = im
+
+    def get_im(self, im_id):
+        return self.ims.get(im_id)
+
+    def set_mpim(self, mpim):
+        self.mpims[mpim.id] = mpim
+
+    def get_mpim(self, mpim_id):
+        return self.mpims.get(mpim_id)
+
+    def set_bot(self, bot):
+        self.bots[bot.id] = bot
+
+    def get_bot(self, bot_id):
+        return self.bots.get(bot_id)
+
+    def _get_any_channel(self, channel_id):
+        for index in (self.channels, self.groups, self.mpims):
+            try:
+                return index[channel_id]
+            except KeyError:
+                pass
+        return None
+
+    def register(self, dispatcher):
+        """
+        Registers event handlers which keep state up to date.
+
+        Handlers receive raw frames, so no event model is built to update state.
+
+        :param dispatcher: :class:`~aioslackbot.dispatcher.EventDispatcher`.
+        """
+        for event_type, handler in ((EventTypeEnum.CHANNEL_CREATED, self._on_channel_updated),
+                                    (EventTypeEnum.CHANNEL_JOINED, self._on_channel_updated),
+                                    (EventTypeEnum.CHANNEL_RENAME, self._on_channel_rename),
+                                    (EventTypeEnum.CHANNEL_DELETED, self._on_channel_deleted),
+                                    (EventTypeEnum.CHANNEL_ARCHIVE, self._on_archive),
+                                    (EventTypeEnum.CHANNEL_UNARCHIVE, self._on_unarchive),
+                                    (EventTypeEnum.GROUP_JOINED, self._on_group_updated),
+                                    (EventTypeEnum.GROUP_RENAME, self._on_group_rename),
+                                    (EventTypeEnum.GROUP_LEFT, self._on_group_left),
+                                    (EventTypeEnum.GROUP_ARCHIVE, self._on_archive),
+                                    (EventTypeEnum.GROUP_UNARCHIVE, self._on_unarchive),
+                                    (EventTypeEnum.IM_CREATED, self._on_im_created),
+                                    (EventTypeEnum.MEMBER_JOINED_CHANNEL, self._on_member_joined_channel),
+                                    (EventTypeEnum.MEMBER_LEFT_CHANNEL, self._on_member_left_channel),
+                                    (EventTypeEnum.TEAM_JOIN, self._on_user_updated),
+                                    (EventTypeEnum.USER_CHANGE, self._on_user_updated),
+                                    (EventTypeEnum.BOT_ADDED, self._on_bot_updated),
+                                    (EventTypeEnum.BOT_CHANGED, self._on_bot_updated)):
+            dispatcher.add_handler(handler, event_type, raw=True)
+
+    async def _on_channel_updated(self, data):
+        self.set_channel(Channel(data=data['channel']))
+
+    async def _on_channel_rename(self, data):
+        channel = self.remove_channel(data['channel']['id'])
+        if channel is None:
+            channel = Channel(data=data['channel'])
+        else:
+            channel.name = data['channel']['name']
+        self.set_channel(channel)
+
+    async def _on_channel_deleted(self, data):
+        self.remove_channel(data['channel'])
+
+    async def _on_group_updated(self, data):
+        self.set_group(Group(data=data['channel']))
+
+    async def _on_group_rename(self, data):
+        group = self.remove_group(data['channel']['id'])
+        if group is None:
+            group = Group(data=data['channel'])
+        else:
+            group.name = data['channel']['name']
+        self.set_group(group)
+
+    async def _on_group_left(self, data):
+        self.remove_group(data['channel'])
+
+    async def _on_archive(self, data):
+        channel = self._get_any_channel(data['channel'])
+        if channel is not None:
+            channel.is_archived = True
+
+    async def _on_unarchive(self, data):
+        channel = self._get_any_channel(data['channel'])
+        if channel is not None:
+            channel.is_archived = False
+
+    async def _on_im_created(self, data):
+        self.set_im(Im(data=data['channel']))
+
+    async def _on_member_joined_channel(self, data):
+        channel = self._get_any_channel(data['channel'])
+        if channel is None:
+            return
+        if channel.members is None:
+            channel.members = []
+        if data['user'] not in channel.members:
+            channel.members.append(data['user'])
+
+    async def _on_member_left_channel(self, data):
+        channel = self._get_any_channel(data['channel'])
+        if channel is None or channel.members is None:
+            return
+        try:
+            channel.members.remove(data['user'])
+        except ValueError:
+            pass
+
+    async def _on_user_updated(self, data):
+        self.set_user(User(data=data['user']))
+
+    async def _on_bot_updated(self, data):
+        self.set_bot(Bot(data=data['bot']))
+
+
+def _same_time(value, timestamp):
+    # Stored value is built by DateTimeField from an integer timestamp, as naive local time
+    if value is None or not isinstance(timestamp, int):
+        return False
+    return value == datetime.fromtimestamp(timestamp)
@@ -0,0 +1,203 @@
+"""
+Incremental parsing of huge Web API responses.
+
+Responses like ``rtm.start`` or an unpaginated ``users.list`` could weigh tens of megabytes on big
+workspaces. :class:`ResponseStream` parses response body while it is read and yields entities of
+its array fields one by one, so whole document and whole model tree are never in memory at once.
+
+.. code-block:: python
+
+    stream = bot.rtm.stream_start(batch_presence_aware=True)
+    async for field, entity in stream:
+        ...
+
+    print(stream.response.url)
+"""
+from codecs import getincrementaldecoder
+from json import JSONDecodeError, JSONDecoder
+
+from service_client.plugins import BasePlugin
+
+from .utils import _call_endpoint
+
+DEFAULT_CHUNK_SIZE = 2 ** 16
+"""
+Default number of bytes read from response body each time.
+"""
+
+STREAM_RESPONSE_PARAM = 'stream_response'
+"""
+:meth:`service_client.ServiceClient.call` keyword to get response before its body is read.
+"""
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = ',:]}'
+
+
+class StreamResponse(BasePlugin):
+    """
+    Plugin which returns responses without reading their body when call is made using
+    ``stream_response=True`` keyword.
+    """
+
+    async def prepare_session(self, endpoint_desc, session, request_params):
+        if request_params.pop(STREAM_RESPONSE_PARAM, False):
+            endpoint_desc['stream_response'] = True
+
+
+class _JsonReader:
+
+    def __init__(self, chunks):
+        self._chunks = chunks.__aiter__()
+        self._text_decoder = getincrementaldecoder('utf-8')()
+        self._decode = JSONDecoder().raw_decode
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self, size=1):
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+
+        target = len(self.buffer) + size
+        while len(self.buffer) < target and not self.eof:
+            try:
+                chunk = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self.buffer += self._text_decoder.decode(b'', final=True)
+                self.eof = True
+            else:
+                self.buffer += self._text_decoder.decode(chunk)
+
+    async def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                raise ValueError('Unexpected end of JSON document')
+            await self.fill()
+
+    async def expect(self, char):
+        if await self.peek() != char:
+            raise ValueError('Expected {} at position {}'.format(char, self.pos))
+        self.pos += 1
+
+    async def value(self):
+        await self.peek()
+        while True:
+            try:
+                value, end = self._decode(self.buffer, self.pos)
+            except JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A value could be truncated (for example, "1." of "1.5"), so it is only
+                # complete when a delimiter follows it
+                delimiter = end
+                while delimiter < len(self.buffer) and self.buffer[delimiter] in _WHITESPACE:
+                    delimiter += 1
+                if self.eof or (delimiter < len(self.buffer) and self.buffer[delimiter] in _DELIMITERS):
+                    self.pos = end
+                    return value
+
+            # Read as much as buffered again, so big values are not decoded too many times
+            await self.fill(max(len(self.buffer) - self.pos, 1))
+
+
+async def iter_json_object(chunks, stream_fields=()):
+    """
+    Parses a JSON object while it is read.
+
+    :param chunks: Async iterable of ``bytes`` chunks.
+    :param stream_fields: Names of array fields whose items must be yielded one by one.
+    :return: Async iterator of ``(field name, value)`` tuples. Array fields on ``stream_fields``
+        yield a tuple for each item instead.
+    """
+    reader = _JsonReader(chunks)
+    await reader.expect('{')
+
+    while True:
+        char = await reader.peek()
+        if char == '}':
+            return
+        if char == ',':
+            reader.pos += 1
+            continue
+
+        key = await reader.value()
+        await reader.expect(':')
+
+        if key not in stream_fields or await reader.peek() != '[':
+            yield key, await reader.value()
+            continue
+
+        reader.pos += 1
+        while True:
+            char = await reader.peek()
+            if char == ']':
+                reader.pos += 1
+                break
+            if char == ',':
+                reader.pos += 1
+                continue
+            yield key, await reader.value()
+
+
+class ResponseStream:
+    """
+    Web API call whose response is parsed while it is read.
+
+    Iterating it yields ``(field name, entity model)`` tuples for every item of streamed array fields.
+    Once iteration finishes, :attr:`response` holds response model built with other fields.
+
+    :param bot: :class:`~aioslackbot.Bot`.
+    :param endpoint: Endpoint name on spec.
+    :param request: Request model.
+    :param response_class: Response model class.
+    :param fields: Names of array fields to stream. Their items are built using field model class.
+    :param chunk_size: Number of bytes read from response body each time.
+    :param raw: Whether items are yielded as decoded JSON instead of models.
+    """
+
+    def __init__(self, bot, endpoint, request, response_class, fields, chunk_size=DEFAULT_CHUNK_SIZE,
+                 raw=False):
+        self.bot = bot
+        self.endpoint = endpoint
+        self.request = request
+        self.response_class = response_class
+        self.chunk_size = chunk_size
+        self.raw = raw
+        self.response = None
+
+        empty = response_class()
+        self.fields = {name: empty.get_field_obj(name).field_type.model_class for name in fields}
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        # ``429 Too Many Requests`` responses are retried like on other API calls
+        result = await _call_endpoint(self.bot, self.endpoint, self.request, **{STREAM_RESPONSE_PARAM: True})
+        data = {}
+        try:
+            if result.status != 200:
+                try:
+                    data = self.bot.codec.parse(await result.read()) or {}
+                except ValueError:
+                    data = {'ok': False}
+                return
+
+            async for key, value in iter_json_object(result.content.iter_chunked(self.chunk_size),
+                                                     self.fields):
+                try:
+                    model_class = self.fields[key]
+                except KeyError:
+                    data[key] = value
+                else:
+                    yield key, value if self.raw else model_class(data=value)
+        finally:
+            result.release()
+            self.response = self.response_class(data=data)
@@ -0,0 +1,218 @@
+"""
+Offline Slack Web API stand-in server.
+
+It serves every path on :mod:`~aioslackbot.slack_api_spec` with canned (or generated) responses,
+can inject latency, ``429 Too Many Requests`` responses and ``ok: false`` errors, and pushes
+RTM events over a local websocket. It is intended for load testing without a live workspace.
+
+.. code-block:: python
+
+    server = FakeSlackServer(latency=0.005, rate_limit_rate=0.01)
+    await server.start()
+
+    bot = Bot('xoxb-fake', base_path=server.base_path)
+    ...
+    await server.push_event({'type': 'message', 'channel': 'C1', 'text': 'Hello'})
+
+It could be run standalone too::
+
+    python -m aioslackbot.testing --port 8080 --latency 0.005
+"""
+import json
+from argparse import ArgumentParser
+from asyncio import CancelledError, get_event_loop, sleep
+from collections import Counter
+from random import Random
+
+from aiohttp import WSMsgType, web
+
+from .slack_api_spec import spec as default_spec
+
+API_PATH = '/api'
+RTM_PATH = '/rtm'
+
+
+class FakeSlackServer:
+    """
+    Fake Slack server.
+
+    :param spec: Endpoint spec. By default, :data:`aioslackbot.slack_api_spec.spec`.
+    :param responses: Dictionary of endpoint name to response data, or to function which receives
+        request data and returns response data. Endpoints without response reply ``{"ok": true}``.
+    :param latency: Seconds to wait before replying, or dictionary of endpoint name to seconds.
+    :param rate_limit_rate: Ratio of calls answered with ``429 Too Many Requests``.
+    :param retry_after: ``Retry-After`` header value sent on ``429`` responses.
+    :param error_rate: Ratio of calls answered with ``{"ok": false}``.
+    :param seed: Random seed used to inject failures, so runs are reproducible.
+    :param host: Host to listen on.
+    :param port: Port to listen on. ``0`` picks a free one.
+    """
+
+    def __init__(self, spec=None, responses=None, latency=0, rate_limit_rate=0, retry_after=1,
+                 error_rate=0, seed=None, host='127.0.0.1', port=0):
+        self.spec = spec or default_spec
+        self.responses = responses or {}
+        self.latency = latency
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.random = Random(seed)
+        self.host = host
+        self.port = port
+
+        self.calls = Counter()
+        self.websockets = set()
+
+        self.app = web.Application()
+        for endpoint, desc in self.spec.items():
+            self.app.router.add_route(desc.get('method', 'GET').upper(),
+                                      API_PATH + desc['path'],
+                                      self._make_handler(endpoint))
+        self.app.router.add_get(RTM_PATH, self._rtm_handler)
+        self._runner = None
+
+    @property
+    def base_url(self):
+        return 'http://{}:{}'.format(self.host, self.port)
+
+    @property
+    def base_path(self):
+        """
+        Base path to use on :class:`~aioslackbot.Bot`.
+        """
+        return self.base_url + API_PATH
+
+    @property
+    def rtm_url(self):
+        return 'ws://{}:{}{}'.format(self.host, self.port, RTM_PATH)
+
+    async def start(self):
+        """
+        Starts listening.
+        """
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if not self.port:
+            self.port = self._runner.addresses[0][1]
+
+    async def stop(self):
+        """
+        Closes websockets and stops listening.
+        """
+        for ws in list(self.websockets):
+            await ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def get_response(self, endpoint, data):
+        """
+        Builds response data for an endpoint.
+
+        :param endpoint: Endpoint name on spec.
+        :param data: Request data.
+        :return: Response data.
+        """
+        try:
+            response = self.responses[endpoint]
+        except KeyError:
+            if endpoint in ('rtm__connect', 'rtm__start'):
+                return {'ok': True, 'url': self.rtm_url}
+            return {'ok': True}
+
+        if callable(response):
+            return response(data)
+        return response
+
+    def _make_handler(self, endpoint):
+        async def handler(request):
+            self.calls[endpoint] += 1
+
+            try:
+                latency = self.latency[endpoint]
+            except TypeError:
+                latency = self.latency
+            except KeyError:
+                latency = 0
+            if latency:
+                await sleep(latency)
+
+            if self.rate_limit_rate and self.random.random() < self.rate_limit_rate:
+                return web.json_response({'ok': False, 'error': 'ratelimited'}, status=429,
+                                         headers={'Retry-After': str(self.retry_after)})
+
+            if self.error_rate and self.random.random() < self.error_rate:
+                return web.json_response({'ok': False, 'error': 'fake_error'})
+
+            return web.json_response(self.get_response(endpoint, await self._read_request(request)))
+
+        return handler
+
+    @staticmethod
+    async def _read_request(request):
+        data = dict(request.query)
+        if not request.can_read_body:
+            return data
+        if request.content_type == 'application/json':
+            data.update(await request.json())
+        else:
+            data.update(await request.post())
+        return data
+
+    async def _rtm_handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.websockets.add(ws)
+        try:
+            await ws.send_str(json.dumps({'type': 'hello'}))
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                data = json.loads(msg.data)
+                if data.get('type') == 'ping':
+                    # Slack echoes ping fields, replacing its id by reply_to
+                    reply = dict(data, type='pong', reply_to=data.pop('id', None))
+                    await ws.send_str(json.dumps(reply))
+        finally:
+            self.websockets.discard(ws)
+        return ws
+
+    async def push_event(self, data):
+        """
+        Sends an event to every connected RTM websocket.
+
+        :param data: Event data.
+        """
+        frame = json.dumps(data)
+        for ws in list(self.websockets):
+            await ws.send_str(frame)
+
+
+def main(argv=None):  # pragma: no cover
+    parser = ArgumentParser(description='Offline Slack Web API stand-in server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0, help='Seconds to wait before replying.')
+    parser.add_argument('--rate-limit-rate', type=float, default=0, help='Ratio of 429 responses.')
+    parser.add_argument('--error-rate', type=float, default=0, help='Ratio of ok: false responses.')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = FakeSlackServer(host=args.host, port=args.port, latency=args.latency,
+                             rate_limit_rate=args.rate_limit_rate, error_rate=args.error_rate,
+                             seed=args.seed)
+    loop = get_event_loop()
+    loop.run_until_complete(server.start())
+    print('Fake Slack API listening on {}'.format(server.base_path))
+    try:
+        loop.run_forever()
+    except (KeyboardInterrupt, CancelledError):
+        pass
+    finally:
+        loop.run_until_complete(server.stop())
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
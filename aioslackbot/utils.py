@@ -1,36 +1,189 @@
-from inspect import signature
+import json
+from asyncio import CancelledError, shield, sleep
+from collections import namedtuple
+from inspect import Signature, signature
 
 from functools import wraps
 
+from .ratelimit import get_retry_after
 
-def return_model(func=None, *, just_return_bool=False):
+Endpoint = namedtuple('Endpoint', ['name', 'path', 'http_method', 'cache_ttl'])
+"""
+Endpoint resolved from spec: name on spec, path, HTTP method and response cache time to live.
+"""
+
+
+def build_call_table(spec):
+    """
+    Resolves every endpoint on spec once, so API methods do not build endpoint names
+    nor look spec up on each call.
+
+    :param spec: Endpoint spec.
+    :return: Dictionary of module method prefix to dictionary of method name to :class:`Endpoint`.
+    """
+    table = {}
+    for name, desc in spec.items():
+        prefix, _, method = name.rpartition('__')
+        table.setdefault(prefix, {})[method] = Endpoint(name=name,
+                                                        path=desc.get('path'),
+                                                        http_method=desc.get('method', 'GET').upper(),
+                                                        cache_ttl=desc.get('cache_ttl'))
+    return table
+
+
+def request_key(request):
+    """
+    Builds a hashable key which identifies request data.
+
+    :param request: Request model.
+    :return: String key.
+    """
+    return json.dumps(request.export_data(), sort_keys=True, default=str)
+
+
+class _Flight:
+    """
+    API call in flight. Request key and shared future are only built when another caller
+    needs them.
+    """
+
+    __slots__ = ('request', 'key', 'future')
+
+    def __init__(self, request):
+        self.request = request
+        self.key = None
+        self.future = None
+
+
+async def _call_endpoint(bot, endpoint, request, **kwargs):
+    retries = bot.rate_limit_retries
+
+    while True:
+        result = await bot.service_client.call(endpoint=endpoint, payload=request, **kwargs)
+        if result.status != 429 or retries <= 0:
+            return result
+        # Streamed responses are not read, so their connection must be released
+        result.release()
+        retries -= 1
+        # Rate limit plugin blocks endpoint as long as Retry-After header says
+        if bot.rate_limiter is None:
+            await sleep(get_retry_after(result))
+
+
+def return_model(func=None, *, just_return_bool=False, single_flight=False):
+    """
+    Decorator to call API method with request model and build response model.
+
+    :param just_return_bool: Whether to return ``True`` instead of response model.
+    :param single_flight: Whether concurrent calls with same request data must share one
+        API call. Only use it on read only methods: every caller gets same response model instance.
+
+    Successful responses of endpoints with ``cache_ttl`` on spec are stored on bot cache, keyed by
+    bot token, endpoint and request data.
+    """
 
     def inner(func):
-        type_hints = signature(func).parameters
+        name = func.__name__
+        klass = signature(func).return_annotation
 
-        try:
-            klass = type_hints['return'].annotation
-            klass = klass.__args__[0]
-        except (AttributeError, IndexError):  # pragma: no cover
+        if klass is Signature.empty:  # pragma: no cover
+            klass = None
+        else:
             try:
-                klass = klass.__union_params__[0]
+                klass = klass.__args__[0]
             except (AttributeError, IndexError):
-                klass = None
+                try:
+                    klass = klass.__union_params__[0]
+                except (AttributeError, IndexError):
+                    pass
 
-        @wraps(func)
-        async def wrapper(self, request):
+        async def call(self, request):
+            bot = self.parent
+            endpoint = self._endpoints[name]
 
-            result = await self.parent.service_client.call(method="{}__{}".format(self._method_prefix,
-                                                                                  func.__name__),
-                                                           payload=request)
+            if endpoint.cache_ttl and bot.cache is not None:
+                key = '{}:{}:{}'.format(bot.cache_namespace, endpoint.name, request_key(request))
+                try:
+                    data = await bot.cache.get(key)
+                except KeyError:
+                    result = await _call_endpoint(bot, endpoint.name, request)
+                    data = result.data
+                    if result.status == 200 and isinstance(data, dict) and data.get('ok'):
+                        await bot.cache.set(key, data, endpoint.cache_ttl)
+            else:
+                data = (await _call_endpoint(bot, endpoint.name, request)).data
 
             if just_return_bool:
                 return True
 
             if klass is not None:
-                return klass(data=result.data)
+                return klass(data=data)
+
+            return data
+
+        if not single_flight:
+            return wraps(func)(call)
+
+        @wraps(func)
+        async def wrapper(self, request):
+            bot = self.parent
+            key = None
+            while True:
+                flights = self._in_flight.get(name)
+                if flights is None:
+                    break
+
+                # Request keys are only built when a call of same method is in flight. Flights are
+                # indexed by key once there are more than one, so each call only builds its own key.
+                key = request_key(request)
+                if isinstance(flights, _Flight):
+                    if flights.key is None:
+                        flights.key = request_key(flights.request)
+                    flights = self._in_flight[name] = {flights.key: flights}
+
+                try:
+                    flight = flights[key]
+                except KeyError:
+                    break
 
-            return result.data
+                if flight.future is None:
+                    flight.future = bot.loop.create_future()
+                try:
+                    return await shield(flight.future)
+                except CancelledError:
+                    if not flight.future.cancelled():
+                        raise
+                # Shared call was cancelled by its caller, so it is made again
+
+            flight = _Flight(request)
+            flight.key = key
+            if flights is None:
+                self._in_flight[name] = flight
+            else:
+                flights[key] = flight
+
+            try:
+                result = await call(self, request)
+            except CancelledError:
+                if flight.future is not None:
+                    flight.future.cancel()
+                raise
+            except Exception as ex:
+                if flight.future is not None:
+                    flight.future.set_exception(ex)
+                raise
+            else:
+                if flight.future is not None:
+                    flight.future.set_result(result)
+                return result
+            finally:
+                flights = self._in_flight.get(name)
+                if flights is flight:
+                    del self._in_flight[name]
+                elif isinstance(flights, dict) and flights.get(flight.key) is flight:
+                    del flights[flight.key]
+                    if not flights:
+                        del self._in_flight[name]
 
         return wrapper
 
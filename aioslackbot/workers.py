@@ -0,0 +1,450 @@
+"""
+Multi-process Real Time Messaging workers.
+
+:class:`WorkerSupervisor` spawns worker processes and shards workspaces between them using
+consistent hashing, so each worker runs a :class:`~aioslackbot.pool.BotPool` of its own teams on
+its own event loop and CPU core. Workers share nothing: events of a team are handled by the worker
+which owns that team, and Web API calls requested on supervisor are forwarded to that worker.
+
+.. code-block:: python
+
+    def setup(pool):
+        @pool.on(EventTypeEnum.MESSAGE)
+        async def on_message(team_id, event):
+            ...
+
+    supervisor = WorkerSupervisor(tokens, setup=setup, workers=4)
+    await supervisor.run()
+
+``setup`` function is called on every worker process, so it must be picklable (a module level function).
+"""
+import multiprocessing
+from asyncio import ensure_future, get_event_loop, new_event_loop, set_event_loop, sleep, wait_for
+from bisect import bisect, insort
+from hashlib import md5
+from itertools import count
+from logging import getLogger
+
+from .pool import BotPool
+
+DEFAULT_REPLICAS = 100
+"""
+Default number of points of each worker on hash ring.
+"""
+
+DEFAULT_CHECK_INTERVAL = 1
+"""
+Default seconds between worker health checks.
+"""
+
+DEFAULT_RESTART_BACKOFF = 1
+"""
+Default seconds to wait before restarting a dead worker. It doubles on each consecutive crash.
+"""
+
+DEFAULT_MAX_RESTART_BACKOFF = 60
+"""
+Default maximum seconds to wait before restarting a dead worker. A worker which stays alive
+that long is considered healthy again.
+"""
+
+DEFAULT_CALL_TIMEOUT = 30
+"""
+Default seconds to wait for a forwarded call result.
+"""
+
+DEFAULT_RTM_OPTIONS = {'reconnect': True}
+"""
+Default keyword arguments for :meth:`~aioslackbot.RtmModule.run` of every workspace. Sessions
+reconnect, so a dropped websocket does not leave a workspace offline inside a healthy worker.
+"""
+
+
+class WorkerCrashedError(Exception):
+    """
+    Worker process died before answering a forwarded call.
+    """
+    pass
+
+
+class HashRing:
+    """
+    Consistent hash ring. Adding or removing a node only moves keys of that node.
+
+    :param nodes: Initial nodes.
+    :param replicas: Number of points of each node on ring.
+    """
+
+    def __init__(self, nodes=(), replicas=DEFAULT_REPLICAS):
+        self.replicas = replicas
+        self._keys = []
+        self._nodes = {}
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(key):
+        return int(md5(str(key).encode('utf-8')).hexdigest()[:16], 16)
+
+    def add(self, node):
+        for i in range(self.replicas):
+            point = self._hash('{}:{}'.format(node, i))
+            self._nodes[point] = node
+            insort(self._keys, point)
+
+    def remove(self, node):
+        for i in range(self.replicas):
+            point = self._hash('{}:{}'.format(node, i))
+            del self._nodes[point]
+            self._keys.remove(point)
+
+    def get_node(self, key):
+        """
+        Returns node which owns a key.
+
+        :param key: Key to look up.
+        :raise KeyError: When ring is empty.
+        """
+        if not self._keys:
+            raise KeyError(key)
+        index = bisect(self._keys, self._hash(key)) % len(self._keys)
+        return self._nodes[self._keys[index]]
+
+
+async def _call(pool, team_id, method, kwargs):
+    target = pool[team_id]
+    for name in method.split('.'):
+        target = getattr(target, name)
+    response = await target(**kwargs)
+    return response.export_data()
+
+
+async def _serve(pool, inbox, results, rtm_options):
+    loop = pool.loop
+    rtm_tasks = {team_id: ensure_future(pool.run_rtm([team_id], **rtm_options), loop=loop) for team_id in pool}
+
+    async def forward(call_id, team_id, method, kwargs):
+        try:
+            result = (call_id, await _call(pool, team_id, method, kwargs), None)
+        except Exception as ex:
+            result = (call_id, None, repr(ex))
+        try:
+            results.send(result)
+        except OSError:  # pragma: no cover
+            # Supervisor is gone, so nobody is waiting for result
+            pass
+
+    while True:
+        message = await loop.run_in_executor(None, inbox.get)
+        if message is None:
+            break
+
+        command, args = message[0], message[1:]
+        if command == 'call':
+            ensure_future(forward(*args), loop=loop)
+        elif command == 'add':
+            team_id, token = args
+            pool.add(team_id, token)
+            task = rtm_tasks.pop(team_id, None)
+            if task is not None:
+                task.cancel()
+            rtm_tasks[team_id] = ensure_future(pool.run_rtm([team_id], **rtm_options), loop=loop)
+        elif command == 'remove':
+            team_id, = args
+            task = rtm_tasks.pop(team_id, None)
+            if task is not None:
+                task.cancel()
+            pool.remove(team_id)
+
+    for task in rtm_tasks.values():
+        task.cancel()
+    await pool.close()
+
+
+def run_worker(tokens, inbox, results, setup=None, bot_options=None, rtm_options=None):
+    """
+    Worker process entry point. It runs a :class:`~aioslackbot.pool.BotPool` until it receives ``None``.
+
+    :param tokens: Dictionary of workspace identifier to token.
+    :param inbox: Queue of commands from supervisor.
+    :param results: Connection where forwarded call results are sent. It is only written by this
+        worker, so a crash could not leave it locked for other workers.
+    :param setup: Function which receives pool to register event handlers.
+    :param bot_options: Keyword arguments used to build every :class:`~aioslackbot.Bot`.
+    :param rtm_options: Keyword arguments for :meth:`~aioslackbot.RtmModule.run` of every workspace.
+        By default, :data:`DEFAULT_RTM_OPTIONS`.
+    """
+    loop = new_event_loop()
+    set_event_loop(loop)
+
+    pool = BotPool(loop=loop, **(bot_options or {}))
+    for team_id, token in tokens.items():
+        pool.add(team_id, token)
+    if setup is not None:
+        setup(pool)
+
+    try:
+        loop.run_until_complete(_serve(pool, inbox, results,
+                                       DEFAULT_RTM_OPTIONS if rtm_options is None else rtm_options))
+    finally:
+        results.close()
+        loop.close()
+
+
+class Worker:
+    """
+    Worker process handle.
+
+    :param worker_id: Worker identifier.
+    :param context: Multiprocessing context.
+    """
+
+    def __init__(self, worker_id, context):
+        self.worker_id = worker_id
+        self.context = context
+        self.tokens = {}
+        self.inbox = None
+        self.results = None
+        self.process = None
+        self.restarts = 0
+        self.failures = 0
+        self.started_at = None
+        self.restart_at = None
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def start(self, setup=None, bot_options=None, rtm_options=None):
+        """
+        Spawns worker process with a new command queue and a new result pipe, so nothing
+        a dead process left locked is reused.
+        """
+        self.inbox = self.context.Queue()
+        self.results, writer = self.context.Pipe(duplex=False)
+        self.process = self.context.Process(target=run_worker,
+                                            name='aioslackbot-worker-{}'.format(self.worker_id),
+                                            args=(dict(self.tokens), self.inbox, writer),
+                                            kwargs={'setup': setup, 'bot_options': bot_options,
+                                                    'rtm_options': rtm_options},
+                                            daemon=True)
+        self.process.start()
+        # Worker process holds the only write end, so pipe reaches end of file when it dies
+        writer.close()
+        self.restart_at = None
+
+    def send(self, *message):
+        self.inbox.put(message)
+
+    def stop(self, timeout=None):
+        if self.alive:
+            self.inbox.put(None)
+            self.process.join(timeout)
+        if self.alive:
+            self.process.terminate()
+            self.process.join()
+
+
+class WorkerSupervisor:
+    """
+    Runs Real Time Messaging sessions of many workspaces on several worker processes.
+
+    :param tokens: Dictionary of workspace identifier to token.
+    :param setup: Function called on every worker with its :class:`~aioslackbot.pool.BotPool`.
+    :param workers: Number of worker processes. By default, number of CPUs.
+    :param replicas: Number of points of each worker on hash ring.
+    :param check_interval: Seconds between worker health checks.
+    :param restart_backoff: Seconds to wait before restarting a dead worker. It doubles on each
+        consecutive crash of same worker.
+    :param max_restart_backoff: Maximum seconds to wait before restarting a dead worker.
+    :param call_timeout: Default seconds to wait for a forwarded call result.
+    :param rtm_options: Keyword arguments for :meth:`~aioslackbot.RtmModule.run` of every workspace.
+        By default, :data:`DEFAULT_RTM_OPTIONS`.
+    :param start_method: Multiprocessing start method.
+    :param logger: Logger.
+    :param loop: Event loop.
+    :param bot_options: Keyword arguments used to build every :class:`~aioslackbot.Bot`.
+    """
+
+    def __init__(self, tokens=None, setup=None, workers=None, replicas=DEFAULT_REPLICAS,
+                 check_interval=DEFAULT_CHECK_INTERVAL, restart_backoff=DEFAULT_RESTART_BACKOFF,
+                 max_restart_backoff=DEFAULT_MAX_RESTART_BACKOFF, call_timeout=DEFAULT_CALL_TIMEOUT,
+                 rtm_options=None, start_method=None, logger=None, loop=None, **bot_options):
+        self.setup = setup
+        self.check_interval = check_interval
+        self.restart_backoff = restart_backoff
+        self.max_restart_backoff = max_restart_backoff
+        self.call_timeout = call_timeout
+        self.rtm_options = DEFAULT_RTM_OPTIONS if rtm_options is None else rtm_options
+        self.bot_options = bot_options
+        self.logger = logger or getLogger('slack-bot.workers')
+        self.loop = loop or get_event_loop()
+
+        context = multiprocessing.get_context(start_method)
+        self.workers = [Worker(worker_id, context)
+                        for worker_id in range(workers or multiprocessing.cpu_count())]
+        self.ring = HashRing(range(len(self.workers)), replicas=replicas)
+
+        self._running = False
+        self._calls = {}
+        self._call_ids = count()
+
+        for team_id, token in (tokens or {}).items():
+            self.add_team(team_id, token)
+
+    def get_worker(self, team_id):
+        """
+        Returns worker which owns a workspace.
+
+        :param team_id: Workspace identifier.
+        :return: :class:`Worker`.
+        """
+        return self.workers[self.ring.get_node(team_id)]
+
+    def add_team(self, team_id, token):
+        """
+        Adds a workspace. If supervisor is running, worker starts its RTM session at once.
+
+        :param team_id: Workspace identifier.
+        :param token: Workspace bot token.
+        """
+        worker = self.get_worker(team_id)
+        worker.tokens[team_id] = token
+        if worker.alive:
+            worker.send('add', team_id, token)
+
+    def remove_team(self, team_id):
+        """
+        Removes a workspace and closes its RTM session.
+
+        :param team_id: Workspace identifier.
+        """
+        worker = self.get_worker(team_id)
+        del worker.tokens[team_id]
+        if worker.alive:
+            worker.send('remove', team_id)
+
+    def start(self):
+        """
+        Spawns worker processes.
+        """
+        self._running = True
+        for worker in self.workers:
+            self._start_worker(worker)
+
+    async def stop(self, timeout=5):
+        """
+        Stops worker processes. Pending forwarded calls fail with :class:`WorkerCrashedError`.
+
+        :param timeout: Seconds to wait for each worker to finish before terminating it.
+        """
+        self._running = False
+        for worker in self.workers:
+            await self.loop.run_in_executor(None, worker.stop, timeout)
+            self._close_results(worker)
+            self._fail_calls(worker.worker_id)
+
+    async def run(self):
+        """
+        Spawns workers and restarts them when they die, until it is stopped or cancelled.
+        Workers are stopped on exit.
+        """
+        self.start()
+        try:
+            while self._running:
+                await sleep(self.check_interval)
+                self.check_workers()
+        finally:
+            await self.stop()
+
+    def check_workers(self):
+        """
+        Restarts dead workers. A worker which keeps crashing is restarted with an exponential backoff.
+        """
+        now = self.loop.time()
+        for worker in self.workers:
+            if worker.alive:
+                continue
+
+            if worker.restart_at is None:
+                self._close_results(worker)
+                self._fail_calls(worker.worker_id)
+
+                if now - worker.started_at >= self.max_restart_backoff:
+                    worker.failures = 0
+                delay = min(self.restart_backoff * 2 ** worker.failures, self.max_restart_backoff)
+                worker.failures += 1
+                worker.restart_at = now + delay
+                self.logger.warning("Worker {} died with exit code {}. Restarting in {:.1f} s...".format(
+                    worker.worker_id, worker.process.exitcode, delay))
+
+            if now >= worker.restart_at:
+                worker.restarts += 1
+                self._start_worker(worker)
+
+    async def call(self, team_id, method, timeout=None, **kwargs):
+        """
+        Forwards a Web API call to worker which owns workspace.
+
+        .. code-block:: python
+
+            await supervisor.call('T00000001', 'chat.post_message', channel='C1', text='Hello')
+
+        :param team_id: Workspace identifier.
+        :param method: Bot module and method names, dot separated.
+        :param timeout: Seconds to wait for result. By default, :attr:`call_timeout`.
+        :param kwargs: Method keyword arguments. They must be picklable.
+        :return: Exported response data.
+        :raise WorkerCrashedError: When worker is dead or it dies before answering.
+        :raise asyncio.TimeoutError: When worker does not answer in time.
+        """
+        worker = self.get_worker(team_id)
+        if not worker.alive:
+            raise WorkerCrashedError(worker.worker_id)
+
+        call_id = next(self._call_ids)
+        future = self.loop.create_future()
+        self._calls[call_id] = (worker.worker_id, future)
+        try:
+            worker.send('call', call_id, team_id, method, kwargs)
+            return await wait_for(future, self.call_timeout if timeout is None else timeout)
+        finally:
+            self._calls.pop(call_id, None)
+
+    def _start_worker(self, worker):
+        worker.start(setup=self.setup, bot_options=self.bot_options, rtm_options=self.rtm_options)
+        worker.started_at = self.loop.time()
+        self.loop.add_reader(worker.results.fileno(), self._read_results, worker, worker.results)
+
+    def _close_results(self, worker):
+        if worker.results is None:
+            return
+        self.loop.remove_reader(worker.results.fileno())
+        worker.results.close()
+        worker.results = None
+
+    def _fail_calls(self, worker_id):
+        for call_id, (call_worker_id, future) in list(self._calls.items()):
+            if call_worker_id == worker_id and not future.done():
+                future.set_exception(WorkerCrashedError(worker_id))
+
+    def _read_results(self, worker, results):
+        try:
+            while results.poll():
+                call_id, data, error = results.recv()
+                try:
+                    _, future = self._calls[call_id]
+                except KeyError:
+                    continue
+
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(RuntimeError(error))
+                else:
+                    future.set_result(data)
+        except (EOFError, OSError):
+            # Worker closed its pipe end, so it finished or died: its pending calls never get a result
+            if worker.results is results:
+                self._close_results(worker)
+            self._fail_calls(worker.worker_id)
@@ -0,0 +1,47 @@
+"""
+JSON codec benchmark.
+
+It measures decoding and encoding of realistic ``rtm.start`` and ``channels.history`` payloads
+with every installed codec on :mod:`aioslackbot.codec`.
+
+Usage::
+
+    python -m benchmarks.codecs [--users 50000] [--members 1000] [--messages 1000] [--repeat 3]
+"""
+from argparse import ArgumentParser
+
+from aioslackbot.codec import get_available_codecs, get_codec
+
+from .fixtures import channels_history_payload, rtm_start_payload
+from .utils import measure, report
+
+
+def bench_codec(codec, name, payload, repeat_count, items=None):
+    document = get_codec('json').dumps(payload).encode('utf-8')
+    report('{} {} loads ({:.1f} MB)'.format(codec.name, name, len(document) / 2 ** 20),
+           measure(lambda: codec.loads(document), repeat_count=repeat_count),
+           items)
+    report('{} {} dumps'.format(codec.name, name),
+           measure(lambda: codec.dumps(payload), repeat_count=repeat_count),
+           items)
+
+
+def main(argv=None):
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=50000, help='Users on rtm.start payload.')
+    parser.add_argument('--members', type=int, default=1000, help='Members by channel.')
+    parser.add_argument('--messages', type=int, default=1000, help='Messages on channels.history payload.')
+    parser.add_argument('--repeat', type=int, default=3, help='Rounds by benchmark. Best one is reported.')
+    args = parser.parse_args(argv)
+
+    rtm_start = rtm_start_payload(users=args.users, members=args.members)
+    history = channels_history_payload(messages=args.messages)
+
+    for name in get_available_codecs():
+        codec = get_codec(name)
+        bench_codec(codec, 'rtm.start', rtm_start, args.repeat, items=args.users)
+        bench_codec(codec, 'channels.history', history, args.repeat, items=args.messages)
+
+
+if __name__ == '__main__':
+    main()
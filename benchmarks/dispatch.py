@@ -0,0 +1,69 @@
+"""
+API method dispatch overhead benchmark.
+
+It compares resolving endpoints by formatting their names and looking spec up on every call
+(as :func:`~aioslackbot.utils.return_model` used to do) with the call table built at
+:class:`~aioslackbot.Bot` construction. Service client is replaced by a function which returns
+a canned response, so only wrapper overhead is measured.
+
+Usage::
+
+    python -m benchmarks.dispatch [calls]
+"""
+import sys
+from asyncio import get_event_loop
+
+from aioslackbot import Bot
+
+from .utils import measure, report
+
+
+class CannedResult:
+    status = 200
+    data = {'ok': True, 'url': 'https://example.com', 'team': 'Example',
+            'user': 'bot', 'team_id': 'T00000001', 'user_id': 'U00000001'}
+
+
+async def canned_call(endpoint, payload=None, **kwargs):
+    return CannedResult
+
+
+def format_lookup(module, name, spec):
+    endpoint = "{}__{}".format(module._method_prefix, name)
+    return endpoint, spec[endpoint].get('cache_ttl')
+
+
+def table_lookup(module, name):
+    endpoint = module._endpoints[name]
+    return endpoint.name, endpoint.cache_ttl
+
+
+def main(calls=100000):
+    loop = get_event_loop()
+    bot = Bot('xoxb-fake', rate_limit=False, loop=loop)
+    bot.service_client.call = canned_call
+    spec = bot.service_client.spec
+    module = bot.auth
+
+    def resolve_format():
+        for _ in range(calls):
+            format_lookup(module, 'test', spec)
+
+    def resolve_table():
+        for _ in range(calls):
+            table_lookup(module, 'test')
+
+    async def many():
+        for _ in range(calls // 10):
+            await module.test()
+
+    try:
+        report('endpoint resolution: format and spec lookup', measure(resolve_format), calls)
+        report('endpoint resolution: call table', measure(resolve_table), calls)
+        report('auth.test through return_model', measure(lambda: loop.run_until_complete(many())), calls // 10)
+    finally:
+        loop.run_until_complete(bot.close())
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,61 @@
+"""
+End to end Web API throughput benchmark against :class:`~aioslackbot.testing.FakeSlackServer`.
+
+Usage::
+
+    python -m benchmarks.end_to_end [--calls 10000] [--concurrency 100] [--latency 0] [--outbox [--merge]]
+"""
+from argparse import ArgumentParser
+from asyncio import Semaphore, gather, get_event_loop
+
+from aioslackbot import Bot
+from aioslackbot.outbox import Outbox
+from aioslackbot.testing import FakeSlackServer
+
+
+async def run(calls, concurrency, latency, outbox=False, merge=False, channels=100):
+    server = FakeSlackServer(latency=latency)
+    await server.start()
+
+    bot = Bot('xoxb-fake', base_path=server.base_path, rate_limit=False, cache=False)
+    semaphore = Semaphore(concurrency)
+
+    async def call(i):
+        async with semaphore:
+            await bot.chat.post_message(channel='C{:08d}'.format(i % channels), text='Hello')
+
+    try:
+        loop = get_event_loop()
+        start = loop.time()
+        if outbox:
+            box = Outbox(bot.chat, concurrency=concurrency, merge=merge)
+            for i in range(calls):
+                box.post(channel='C{:08d}'.format(i % channels), text='Hello')
+            await box.flush()
+        else:
+            await gather(*[call(i) for i in range(calls)])
+        elapsed = loop.time() - start
+    finally:
+        await bot.close()
+        await server.stop()
+
+    print('{0} messages in {1:.2f} s: {2:.0f} messages/s ({3} requests)'.format(calls, elapsed, calls / elapsed,
+                                                                              sum(server.calls.values())))
+
+
+def main(argv=None):
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=10000)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0, help='Server latency in seconds.')
+    parser.add_argument('--channels', type=int, default=100, help='Number of channels messages are sent to.')
+    parser.add_argument('--outbox', action='store_true', help='Send messages using outbox.')
+    parser.add_argument('--merge', action='store_true', help='Merge consecutive messages on outbox.')
+    args = parser.parse_args(argv)
+
+    get_event_loop().run_until_complete(run(args.calls, args.concurrency, args.latency,
+                                            outbox=args.outbox, merge=args.merge, channels=args.channels))
+
+
+if __name__ == '__main__':
+    main()
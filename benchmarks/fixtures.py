@@ -0,0 +1,136 @@
+"""
+Payload generators with the shape (and realistic sizes) of Slack API responses.
+
+Every generator is deterministic, so results are comparable between runs.
+"""
+
+
+def user_payload(index):
+    return {'id': 'U{:08d}'.format(index),
+            'team_id': 'T0G9PQBBK',
+            'name': 'user.{}'.format(index),
+            'deleted': False,
+            'color': '9f69e7',
+            'real_name': 'User {}'.format(index),
+            'tz': 'Europe/Madrid',
+            'tz_label': 'Central European Summer Time',
+            'tz_offset': 7200,
+            'profile': {'avatar_hash': 'ge3b51ca72de',
+                        'status_text': 'Print is dead',
+                        'status_emoji': ':books:',
+                        'real_name': 'User {}'.format(index),
+                        'first_name': 'User',
+                        'last_name': str(index),
+                        'email': 'user.{}@example.com'.format(index),
+                        'image_24': 'https://.../{}_24.jpg'.format(index),
+                        'image_32': 'https://.../{}_32.jpg'.format(index),
+                        'image_48': 'https://.../{}_48.jpg'.format(index),
+                        'image_192': 'https://.../{}_192.jpg'.format(index),
+                        'image_512': 'https://.../{}_512.jpg'.format(index)},
+            'is_admin': index % 50 == 0,
+            'is_owner': index == 0,
+            'is_primary_owner': index == 0,
+            'is_restricted': False,
+            'is_ultra_restricted': False,
+            'is_bot': False,
+            'updated': 1502138686 + index,
+            'has_2fa': index % 3 == 0}
+
+
+def file_payload(index=0):
+    return {'id': 'F{:08d}'.format(index),
+            'created': 1356032811,
+            'timestamp': 1356032811,
+            'name': 'file.htm',
+            'title': 'My HTML file',
+            'mimetype': 'text/plain',
+            'filetype': 'text',
+            'pretty_type': 'Text',
+            'user': 'U00000001',
+            'mode': 'hosted',
+            'editable': True,
+            'is_external': False,
+            'external_type': '',
+            'size': 12345,
+            'url_private': 'https://.../file.htm',
+            'url_private_download': 'https://.../file.htm',
+            'permalink': 'https://.../file.htm',
+            'comments_count': 1,
+            'channels': ['C00000001'],
+            'groups': [],
+            'ims': []}
+
+
+def message_payload(index=0, reactions=10, attachments=3):
+    return {'type': 'message',
+            'subtype': 'file_share',
+            'channel': 'C00000001',
+            'user': 'U{:08d}'.format(index % 1000),
+            'text': 'Hello world ' * 10,
+            'ts': '{}.{:06d}'.format(1355517523 - index, index % 1000000),
+            'file': file_payload(index),
+            'attachments': [{'fallback': 'Required plain-text summary',
+                             'color': '#36a64f',
+                             'title': 'Slack API Documentation',
+                             'text': 'Optional text that appears within the attachment',
+                             'fields': [{'title': 'Priority', 'value': 'High', 'short': False}] * 3}
+                            for _ in range(attachments)],
+            'reactions': [{'name': 'thumbsup{}'.format(i),
+                           'count': 3,
+                           'users': ['U00000001', 'U00000002', 'U00000003']} for i in range(reactions)]}
+
+
+def channel_payload(index=0, members=1000):
+    return {'id': 'C{:08d}'.format(index),
+            'name': 'channel-{}'.format(index),
+            'is_channel': True,
+            'created': 1360782804,
+            'creator': 'U00000001',
+            'is_archived': False,
+            'is_general': index == 0,
+            'members': ['U{:08d}'.format(i) for i in range(members)],
+            'topic': {'value': 'Channel topic', 'creator': 'U00000001', 'last_set': 1369677212},
+            'purpose': {'value': 'Channel purpose', 'creator': 'U00000001', 'last_set': 1360782804},
+            'is_member': True,
+            'last_read': '1401383885.000061',
+            'unread_count': 0,
+            'unread_count_display': 0}
+
+
+def group_payload(index=0, members=20):
+    payload = channel_payload(index, members=members)
+    payload.update({'id': 'G{:08d}'.format(index),
+                    'name': 'group-{}'.format(index),
+                    'is_channel': False,
+                    'is_group': True})
+    return payload
+
+
+def im_payload(index=0):
+    return {'id': 'D{:08d}'.format(index),
+            'is_im': True,
+            'user': 'U{:08d}'.format(index),
+            'created': 1360782804,
+            'is_user_deleted': False}
+
+
+def rtm_start_payload(users=50000, channels=500, members=1000, groups=50, ims=200):
+    return {'ok': True,
+            'url': 'wss://ms9.slack-msgs.com/websocket/2I5yBpcvk',
+            'self': {'id': 'U00000000', 'name': 'bot', 'created': 1402463766, 'manual_presence': 'active'},
+            'team': {'id': 'T0G9PQBBK', 'name': 'Team', 'email_domain': 'example.com', 'domain': 'example',
+                     'msg_edit_window_mins': -1, 'over_storage_limit': False, 'plan': 'std'},
+            'users': [user_payload(i) for i in range(users)],
+            'channels': [channel_payload(i, members=min(members, users)) for i in range(channels)],
+            'groups': [group_payload(i) for i in range(groups)],
+            'mpims': [],
+            'ims': [im_payload(i) for i in range(ims)],
+            'bots': [{'id': 'B{:08d}'.format(i), 'name': 'bot-{}'.format(i), 'deleted': False}
+                     for i in range(20)]}
+
+
+def channels_history_payload(messages=1000):
+    return {'ok': True,
+            'latest': '1355517523.000005',
+            'messages': [message_payload(i, reactions=2, attachments=1) for i in range(messages)],
+            'has_more': True}
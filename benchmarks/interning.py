@@ -0,0 +1,76 @@
+"""
+Identifier interning memory benchmark.
+
+It measures memory taken by a ``channels.list`` response with member lists, built from a decoded
+JSON document (where every member identifier is a distinct string object), with and without
+:class:`~aioslackbot.fields.StringIdField` interning.
+
+Usage::
+
+    python -m benchmarks.interning [--channels 1000] [--members 1000] [--users 5000]
+"""
+import gc
+import json
+import tracemalloc
+from argparse import ArgumentParser
+from random import Random
+
+from dirty_models.fields import StringIdField as BaseStringIdField
+
+from aioslackbot.fields import StringIdField
+from aioslackbot.models import ChannelsListResponse
+
+from .fixtures import channel_payload
+
+
+def channels_list_document(channels, members, users, seed=0):
+    random = Random(seed)
+    payload = {'ok': True, 'channels': []}
+    for index in range(channels):
+        channel = channel_payload(index, members=0)
+        channel['members'] = ['U{:08d}'.format(random.randrange(users)) for _ in range(members)]
+        payload['channels'].append(channel)
+    return json.dumps(payload)
+
+
+def measure_memory(document):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        data = json.loads(document)
+        response = ChannelsListResponse(data=data)
+        # Decoded document is released, so only strings referenced by models remain
+        del data
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return response, after - before
+
+
+def main(argv=None):
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--channels', type=int, default=1000, help='Channels on channels.list payload.')
+    parser.add_argument('--members', type=int, default=1000, help='Members by channel.')
+    parser.add_argument('--users', type=int, default=5000, help='Distinct users on workspace.')
+    args = parser.parse_args(argv)
+
+    document = channels_list_document(args.channels, args.members, args.users)
+    items = args.channels * args.members
+
+    use_value = StringIdField.use_value
+    try:
+        StringIdField.use_value = BaseStringIdField.use_value
+        _, plain = measure_memory(document)
+    finally:
+        StringIdField.use_value = use_value
+    _, interned = measure_memory(document)
+
+    for name, size in (('without interning', plain), ('with interning', interned)):
+        print('{0:<50} {1:12.1f} MB {2:10.1f} B/member'.format(
+            'channels.list {} ({} members)'.format(name, items), size / 2 ** 20, size / items))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Lazy versus eager event decoding benchmark.
+
+It compares building a whole :class:`~aioslackbot.models.Message` tree (as
+:func:`~aioslackbot.utils.return_model` and eager dispatching do) with a
+:class:`~aioslackbot.lazy.LazyModel` wrapper which only decodes accessed fields.
+
+Usage::
+
+    python -m benchmarks.lazy_events [iterations]
+"""
+import sys
+import tracemalloc
+from timeit import timeit
+
+from aioslackbot.lazy import LazyModel
+from aioslackbot.models import Message
+
+from .fixtures import message_payload
+
+
+def eager(data):
+    message = Message(data=data)
+    message.channel, message.user
+    return message
+
+
+def lazy(data):
+    message = LazyModel(Message, data)
+    message.channel, message.user
+    return message
+
+
+def measure_allocation(func, data, count=1000):
+    tracemalloc.start()
+    try:
+        snapshot = tracemalloc.take_snapshot()
+        events = [func(data) for _ in range(count)]
+        current = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del events
+    return sum(stat.size_diff for stat in current.compare_to(snapshot, 'filename')) / count
+
+
+def main(iterations=10000):
+    data = message_payload()
+    for name, func in (('eager', eager), ('lazy', lazy)):
+        elapsed = timeit(lambda: func(data), number=iterations)
+        print('{0:>6}: {1:8.2f} us/event {2:10.0f} bytes/event'.format(name,
+                                                                      elapsed / iterations * 1e6,
+                                                                      measure_allocation(func, data)))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,50 @@
+"""
+Model parsing and serialization benchmarks.
+
+It measures building models from decoded JSON payloads and exporting them back with
+``export_data`` for hot entities and the biggest responses.
+
+Usage::
+
+    python -m benchmarks.models [--users 50000] [--members 1000] [--messages 1000] [--repeat 3]
+"""
+from argparse import ArgumentParser
+
+from aioslackbot.models import Channel, ChannelsHistoryResponse, File, Message, RtmStartResponse, User
+
+from .fixtures import channel_payload, channels_history_payload, file_payload, message_payload, \
+    rtm_start_payload, user_payload
+from .utils import measure, report
+
+
+def bench_model(name, model_class, payload, number, repeat_count, items=None):
+    model = model_class(data=payload)
+    report('{} construction'.format(name),
+           measure(lambda: model_class(data=payload), number=number, repeat_count=repeat_count),
+           items)
+    report('{} export_data'.format(name),
+           measure(model.export_data, number=number, repeat_count=repeat_count),
+           items)
+
+
+def main(argv=None):
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=50000, help='Users on rtm.start payload.')
+    parser.add_argument('--members', type=int, default=1000, help='Members by channel.')
+    parser.add_argument('--messages', type=int, default=1000, help='Messages on channels.history payload.')
+    parser.add_argument('--repeat', type=int, default=3, help='Rounds by benchmark. Best one is reported.')
+    args = parser.parse_args(argv)
+
+    bench_model('Message', Message, message_payload(), 100, args.repeat)
+    bench_model('File', File, file_payload(), 100, args.repeat)
+    bench_model('User', User, user_payload(1), 100, args.repeat)
+    bench_model('Channel ({} members)'.format(args.members), Channel,
+                channel_payload(members=args.members), 10, args.repeat)
+    bench_model('ChannelsHistoryResponse ({} messages)'.format(args.messages), ChannelsHistoryResponse,
+                channels_history_payload(messages=args.messages), 1, args.repeat, items=args.messages)
+    bench_model('RtmStartResponse ({} users)'.format(args.users), RtmStartResponse,
+                rtm_start_payload(users=args.users, members=args.members), 1, args.repeat, items=args.users)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Model versus snapshot memory benchmark.
+
+It measures memory taken by a collection of users kept as :class:`~aioslackbot.models.User`
+models and as :mod:`~aioslackbot.snapshot` instances, and their attribute access time.
+
+Usage::
+
+    python -m benchmarks.snapshot [--users 10000]
+"""
+import gc
+import tracemalloc
+from argparse import ArgumentParser
+
+from aioslackbot.models import User
+from aioslackbot.snapshot import snapshot
+
+from .fixtures import user_payload
+from .utils import measure, report
+
+
+def measure_memory(build, count):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        items = build(count)
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return items, after - before
+
+
+def build_models(count):
+    return [User(data=user_payload(index)) for index in range(count)]
+
+
+def build_snapshots(count):
+    return [snapshot(User(data=user_payload(index))) for index in range(count)]
+
+
+def read_users(users):
+    for user in users:
+        user.id, user.name, user.deleted
+
+
+def run(name, build, count):
+    users, size = measure_memory(build, count)
+    print('{0:<50} {1:12.1f} MB {2:10.0f} B/item'.format('{} ({} users)'.format(name, count),
+                                                         size / 2 ** 20, size / count))
+    report('{} attribute access'.format(name), measure(lambda: read_users(users)), count)
+
+
+def main(argv=None):
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=10000, help='Number of users.')
+    args = parser.parse_args(argv)
+
+    for name, build in (('User models', build_models), ('User snapshots', build_snapshots)):
+        run(name, build, args.users)
+
+
+if __name__ == '__main__':
+    main()
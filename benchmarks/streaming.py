@@ -0,0 +1,81 @@
+"""
+Streaming versus whole document ``rtm.start`` loading benchmark.
+
+It compares peak memory and time of decoding a whole ``rtm.start`` document, building
+:class:`~aioslackbot.models.RtmStartResponse` and loading it on workspace state, with
+parsing it incrementally using :func:`~aioslackbot.streaming.iter_json_object` and storing
+entities while they are read.
+
+Usage::
+
+    python -m benchmarks.streaming [--users 50000] [--members 1000]
+"""
+import json
+import tracemalloc
+from argparse import ArgumentParser
+from asyncio import get_event_loop
+from time import perf_counter
+
+from aioslackbot.models import RtmStartResponse
+from aioslackbot.state import WorkspaceState
+from aioslackbot.streaming import DEFAULT_CHUNK_SIZE, iter_json_object
+
+from .fixtures import rtm_start_payload
+from .utils import report
+
+STREAM_FIELDS = {'users': 'set_user', 'channels': 'set_channel', 'groups': 'set_group', 'ims': 'set_im'}
+
+
+async def iter_chunks(document):
+    for i in range(0, len(document), DEFAULT_CHUNK_SIZE):
+        yield document[i:i + DEFAULT_CHUNK_SIZE]
+
+
+async def load_whole(document):
+    state = WorkspaceState()
+    state.load_rtm_start(RtmStartResponse(data=json.loads(document)))
+    return state
+
+
+async def load_streaming(document):
+    state = WorkspaceState()
+    fields = {name: RtmStartResponse().get_field_obj(name).field_type.model_class for name in STREAM_FIELDS}
+    async for field, value in iter_json_object(iter_chunks(document), fields):
+        try:
+            model_class = fields[field]
+        except KeyError:
+            continue
+        getattr(state, STREAM_FIELDS[field])(model_class(data=value))
+    return state
+
+
+def measure_peak(func, document):
+    loop = get_event_loop()
+    tracemalloc.start()
+    try:
+        start = perf_counter()
+        state = loop.run_until_complete(func(document))
+        elapsed = perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return state, elapsed, peak
+
+
+def main(argv=None):
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=50000, help='Users on rtm.start payload.')
+    parser.add_argument('--members', type=int, default=1000, help='Members by channel.')
+    args = parser.parse_args(argv)
+
+    document = json.dumps(rtm_start_payload(users=args.users, members=args.members)).encode('utf-8')
+    print('rtm.start document: {:.1f} MB'.format(len(document) / 2 ** 20))
+
+    for name, func in (('whole document', load_whole), ('streaming', load_streaming)):
+        state, elapsed, peak = measure_peak(func, document)
+        report('rtm.start {} ({} users)'.format(name, len(state.users)), elapsed, args.users)
+        print('{0:<50} {1:12.1f} MB peak'.format('', peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+from timeit import repeat
+
+
+def measure(func, number=1, repeat_count=3):
+    """
+    Runs a function and returns best time per call in seconds.
+
+    :param func: Function to measure.
+    :param number: Calls by round.
+    :param repeat_count: Number of rounds. Best one is used.
+    """
+    return min(repeat(func, number=number, repeat=repeat_count)) / number
+
+
+def report(name, seconds, items=None):
+    """
+    Prints a benchmark result line.
+
+    :param name: Benchmark name.
+    :param seconds: Seconds per call.
+    :param items: Number of items processed per call, to report per item cost.
+    """
+    line = '{0:<50} {1:12.3f} ms'.format(name, seconds * 1e3)
+    if items:
+        line += ' {0:10.2f} us/item'.format(seconds / items * 1e6)
+    print(line)
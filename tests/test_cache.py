@@ -0,0 +1,142 @@
+from asyncio import new_event_loop, set_event_loop
+from unittest import TestCase
+
+from aioslackbot import Bot
+from aioslackbot.cache import LRUCache
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class LRUCacheTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        self.clock = FakeClock()
+        self.cache = LRUCache(max_size=2, clock=self.clock)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_get_stored(self):
+        self.loop.run_until_complete(self.cache.set('a', 1, 10))
+
+        self.assertEqual(self.loop.run_until_complete(self.cache.get('a')), 1)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 0)
+
+    def test_get_missing(self):
+        with self.assertRaises(KeyError):
+            self.loop.run_until_complete(self.cache.get('a'))
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_get_expired(self):
+        self.loop.run_until_complete(self.cache.set('a', 1, 10))
+        self.clock.now = 10
+
+        with self.assertRaises(KeyError):
+            self.loop.run_until_complete(self.cache.get('a'))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_evict_least_recently_used(self):
+        self.loop.run_until_complete(self.cache.set('a', 1, 10))
+        self.loop.run_until_complete(self.cache.set('b', 2, 10))
+        self.loop.run_until_complete(self.cache.get('a'))
+        self.loop.run_until_complete(self.cache.set('c', 3, 10))
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.loop.run_until_complete(self.cache.get('a')), 1)
+        with self.assertRaises(KeyError):
+            self.loop.run_until_complete(self.cache.get('b'))
+
+    def test_delete(self):
+        self.loop.run_until_complete(self.cache.set('a', 1, 10))
+        self.loop.run_until_complete(self.cache.delete('a'))
+
+        self.assertEqual(len(self.cache), 0)
+
+
+class FakeResult:
+
+    def __init__(self, data, status=200):
+        self.data = data
+        self.status = status
+
+
+class ResponseCacheTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+        self.cache = LRUCache()
+        self.calls = []
+        self.bots = []
+
+    def tearDown(self):
+        for bot in self.bots:
+            self.loop.run_until_complete(bot.close())
+        set_event_loop(None)
+        self.loop.close()
+
+    def build_bot(self, token, bot_name, ok=True):
+        async def fake_call(endpoint, payload=None, **kwargs):
+            self.calls.append((token, endpoint))
+            return FakeResult({'ok': ok, 'bot': {'id': getattr(payload, 'bot', None), 'name': bot_name}})
+
+        bot = Bot(token, rate_limit=False, cache=self.cache, loop=self.loop)
+        bot.service_client.call = fake_call
+        self.bots.append(bot)
+        return bot
+
+    def test_cached_response(self):
+        bot = self.build_bot('xoxb-1', 'One')
+
+        first = self.loop.run_until_complete(bot.bots.info(bot='B1'))
+        second = self.loop.run_until_complete(bot.bots.info(bot='B1'))
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(first.bot.name, 'One')
+        self.assertEqual(second.bot.name, 'One')
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_failed_response_not_cached(self):
+        bot = self.build_bot('xoxb-1', 'One', ok=False)
+
+        self.loop.run_until_complete(bot.bots.info(bot='B1'))
+        self.loop.run_until_complete(bot.bots.info(bot='B1'))
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_not_cached_endpoint(self):
+        bot = self.build_bot('xoxb-1', 'One')
+
+        self.loop.run_until_complete(bot.auth.test())
+        self.loop.run_until_complete(bot.auth.test())
+
+        self.assertEqual(len(self.calls), 2)
+
+    def test_shared_cache_by_workspace(self):
+        first = self.build_bot('xoxb-1', 'One')
+        second = self.build_bot('xoxb-2', 'Two')
+
+        self.assertEqual(self.loop.run_until_complete(first.bots.info(bot='B1')).bot.name, 'One')
+        self.assertEqual(self.loop.run_until_complete(second.bots.info(bot='B1')).bot.name, 'Two')
+        self.assertEqual(self.loop.run_until_complete(first.bots.info(bot='B1')).bot.name, 'One')
+        self.assertEqual(self.loop.run_until_complete(second.bots.info(bot='B1')).bot.name, 'Two')
+
+        self.assertEqual(self.calls, [('xoxb-1', 'bots__info'), ('xoxb-2', 'bots__info')])
+        self.assertEqual(len(self.cache), 2)
+
+    def test_cache_key_does_not_contain_token(self):
+        bot = self.build_bot('xoxb-secret', 'One')
+
+        self.loop.run_until_complete(bot.bots.info(bot='B1'))
+
+        self.assertFalse(any('xoxb-secret' in key for key in self.cache._data))
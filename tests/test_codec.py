@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+from unittest import TestCase
+
+from aioslackbot.codec import JsonCodec, get_available_codecs, get_codec
+from aioslackbot.models import ChannelsHistoryRequest, ChatPostMessageRequest, TextParse
+from aioslackbot.slack_api_spec import spec
+
+
+class CodecTests(TestCase):
+
+    def setUp(self):
+        self.codec = JsonCodec()
+
+    def test_get_codec(self):
+        self.assertIs(get_codec(self.codec), self.codec)
+        self.assertEqual(get_codec().name, get_available_codecs()[0])
+        self.assertEqual(get_codec('json').name, 'json')
+
+    def test_get_unknown_codec(self):
+        with self.assertRaises(KeyError):
+            get_codec('yaml')
+
+    def test_parse(self):
+        self.assertEqual(self.codec.parse(b'{"ok": true}'), {'ok': True})
+        self.assertIsNone(self.codec.parse(b''))
+
+    def test_dumps_enum_and_datetime(self):
+        data = {'parse': TextParse.FULL, 'ts': datetime(2017, 1, 1, tzinfo=timezone.utc)}
+
+        self.assertEqual(self.codec.loads(self.codec.dumps(data)),
+                         {'parse': 'full', 'ts': '1483228800.000000'})
+
+    def test_encode_form(self):
+        form = self.codec.encode_form({'inclusive': False, 'count': 10, 'parse': TextParse.FULL,
+                                       'attachments': [{'text': 'a'}], 'channel': 'C1', 'user': None})
+
+        self.assertEqual(form, {'inclusive': 'false', 'count': '10', 'parse': 'full',
+                                'attachments': '[{"text": "a"}]', 'channel': 'C1'})
+
+    def test_serialize_read_method_as_form(self):
+        request_params = {'headers': {}}
+
+        data = self.codec.serialize(ChannelsHistoryRequest(channel='C1', count=10),
+                                    endpoint_desc=spec['channels__history'], request_params=request_params)
+
+        self.assertEqual(data['channel'], 'C1')
+        self.assertEqual(data['count'], '10')
+        self.assertEqual(request_params['headers'], {})
+
+    def test_serialize_write_method_as_json(self):
+        request_params = {'headers': {}}
+
+        data = self.codec.serialize(ChatPostMessageRequest(channel='C1', text='Hello'),
+                                    endpoint_desc=spec['chat__post_message'], request_params=request_params)
+
+        self.assertEqual(self.codec.loads(data)['text'], 'Hello')
+        self.assertEqual(request_params['headers'], {'Content-Type': self.codec.content_type})
+
+    def test_read_methods_flagged(self):
+        for name in ('channels__history', 'channels__list', 'users__info', 'users__list', 'rtm__connect',
+                     'rtm__start', 'im__history'):
+            self.assertTrue(spec[name].get('form_encoded'), name)
+        for name in ('chat__post_message', 'chat__update', 'reactions__add'):
+            self.assertFalse(spec[name].get('form_encoded'), name)
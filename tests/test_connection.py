@@ -0,0 +1,79 @@
+from asyncio import new_event_loop, set_event_loop, sleep
+from unittest import TestCase
+from unittest.mock import patch
+
+from aiohttp import TCPConnector
+
+from aioslackbot import Bot
+from aioslackbot.connection import create_connector, get_connector_options
+
+
+class ConnectorOptionsTests(TestCase):
+
+    def test_keepalive(self):
+        options = get_connector_options(pool_size=10, keepalive_timeout=5)
+
+        self.assertEqual(options['limit'], 10)
+        self.assertEqual(options['keepalive_timeout'], 5)
+        self.assertNotIn('force_close', options)
+
+    def test_no_keepalive(self):
+        options = get_connector_options(keepalive_timeout=None)
+
+        self.assertTrue(options['force_close'])
+        self.assertNotIn('keepalive_timeout', options)
+
+    def test_no_dns_cache(self):
+        options = get_connector_options(dns_cache_ttl=0)
+
+        self.assertFalse(options['use_dns_cache'])
+
+    def test_shared_ssl_context(self):
+        self.assertIs(get_connector_options()['ssl'], get_connector_options()['ssl'])
+
+
+class SharedConnectorTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+        self.connector = create_connector(loop=self.loop)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.connector.close())
+        set_event_loop(None)
+        self.loop.close()
+
+    def test_shared_connector(self):
+        bot = Bot('xoxb-fake', connector=self.connector, loop=self.loop)
+
+        self.assertIs(bot.service_client.connector, self.connector)
+        self.assertIs(bot.service_client.session.connector, self.connector)
+        self.loop.run_until_complete(bot.close())
+
+    def test_unused_connector_closed(self):
+        built = []
+
+        def build_connector(*args, **kwargs):
+            built.append(TCPConnector(*args, **kwargs))
+            return built[-1]
+
+        with patch('service_client.TCPConnector', build_connector):
+            bot = Bot('xoxb-fake', connector=self.connector, loop=self.loop)
+        self.loop.run_until_complete(sleep(0))
+
+        self.assertEqual(len(built), 1)
+        self.assertIsNot(bot.service_client.connector, built[0])
+        self.assertTrue(built[0].closed)
+        self.loop.run_until_complete(bot.close())
+
+    def test_close_keeps_shared_connector(self):
+        first = Bot('xoxb-1', connector=self.connector, loop=self.loop)
+        second = Bot('xoxb-2', connector=self.connector, loop=self.loop)
+
+        self.loop.run_until_complete(first.close())
+
+        self.assertTrue(first.service_client.session.closed)
+        self.assertFalse(second.service_client.session.closed)
+        self.assertFalse(self.connector.closed)
+        self.loop.run_until_complete(second.close())
@@ -0,0 +1,117 @@
+from asyncio import new_event_loop, set_event_loop
+from unittest import TestCase
+
+from aioslackbot import Bot
+from aioslackbot.dedupe import DedupeWindow, event_key
+from aioslackbot.dispatcher import EventDispatcher
+
+MESSAGE = {'type': 'message', 'channel': 'C1', 'user': 'U1', 'text': 'Hello', 'ts': '1483228800.000100'}
+
+
+class EventKeyTests(TestCase):
+
+    def test_message(self):
+        self.assertEqual(event_key(MESSAGE), ('C1', '1483228800.000100'))
+        self.assertEqual(event_key(dict(MESSAGE, channel='C2')), ('C2', '1483228800.000100'))
+
+    def test_event(self):
+        self.assertEqual(event_key({'type': 'user_typing', 'channel': 'C1', 'event_ts': '1.5'}), ('user_typing', '1.5'))
+
+    def test_no_identity(self):
+        self.assertIsNone(event_key({'type': 'hello'}))
+        self.assertIsNone(event_key({'type': 'pong', 'reply_to': 1}))
+
+
+class DedupeWindowTests(TestCase):
+
+    def test_add(self):
+        window = DedupeWindow(3)
+
+        self.assertFalse(window.add('a'))
+        self.assertTrue(window.add('a'))
+        self.assertIn('a', window)
+        self.assertEqual(len(window), 1)
+
+    def test_oldest_key_forgotten(self):
+        window = DedupeWindow(3)
+        for key in 'abcd':
+            window.add(key)
+
+        self.assertEqual(len(window), 3)
+        self.assertNotIn('a', window)
+        self.assertFalse(window.add('a'))
+        self.assertNotIn('b', window)
+        self.assertIn('d', window)
+
+    def test_duplicate_does_not_refresh_key(self):
+        window = DedupeWindow(2)
+        window.add('a')
+        window.add('b')
+        window.add('a')
+        window.add('c')
+
+        self.assertNotIn('a', window)
+        self.assertIn('b', window)
+
+    def test_is_duplicate(self):
+        window = DedupeWindow()
+
+        self.assertFalse(window.is_duplicate(MESSAGE))
+        self.assertTrue(window.is_duplicate(dict(MESSAGE)))
+        self.assertFalse(window.is_duplicate(dict(MESSAGE, channel='C2')))
+        self.assertFalse(window.is_duplicate({'type': 'hello'}))
+        self.assertFalse(window.is_duplicate({'type': 'hello'}))
+
+    def test_clear(self):
+        window = DedupeWindow(2)
+        window.add('a')
+        window.clear()
+
+        self.assertEqual(len(window), 0)
+        self.assertFalse(window.add('a'))
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            DedupeWindow(0)
+
+
+class DispatcherDedupeTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+
+    def tearDown(self):
+        set_event_loop(None)
+        self.loop.close()
+
+    def dispatch_twice(self, dispatcher):
+        received = []
+
+        @dispatcher.on('message', raw=True)
+        async def on_message(data):
+            received.append(data['ts'])
+
+        results = [self.loop.run_until_complete(dispatcher.dispatch(dict(MESSAGE))) for _ in range(2)]
+        return results, received
+
+    def test_duplicate_dropped(self):
+        results, received = self.dispatch_twice(EventDispatcher(dedupe=DedupeWindow()))
+
+        self.assertEqual(results, [True, False])
+        self.assertEqual(received, ['1483228800.000100'])
+
+    def test_no_dedupe(self):
+        results, received = self.dispatch_twice(EventDispatcher())
+
+        self.assertEqual(results, [True, True])
+        self.assertEqual(len(received), 2)
+
+    def test_bot_window(self):
+        bot = Bot('xoxb-fake', dedupe_window=5, loop=self.loop)
+        self.assertEqual(bot.dispatcher.dedupe.size, 5)
+        self.loop.run_until_complete(bot.close())
+
+        bot = Bot('xoxb-fake', dedupe_window=0, loop=self.loop)
+        self.assertIsNone(bot.dispatcher.dedupe)
+        self.loop.run_until_complete(bot.close())
@@ -0,0 +1,129 @@
+from asyncio import new_event_loop, set_event_loop
+from unittest import TestCase
+from unittest.mock import patch
+
+from aioslackbot.dispatcher import EventDispatcher
+from aioslackbot.lazy import LazyModel
+from aioslackbot.models import Event, EventTypeEnum, Message, MessageSubtypeEnum
+
+MESSAGE = {'type': 'message', 'channel': 'C1', 'user': 'U1', 'text': 'Hello', 'ts': '1483228800.000100'}
+
+JOIN = dict(MESSAGE, subtype='channel_join', ts='1483228800.000200')
+
+
+class EventDispatcherTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+        self.dispatcher = EventDispatcher()
+        self.received = []
+
+    def tearDown(self):
+        set_event_loop(None)
+        self.loop.close()
+
+    def handler(self, name):
+        async def handle(event):
+            self.received.append((name, event))
+
+        return handle
+
+    def dispatch(self, data):
+        return self.loop.run_until_complete(self.dispatcher.dispatch(data))
+
+    def test_generic_handler(self):
+        self.dispatcher.add_handler(self.handler('message'), EventTypeEnum.MESSAGE)
+
+        self.assertTrue(self.dispatch(MESSAGE))
+        self.assertTrue(self.dispatch(JOIN))
+
+        self.assertEqual([name for name, _ in self.received], ['message', 'message'])
+        self.assertIsInstance(self.received[0][1], Message)
+        self.assertEqual(self.received[1][1].subtype, MessageSubtypeEnum.CHANNEL_JOIN)
+
+    def test_subtype_handler(self):
+        self.dispatcher.add_handler(self.handler('join'), EventTypeEnum.MESSAGE,
+                                    subtype=MessageSubtypeEnum.CHANNEL_JOIN)
+
+        self.assertFalse(self.dispatch(MESSAGE))
+        self.assertTrue(self.dispatch(JOIN))
+
+        self.assertEqual([name for name, _ in self.received], ['join'])
+
+    def test_generic_handlers_run_before_subtype_ones(self):
+        self.dispatcher.add_handler(self.handler('join'), 'message', subtype='channel_join')
+        self.dispatcher.add_handler(self.handler('first'), 'message')
+        self.dispatcher.add_handler(self.handler('second'), 'message')
+
+        self.dispatch(JOIN)
+        self.dispatch(MESSAGE)
+
+        self.assertEqual([name for name, _ in self.received], ['first', 'second', 'join', 'first', 'second'])
+        # Handlers share one model of each frame
+        self.assertIs(self.received[0][1], self.received[2][1])
+
+    def test_raw_handler(self):
+        self.dispatcher.add_handler(self.handler('raw'), 'message', raw=True)
+        self.dispatcher.add_handler(self.handler('model'), 'message')
+
+        self.dispatch(MESSAGE)
+
+        self.assertIs(self.received[0][1], MESSAGE)
+        self.assertIsInstance(self.received[1][1], Message)
+
+    def test_other_events(self):
+        @self.dispatcher.on(EventTypeEnum.USER_TYPING)
+        async def on_typing(event):
+            self.received.append(('typing', event))
+
+        self.dispatch({'type': 'user_typing', 'channel': 'C1', 'user': 'U1'})
+
+        self.assertIsInstance(self.received[0][1], Event)
+        self.assertEqual(self.received[0][1].user, 'U1')
+
+    def test_lazy(self):
+        self.dispatcher.lazy = True
+        self.dispatcher.add_handler(self.handler('message'), 'message')
+
+        self.dispatch(MESSAGE)
+
+        self.assertIsInstance(self.received[0][1], LazyModel)
+        self.assertEqual(self.received[0][1].text, 'Hello')
+
+    def test_models_only_built_for_subscribers(self):
+        self.dispatcher.add_handler(self.handler('raw'), 'message', raw=True)
+
+        with patch('aioslackbot.dispatcher.decode_event') as decode_event:
+            self.assertFalse(self.dispatch({'type': 'user_typing', 'channel': 'C1'}))
+            self.assertTrue(self.dispatch(MESSAGE))
+
+        decode_event.assert_not_called()
+
+    def test_handler_error_does_not_stop_others(self):
+        async def fail(event):
+            raise ValueError('boom')
+
+        self.dispatcher.add_handler(fail, 'message')
+        self.dispatcher.add_handler(self.handler('message'), 'message')
+
+        with self.assertLogs(self.dispatcher.logger, 'ERROR'):
+            self.assertTrue(self.dispatch(MESSAGE))
+        self.assertEqual(len(self.received), 1)
+
+    def test_remove_handler(self):
+        handler = self.handler('message')
+        self.dispatcher.add_handler(handler, 'message')
+        self.dispatcher.add_handler(self.handler('join'), 'message', subtype='channel_join')
+
+        self.dispatcher.remove_handler(handler, EventTypeEnum.MESSAGE)
+        self.dispatch(JOIN)
+
+        self.assertEqual([name for name, _ in self.received], ['join'])
+        self.assertEqual(self.dispatcher.get_handlers('message'), ())
+
+    def test_remove_unknown_handler(self):
+        self.dispatcher.remove_handler(self.handler('message'), 'message')
+        self.dispatcher.remove_handler(self.handler('message'), 'message', subtype='channel_join')
+
+        self.assertEqual(self.dispatcher.get_handlers('message'), ())
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+from json import loads
+from unittest import TestCase
+
+from aioslackbot.codec import JsonCodec
+from aioslackbot.fields import SlackTs
+from aioslackbot.models import Attachment, Channel, ChannelsHistoryRequest, Edited, User
+
+
+class SlackTsTests(TestCase):
+
+    def test_keeps_original_string(self):
+        ts = SlackTs('1483228800.000100')
+
+        self.assertEqual(ts, '1483228800.000100')
+        self.assertEqual(ts.timestamp, 1483228800.0001)
+
+    def test_from_timestamp(self):
+        self.assertEqual(SlackTs.from_timestamp(1483228800), '1483228800.000000')
+        self.assertEqual(SlackTs.from_timestamp(1483228800.5), '1483228800.500000')
+
+    def test_from_datetime(self):
+        aware = datetime(2017, 1, 1, 1, tzinfo=timezone(timedelta(hours=1)))
+
+        self.assertEqual(SlackTs.from_datetime(aware), '1483228800.000000')
+        self.assertEqual(SlackTs.from_datetime(datetime(2017, 1, 1)), '1483228800.000000')
+
+    def test_datetime(self):
+        self.assertEqual(SlackTs('1483228800.500000').datetime,
+                         datetime(2017, 1, 1, 0, 0, 0, 500000, tzinfo=timezone.utc))
+
+    def test_sorts_chronologically(self):
+        values = ['1483228800.000200', '1483228799.999999', '1483228800.000010']
+
+        self.assertEqual(sorted(SlackTs(v) for v in values),
+                         ['1483228799.999999', '1483228800.000010', '1483228800.000200'])
+
+
+class SlackTsFieldTests(TestCase):
+
+    def test_cast(self):
+        for value in ('1483228800.000000', 1483228800, 1483228800.0, datetime(2017, 1, 1)):
+            with self.subTest(value=value):
+                edited = Edited(data={'ts': value})
+
+                self.assertIsInstance(edited.ts, SlackTs)
+                self.assertEqual(edited.ts, '1483228800.000000')
+
+    def test_no_bool(self):
+        self.assertIsNone(Edited(data={'ts': True}).ts)
+
+    def test_default(self):
+        request = ChannelsHistoryRequest(channel='C1')
+
+        self.assertIsInstance(request.oldest, SlackTs)
+        self.assertEqual(request.oldest, '0')
+
+    def test_export(self):
+        edited = Edited(data={'user': 'U1', 'ts': '1483228800.000100'})
+
+        self.assertEqual(edited.export_data(), {'user': 'U1', 'ts': '1483228800.000100'})
+        self.assertEqual(JsonCodec().loads(JsonCodec().dumps(edited.export_data())),
+                         {'user': 'U1', 'ts': '1483228800.000100'})
+
+
+class StringIdFieldTests(TestCase):
+
+    def test_interned(self):
+        # Every decoded JSON string is a distinct object
+        user_data, channel_data = loads('[{"id": "U0123ABCD"}, {"id": "C1", "members": ["U0123ABCD"]}]')
+        self.assertIsNot(user_data['id'], channel_data['members'][0])
+
+        user = User(data=user_data)
+        channel = Channel(data=channel_data)
+
+        self.assertIs(user.id, channel.members[0])
+
+    def test_empty_is_unset(self):
+        for model_class, data in ((User, {'id': 'U1', 'color': ''}),
+                                  (Attachment, {'id': 'A1', 'color': '', 'image_url': ''})):
+            with self.subTest(model_class=model_class):
+                exported = model_class(data=data).export_data()
+
+                self.assertEqual(exported['id'], data['id'])
+                self.assertFalse({'color', 'image_url'} & set(exported))
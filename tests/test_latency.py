@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from aioslackbot.latency import LatencyWindow
+
+
+class LatencyWindowTests(TestCase):
+
+    def test_empty(self):
+        window = LatencyWindow()
+
+        self.assertEqual(len(window), 0)
+        self.assertIsNone(window.last)
+        self.assertIsNone(window.mean)
+        self.assertIsNone(window.percentile(50))
+        self.assertEqual(window.export_data(), {'count': 0, 'total': 0, 'last': None, 'mean': None,
+                                                'p50': None, 'p90': None, 'p99': None})
+
+    def test_samples(self):
+        window = LatencyWindow()
+        for sample in (0.3, 0.1, 0.2, 0.4):
+            window.add(sample)
+
+        self.assertEqual(window.last, 0.4)
+        self.assertAlmostEqual(window.mean, 0.25)
+        self.assertEqual(window.percentile(0), 0.1)
+        self.assertEqual(window.percentile(50), 0.2)
+        self.assertEqual(window.percentile(100), 0.4)
+
+    def test_oldest_dropped(self):
+        window = LatencyWindow(size=3)
+        for sample in (1, 2, 3, 4):
+            window.add(sample)
+
+        self.assertEqual(list(window.samples), [2, 3, 4])
+        self.assertEqual(window.export_data()['count'], 3)
+        self.assertEqual(window.export_data()['total'], 4)
+
+    def test_histogram(self):
+        window = LatencyWindow(buckets=(0.1, 1))
+        for sample in (0.05, 0.1, 0.5, 2):
+            window.add(sample)
+
+        self.assertEqual(window.histogram(), [(0.1, 2), (1, 1), (float('inf'), 1)])
@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+from aioslackbot.fields import SlackTs
+from aioslackbot.lazy import LazyModel
+from aioslackbot.models import Attachment, Icons, Message, MessageSubtypeEnum
+
+MESSAGE = {'type': 'message', 'subtype': 'bot_message', 'channel': 'C1', 'bot_id': 'B1', 'text': 'Hello',
+           'ts': '1483228800.000100', 'icons': {'image_36': 'https://.../36.png'},
+           'attachments': [{'text': 'first', 'color': 'good'}, {'text': 'second'}],
+           'pinned_to': ['C1', 'C2'], 'custom': {'a': 1}}
+
+
+class LazyModelTests(TestCase):
+
+    def setUp(self):
+        self.message = LazyModel(Message, MESSAGE)
+
+    def test_only_read_fields_decoded(self):
+        self.assertEqual(self.message.channel, 'C1')
+
+        self.assertEqual(self.message._cache, {'channel': 'C1'})
+
+        self.assertEqual(self.message.subtype, MessageSubtypeEnum.BOT_MESSAGE)
+        self.assertIsInstance(self.message.ts, SlackTs)
+        self.assertEqual(set(self.message._cache), {'channel', 'subtype', 'ts'})
+
+    def test_values_cached(self):
+        self.assertIs(self.message.attachments, self.message.attachments)
+
+    def test_nested_model(self):
+        self.assertIsInstance(self.message.icons, Icons)
+        self.assertEqual(self.message.icons.image_36, 'https://.../36.png')
+
+    def test_nested_array(self):
+        attachments = self.message.attachments
+
+        self.assertEqual(len(attachments), 2)
+        self.assertIsInstance(attachments[0], Attachment)
+        self.assertEqual([a.text for a in attachments], ['first', 'second'])
+        self.assertEqual(list(self.message.pinned_to), ['C1', 'C2'])
+
+    def test_missing_fields(self):
+        self.assertIsNone(self.message.user)
+        self.assertFalse(self.message.hidden)
+
+    def test_unknown_fields_raw(self):
+        self.assertIs(self.message.custom, MESSAGE['custom'])
+        self.assertIsNone(self.message.unknown)
+        self.assertIn('custom', self.message)
+
+    def test_read_only(self):
+        with self.assertRaises(AttributeError):
+            self.message.text = 'Bye'
+        with self.assertRaises(AttributeError):
+            self.message.unknown = 1
+
+    def test_materialize(self):
+        model = self.message.materialize()
+
+        self.assertIsInstance(model, Message)
+        self.assertEqual(model.export_data(), Message(data=MESSAGE).export_data())
+        self.assertEqual(self.message.export_data(), Message(data=MESSAGE).export_data())
+        self.assertIs(self.message.raw_data, MESSAGE)
+        self.assertIs(self.message.model_class, Message)
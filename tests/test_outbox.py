@@ -0,0 +1,172 @@
+from asyncio import CancelledError, gather, new_event_loop, set_event_loop, sleep
+from unittest import TestCase
+
+from aioslackbot import Bot
+from aioslackbot.models import Attachment, ChatPostMessageRequest
+from aioslackbot.outbox import Outbox
+from aioslackbot.testing import FakeSlackServer
+
+LATENCY = 0.05
+
+
+class OutboxTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+        self.posted = []
+        self.server = FakeSlackServer(responses={'chat__post_message': self.post_message},
+                                      latency={'chat__post_message': LATENCY})
+        self.loop.run_until_complete(self.server.start())
+        self.bot = Bot('xoxb-fake', base_path=self.server.base_path, rate_limit=False, loop=self.loop)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.bot.close())
+        self.loop.run_until_complete(self.server.stop())
+        set_event_loop(None)
+        self.loop.close()
+
+    def post_message(self, data):
+        if 'boom' in data.get('text', ''):
+            raise ValueError('Server error')
+        self.posted.append(data)
+        return {'ok': True, 'channel': data['channel'], 'ts': '1.{:06d}'.format(len(self.posted)),
+                'message': {'text': data.get('text')}}
+
+    def texts(self, channel):
+        return [data['text'] for data in self.posted if data['channel'] == channel]
+
+    def test_order_by_channel(self):
+        outbox = Outbox(self.bot.chat, concurrency=10)
+        futures = [outbox.post(channel='C{}'.format(i % 2), text=str(i)) for i in range(6)]
+
+        responses = self.loop.run_until_complete(gather(*futures))
+
+        self.assertEqual(self.texts('C0'), ['0', '2', '4'])
+        self.assertEqual(self.texts('C1'), ['1', '3', '5'])
+        self.assertTrue(all(response.ok for response in responses))
+        self.assertEqual(outbox.pending, 0)
+
+    def test_channels_in_parallel(self):
+        outbox = Outbox(self.bot.chat, concurrency=4)
+        start = self.loop.time()
+
+        self.loop.run_until_complete(gather(*[outbox.post(channel='C{}'.format(i), text='Hello')
+                                              for i in range(4)]))
+
+        self.assertLess(self.loop.time() - start, LATENCY * 3)
+        self.assertEqual(len(self.posted), 4)
+
+    def test_concurrency_limit(self):
+        outbox = Outbox(self.bot.chat, concurrency=1)
+        start = self.loop.time()
+
+        self.loop.run_until_complete(gather(*[outbox.post(channel='C{}'.format(i), text='Hello')
+                                              for i in range(3)]))
+
+        self.assertGreaterEqual(self.loop.time() - start, LATENCY * 3)
+        self.assertEqual(self.server.calls['chat__post_message'], 3)
+
+    def test_merge(self):
+        outbox = Outbox(self.bot.chat, merge=True)
+        futures = [outbox.post(channel='C1', text=str(i)) for i in range(3)]
+        futures.append(outbox.post(channel='C2', text='other'))
+
+        responses = self.loop.run_until_complete(gather(*futures))
+
+        self.assertEqual(self.texts('C1'), ['0\n1\n2'])
+        self.assertEqual(self.texts('C2'), ['other'])
+        self.assertIs(responses[0], responses[1])
+        self.assertIs(responses[0], responses[2])
+        self.assertIsNot(responses[0], responses[3])
+
+    def test_merge_keeps_posted_request(self):
+        outbox = Outbox(self.bot.chat, merge=True)
+        request = ChatPostMessageRequest(channel='C1', text='first')
+        futures = [outbox.post(request), outbox.post(channel='C1', text='second')]
+
+        self.loop.run_until_complete(gather(*futures))
+
+        self.assertEqual(request.text, 'first')
+        self.assertEqual(self.texts('C1'), ['first\nsecond'])
+
+    def test_no_merge_by_default(self):
+        outbox = Outbox(self.bot.chat)
+
+        self.loop.run_until_complete(gather(*[outbox.post(channel='C1', text=str(i)) for i in range(3)]))
+
+        self.assertEqual(self.texts('C1'), ['0', '1', '2'])
+
+    def test_no_merge_with_attachments(self):
+        outbox = Outbox(self.bot.chat, merge=True)
+        attachment = ChatPostMessageRequest(channel='C1', text='b', attachments=[Attachment(text='file')])
+
+        self.loop.run_until_complete(gather(outbox.post(channel='C1', text='a'), outbox.post(attachment),
+                                            outbox.post(channel='C1', text='c')))
+
+        self.assertEqual(self.texts('C1'), ['a', 'b', 'c'])
+
+    def test_no_merge_with_other_options(self):
+        outbox = Outbox(self.bot.chat, merge=True)
+
+        self.loop.run_until_complete(gather(outbox.post(channel='C1', text='a'),
+                                            outbox.post(channel='C1', text='b', username='other'),
+                                            outbox.post(channel='C1', text='c', username='other')))
+
+        self.assertEqual(self.texts('C1'), ['a', 'b\nc'])
+
+    def test_max_merge_length(self):
+        outbox = Outbox(self.bot.chat, merge=True, max_merge_length=10)
+
+        self.loop.run_until_complete(gather(*[outbox.post(channel='C1', text=text)
+                                              for text in ('1234', '5678', '9')]))
+
+        self.assertEqual(self.texts('C1'), ['1234\n5678', '9'])
+
+    def test_error_reaches_every_merged_future(self):
+        outbox = Outbox(self.bot.chat, merge=True)
+        futures = [outbox.post(channel='C1', text='boom'), outbox.post(channel='C1', text='more')]
+
+        results = self.loop.run_until_complete(gather(*futures, return_exceptions=True))
+
+        self.assertIsInstance(results[0], Exception)
+        self.assertIs(results[0], results[1])
+
+    def test_error_does_not_stop_channel(self):
+        outbox = Outbox(self.bot.chat)
+        futures = [outbox.post(channel='C1', text='boom'), outbox.post(channel='C1', text='after')]
+
+        results = self.loop.run_until_complete(gather(*futures, return_exceptions=True))
+
+        self.assertIsInstance(results[0], Exception)
+        self.assertTrue(results[1].ok)
+        self.assertEqual(self.texts('C1'), ['after'])
+
+    def test_close_cancels_pending(self):
+        outbox = Outbox(self.bot.chat, concurrency=1)
+        futures = [outbox.post(channel='C{}'.format(i % 2), text=str(i)) for i in range(4)]
+
+        async def close():
+            await sleep(LATENCY / 2)
+            await outbox.close()
+
+        self.loop.run_until_complete(close())
+
+        self.assertTrue(all(future.cancelled() for future in futures))
+        self.assertEqual(outbox.pending, 0)
+        self.assertEqual(outbox._workers, {})
+        with self.assertRaises(CancelledError):
+            self.loop.run_until_complete(futures[0])
+
+    def test_post_after_flush(self):
+        outbox = Outbox(self.bot.chat)
+        outbox.post(channel='C1', text='first')
+        self.loop.run_until_complete(outbox.flush())
+
+        self.assertEqual(outbox._workers, {})
+
+        future = outbox.post(channel='C1', text='second')
+        self.loop.run_until_complete(outbox.flush())
+
+        self.assertTrue(future.result().ok)
+        self.assertEqual(self.texts('C1'), ['first', 'second'])
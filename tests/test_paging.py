@@ -0,0 +1,110 @@
+from asyncio import new_event_loop, set_event_loop, sleep
+from unittest import TestCase
+
+from aioslackbot.models import ChannelsHistoryRequest, ChannelsHistoryResponse, FilesListRequest, \
+    FilesListResponse, UsersListRequest, UsersListResponse
+from aioslackbot.paging import PageError, iter_items, iter_pages, next_cursor_request, next_history_request, \
+    next_paging_request
+
+
+class FakeMethod:
+
+    def __init__(self, response_class, pages):
+        self.response_class = response_class
+        self.pages = list(pages)
+        self.requests = []
+
+    async def __call__(self, request):
+        self.requests.append(request.export_data())
+        return self.response_class(data=self.pages.pop(0))
+
+
+class PagingTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+
+    def tearDown(self):
+        set_event_loop(None)
+        self.loop.close()
+
+    def collect(self, iterator):
+        async def collect():
+            return [item async for item in iterator]
+
+        return self.loop.run_until_complete(collect())
+
+    def test_history(self):
+        method = FakeMethod(ChannelsHistoryResponse,
+                            [{'ok': True, 'has_more': True, 'messages': [{'ts': '3.000000'}, {'ts': '2.000000'}]},
+                             {'ok': True, 'has_more': False, 'messages': [{'ts': '1.000000'}]}])
+
+        messages = self.collect(iter_items(method, ChannelsHistoryRequest(channel='C1'),
+                                           next_history_request, 'messages'))
+
+        self.assertEqual([m.ts for m in messages], ['3.000000', '2.000000', '1.000000'])
+        self.assertEqual(len(method.requests), 2)
+        self.assertEqual(method.requests[1]['latest'], '2.000000')
+        self.assertEqual(method.requests[1]['inclusive'], False)
+        self.assertEqual(method.requests[1]['channel'], 'C1')
+
+    def test_paging(self):
+        method = FakeMethod(FilesListResponse,
+                            [{'ok': True, 'files': [{'id': 'F1'}], 'paging': {'page': 1, 'pages': 2}},
+                             {'ok': True, 'files': [{'id': 'F2'}], 'paging': {'page': 2, 'pages': 2}}])
+
+        files = self.collect(iter_items(method, FilesListRequest(), next_paging_request, 'files'))
+
+        self.assertEqual([f.id for f in files], ['F1', 'F2'])
+        self.assertEqual(method.requests[1]['page'], 2)
+
+    def test_cursor(self):
+        method = FakeMethod(UsersListResponse,
+                            [{'ok': True, 'members': [{'id': 'U1'}], 'response_metadata': {'next_cursor': 'abc'}},
+                             {'ok': True, 'members': [{'id': 'U2'}], 'response_metadata': {'next_cursor': ''}}])
+
+        users = self.collect(iter_items(method, UsersListRequest(limit=1), next_cursor_request, 'members'))
+
+        self.assertEqual([u.id for u in users], ['U1', 'U2'])
+        self.assertEqual(method.requests[1]['cursor'], 'abc')
+        self.assertEqual(method.requests[1]['limit'], 1)
+
+    def test_empty_page(self):
+        method = FakeMethod(UsersListResponse, [{'ok': True}])
+
+        self.assertEqual(self.collect(iter_items(method, UsersListRequest(), next_cursor_request, 'members')), [])
+
+    def test_next_page_is_prefetched(self):
+        method = FakeMethod(UsersListResponse,
+                            [{'ok': True, 'members': [{'id': 'U1'}], 'response_metadata': {'next_cursor': 'abc'}},
+                             {'ok': True, 'members': [{'id': 'U2'}]}])
+
+        async def first_page():
+            pages = iter_pages(method, UsersListRequest(), next_cursor_request)
+            response = await pages.__anext__()
+            await sleep(0)
+            await pages.aclose()
+            return response
+
+        response = self.loop.run_until_complete(first_page())
+
+        self.assertEqual(response.members[0].id, 'U1')
+        self.assertEqual(len(method.requests), 2)
+
+    def test_failed_page(self):
+        method = FakeMethod(UsersListResponse,
+                            [{'ok': True, 'members': [{'id': 'U1'}], 'response_metadata': {'next_cursor': 'abc'}},
+                             {'ok': False, 'error': 'ratelimited'}])
+        users = []
+
+        async def collect():
+            async for user in iter_items(method, UsersListRequest(), next_cursor_request, 'members'):
+                users.append(user)
+
+        with self.assertRaises(PageError) as ctx:
+            self.loop.run_until_complete(collect())
+
+        self.assertEqual(ctx.exception.error, 'ratelimited')
+        self.assertFalse(ctx.exception.response.ok)
+        self.assertEqual([u.id for u in users], ['U1'])
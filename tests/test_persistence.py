@@ -0,0 +1,106 @@
+import os
+import sqlite3
+from asyncio import new_event_loop, set_event_loop
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from dirty_models.models import FastDynamicModel
+
+from aioslackbot.models import Channel, Group, Im, Mpim, User
+from aioslackbot.persistence import StateStore
+from aioslackbot.snapshot import Snapshot
+from aioslackbot.state import WorkspaceState
+
+USER = {'id': 'U1', 'name': 'john', 'deleted': False, 'is_admin': True, 'updated': 1502138686,
+        'two_factor_type': 'app'}
+
+
+def build_state(compact_users=False):
+    state = WorkspaceState(compact_users=compact_users)
+    state.set_user(User(data=USER))
+    state.set_user(User(data={'id': 'U2', 'name': 'jane'}))
+    state.set_channel(Channel(data={'id': 'C1', 'name': 'general', 'created': 1360782804,
+                                    'members': ['U1', 'U2'], 'is_general': True}))
+    state.set_group(Group(data={'id': 'G1', 'name': 'secret', 'members': ['U1']}))
+    state.set_im(Im(data={'id': 'D1', 'user': 'U2'}))
+    state.set_mpim(Mpim(data={'id': 'G2', 'name': 'mpdm-john--jane-1', 'members': ['U1', 'U2']}))
+    state.set_bot(FastDynamicModel(data={'id': 'B1', 'name': 'bot', 'icons': {'image_36': 'https://.../36.png'}}))
+    return state
+
+
+def export_state(state):
+    return {kind: {entity_id: entity.export_data() for entity_id, entity in getattr(state, kind).items()}
+            for kind in ('users', 'channels', 'groups', 'ims', 'mpims', 'bots')}
+
+
+class StateStoreTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'workspace.db')
+        self.store = StateStore(self.path, loop=self.loop)
+
+    def tearDown(self):
+        self.directory.cleanup()
+        set_event_loop(None)
+        self.loop.close()
+
+    def test_round_trip(self):
+        state = build_state()
+
+        self.assertEqual(self.loop.run_until_complete(self.store.save(state)), 7)
+
+        loaded = WorkspaceState()
+        self.assertEqual(self.loop.run_until_complete(StateStore(self.path, loop=self.loop).load(loaded)), 7)
+        self.assertEqual(export_state(loaded), export_state(state))
+        self.assertIs(loaded.get_user_by_name('john'), loaded.get_user('U1'))
+        self.assertEqual(loaded.get_channel_by_name('general').created, state.get_channel('C1').created)
+        self.assertEqual(loaded.get_bot('B1').icons.image_36, 'https://.../36.png')
+
+    def test_compact_users(self):
+        state = build_state(compact_users=True)
+        self.loop.run_until_complete(self.store.save(state))
+
+        loaded = WorkspaceState(compact_users=True)
+        self.loop.run_until_complete(self.store.load(loaded))
+
+        self.assertIsInstance(loaded.get_user('U1'), Snapshot)
+        self.assertEqual(export_state(loaded), export_state(state))
+
+    def test_save_replaces_snapshot(self):
+        state = build_state()
+        self.loop.run_until_complete(self.store.save(state))
+        state.remove_channel('C1')
+        self.loop.run_until_complete(self.store.save(state))
+
+        loaded = WorkspaceState()
+        self.assertEqual(self.loop.run_until_complete(self.store.load(loaded)), 6)
+        self.assertIsNone(loaded.get_channel('C1'))
+
+    def test_load_replaces_state(self):
+        self.loop.run_until_complete(self.store.save(build_state()))
+        state = WorkspaceState()
+        state.set_user(User(data={'id': 'U3', 'name': 'old'}))
+
+        self.loop.run_until_complete(self.store.load(state))
+
+        self.assertIsNone(state.get_user('U3'))
+        self.assertIsNone(state.get_user_by_name('old'))
+        self.assertIsNotNone(self.store.saved_at)
+
+    def test_no_snapshot(self):
+        state = build_state()
+
+        self.assertEqual(self.loop.run_until_complete(self.store.load(state)), 0)
+        self.assertEqual(len(state.users), 2)
+
+    def test_other_schema_version_ignored(self):
+        self.loop.run_until_complete(self.store.save(build_state()))
+        connection = sqlite3.connect(self.path)
+        with connection:
+            connection.execute("UPDATE meta SET value = 0 WHERE key = 'version'")
+        connection.close()
+
+        self.assertEqual(self.loop.run_until_complete(self.store.load(WorkspaceState())), 0)
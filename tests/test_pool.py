@@ -0,0 +1,79 @@
+from asyncio import new_event_loop, set_event_loop, sleep
+from unittest import TestCase
+
+from aioslackbot.cache import LRUCache
+from aioslackbot.pool import BotPool
+
+
+class BotPoolTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+        self.pool = BotPool(rate_limit=False, loop=self.loop)
+        self.pool.add('T1', 'xoxb-1')
+        self.pool.add('T2', 'xoxb-2')
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.pool.close())
+        set_event_loop(None)
+        self.loop.close()
+
+    def test_bots_built_on_first_use(self):
+        self.assertEqual(len(self.pool), 2)
+        self.assertEqual(self.pool.active_bots, {})
+
+        bot = self.pool['T1']
+
+        self.assertIs(self.pool['T1'], bot)
+        self.assertEqual(list(self.pool.active_bots), ['T1'])
+        self.assertEqual(bot.token, 'xoxb-1')
+
+    def test_unknown_workspace(self):
+        with self.assertRaises(KeyError):
+            self.pool.get('T3')
+
+    def test_shared_resources(self):
+        first = self.pool['T1']
+        second = self.pool['T2']
+
+        self.assertIs(first.service_client.connector, self.pool.connector)
+        self.assertIs(second.service_client.connector, self.pool.connector)
+        self.assertIs(first.call_table, self.pool.call_table)
+        self.assertIs(second.call_table, self.pool.call_table)
+        self.assertIn('auth', first.call_table)
+
+    def test_shared_cache_keys_by_workspace(self):
+        pool = BotPool(cache=LRUCache(), rate_limit=False, connector=self.pool.connector, loop=self.loop)
+        pool.add('T1', 'xoxb-1')
+        pool.add('T2', 'xoxb-2')
+
+        self.assertIs(pool['T1'].cache, pool['T2'].cache)
+        self.assertNotEqual(pool['T1'].cache_namespace, pool['T2'].cache_namespace)
+        self.loop.run_until_complete(pool.close())
+
+    def test_replace_token(self):
+        bot = self.pool['T1']
+        self.pool.add('T1', 'xoxb-3')
+        self.loop.run_until_complete(sleep(0))
+
+        self.assertTrue(bot.service_client.session.closed)
+        self.assertEqual(self.pool['T1'].token, 'xoxb-3')
+
+    def test_remove(self):
+        self.pool['T1']
+        self.pool.remove('T1')
+
+        self.assertNotIn('T1', self.pool)
+        self.assertEqual(self.pool.active_bots, {})
+
+    def test_handlers_receive_workspace(self):
+        received = []
+
+        @self.pool.on('hello', raw=True)
+        async def on_hello(team_id, data):
+            received.append((team_id, data['type']))
+
+        self.loop.run_until_complete(self.pool['T2'].dispatcher.dispatch({'type': 'hello'}))
+
+        self.assertEqual(received, [('T2', 'hello')])
@@ -0,0 +1,230 @@
+from asyncio import gather, new_event_loop, set_event_loop, sleep
+from unittest import TestCase
+
+from aioslackbot import Bot
+from aioslackbot.ratelimit import DEFAULT_RETRY_AFTER, TierRateLimit, TokenBucket, get_retry_after
+from aioslackbot.testing import FakeSlackServer
+
+
+class TokenBucketTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+
+    def tearDown(self):
+        set_event_loop(None)
+        self.loop.close()
+
+    def test_acquire_within_capacity(self):
+        bucket = TokenBucket(3, 60, loop=self.loop)
+        start = self.loop.time()
+
+        self.loop.run_until_complete(gather(*[bucket.acquire() for _ in range(3)]))
+
+        self.assertLess(self.loop.time() - start, 0.05)
+        self.assertLess(bucket.tokens, 1)
+        self.assertEqual(bucket.pending, 0)
+
+    def test_acquire_waits_for_refill(self):
+        bucket = TokenBucket(2, 0.1, loop=self.loop)
+        start = self.loop.time()
+
+        self.loop.run_until_complete(gather(*[bucket.acquire() for _ in range(4)]))
+
+        self.assertGreaterEqual(self.loop.time() - start, 0.09)
+
+    def test_acquire_in_arrival_order(self):
+        bucket = TokenBucket(1, 0.02, loop=self.loop)
+        order = []
+
+        async def call(index):
+            await bucket.acquire()
+            order.append(index)
+
+        self.loop.run_until_complete(gather(*[call(i) for i in range(5)]))
+
+        self.assertEqual(order, list(range(5)))
+
+    def test_pending(self):
+        bucket = TokenBucket(1, 0.05, loop=self.loop)
+
+        async def check():
+            tasks = [self.loop.create_task(bucket.acquire()) for _ in range(3)]
+            await tasks[0]
+            self.assertEqual(bucket.pending, 2)
+            await gather(*tasks)
+            self.assertEqual(bucket.pending, 0)
+
+        self.loop.run_until_complete(check())
+
+    def test_block(self):
+        bucket = TokenBucket(10, 1, loop=self.loop)
+        bucket.block(0.1)
+        start = self.loop.time()
+
+        self.loop.run_until_complete(bucket.acquire())
+
+        self.assertGreaterEqual(self.loop.time() - start, 0.09)
+
+    def test_block_delays_waiting_calls(self):
+        bucket = TokenBucket(1, 0.05, loop=self.loop)
+        start = self.loop.time()
+
+        async def check():
+            await bucket.acquire()
+            waiting = self.loop.create_task(bucket.acquire())
+            await sleep(0)
+            bucket.block(0.1)
+            await waiting
+
+        self.loop.run_until_complete(check())
+
+        self.assertGreaterEqual(self.loop.time() - start, 0.14)
+
+    def test_burst(self):
+        bucket = TokenBucket(1, 60, burst=3, loop=self.loop)
+        start = self.loop.time()
+
+        self.loop.run_until_complete(gather(*[bucket.acquire() for _ in range(3)]))
+
+        self.assertLess(self.loop.time() - start, 0.05)
+        self.assertEqual(bucket.capacity, 3)
+
+    def test_cancelled_call_returns_token(self):
+        bucket = TokenBucket(1, 0.1, loop=self.loop)
+
+        async def check():
+            await bucket.acquire()
+            waiting = self.loop.create_task(bucket.acquire())
+            await sleep(0)
+            waiting.cancel()
+            await gather(waiting, return_exceptions=True)
+            start = self.loop.time()
+            await bucket.acquire()
+            return self.loop.time() - start
+
+        self.assertLess(self.loop.run_until_complete(check()), 0.15)
+        self.assertEqual(bucket.pending, 0)
+
+
+class FakeServiceClient:
+
+    def __init__(self, loop):
+        self.loop = loop
+
+
+class TierRateLimitTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        self.service_client = FakeServiceClient(self.loop)
+        self.plugin = TierRateLimit(tiers={1: (1, 60), 2: (20, 60)}, default_tier=2)
+        self.plugin.assign_service_client(self.service_client)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_bucket_by_tier(self):
+        bucket = self.plugin.get_bucket({'endpoint': 'rtm__connect', 'tier': 1})
+
+        self.assertEqual(bucket.capacity, 1)
+        self.assertEqual(bucket.fill_rate, 1 / 60)
+
+    def test_bucket_burst(self):
+        self.plugin.tiers[1] = (1, 60, 5)
+        bucket = self.plugin.get_bucket({'endpoint': 'rtm__connect', 'tier': 1})
+
+        self.assertEqual(bucket.capacity, 5)
+        self.assertEqual(bucket.fill_rate, 1 / 60)
+        self.assertIs(bucket.loop, self.loop)
+
+    def test_bucket_default_tier(self):
+        bucket = self.plugin.get_bucket({'endpoint': 'users__info'})
+
+        self.assertEqual(bucket.capacity, 20)
+
+    def test_bucket_by_endpoint_and_key(self):
+        desc = {'endpoint': 'chat__post_message'}
+
+        self.assertIs(self.plugin.get_bucket(desc, 'C1'), self.plugin.get_bucket(desc, 'C1'))
+        self.assertIsNot(self.plugin.get_bucket(desc, 'C1'), self.plugin.get_bucket(desc, 'C2'))
+        self.assertIsNot(self.plugin.get_bucket(desc), self.plugin.get_bucket({'endpoint': 'users__info'}))
+
+    def test_pending_by_endpoint(self):
+        desc = {'endpoint': 'rtm__connect', 'tier': 1}
+
+        async def check():
+            task = self.loop.create_task(self.plugin.get_bucket(desc).acquire())
+            second = self.loop.create_task(self.plugin.get_bucket(desc).acquire())
+            await task
+            self.assertEqual(self.plugin.get_pending('rtm__connect'), 1)
+            self.assertEqual(self.plugin.get_pending('users__info'), 0)
+            self.assertEqual(self.plugin.pending, 1)
+            second.cancel()
+            await gather(second, return_exceptions=True)
+
+        self.loop.run_until_complete(check())
+
+    def test_prune_idle_buckets(self):
+        desc = {'endpoint': 'chat__post_message', 'tier': 1}
+        idle = self.plugin.get_bucket(desc, 'C1')
+        used = self.plugin.get_bucket(desc, 'C2')
+        blocked = self.plugin.get_bucket(desc, 'C3')
+        self.loop.run_until_complete(used.acquire())
+        blocked.block(60)
+
+        self.plugin.prune(force=True)
+
+        self.assertEqual(set(self.plugin._buckets), {('chat__post_message', 'C2'), ('chat__post_message', 'C3')})
+        self.assertIsNot(self.plugin.get_bucket(desc, 'C1'), idle)
+        self.assertIs(self.plugin.get_bucket(desc, 'C2'), used)
+
+    def test_prune_on_new_bucket(self):
+        desc = {'endpoint': 'chat__post_message', 'tier': 2}
+        for i in range(10):
+            self.plugin.get_bucket(desc, 'C{}'.format(i))
+
+        # Buckets are not swept more often than PRUNE_INTERVAL
+        self.assertEqual(len(self.plugin._buckets), 10)
+        self.plugin._next_prune = 0
+        self.plugin.get_bucket(desc, 'C10')
+
+        self.assertEqual(list(self.plugin._buckets), [('chat__post_message', 'C10')])
+
+
+class FakeResponse:
+
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class RetryTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+        self.server = FakeSlackServer(rate_limit_rate=1, retry_after=0.1)
+        self.loop.run_until_complete(self.server.start())
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.server.stop())
+        set_event_loop(None)
+        self.loop.close()
+
+    def test_get_retry_after(self):
+        self.assertEqual(get_retry_after(FakeResponse({'Retry-After': '2'})), 2)
+        self.assertEqual(get_retry_after(FakeResponse({'Retry-After': 'soon'})), DEFAULT_RETRY_AFTER)
+        self.assertEqual(get_retry_after(FakeResponse({})), DEFAULT_RETRY_AFTER)
+
+    def test_retry_waits_without_rate_limit(self):
+        bot = Bot('xoxb-fake', base_path=self.server.base_path, rate_limit=False, rate_limit_retries=2,
+                  loop=self.loop)
+        start = self.loop.time()
+
+        response = self.loop.run_until_complete(bot.auth.test())
+
+        self.assertFalse(response.ok)
+        self.assertEqual(self.server.calls['auth__test'], 3)
+        self.assertGreaterEqual(self.loop.time() - start, 0.19)
+        self.loop.run_until_complete(bot.close())
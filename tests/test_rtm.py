@@ -0,0 +1,253 @@
+from asyncio import new_event_loop, set_event_loop, sleep, wait_for
+from unittest import TestCase
+from unittest.mock import patch
+
+from aiohttp import ServerDisconnectedError
+
+from aioslackbot import Bot
+from aioslackbot.testing import FakeSlackServer
+
+PAGE_SIZE = 2
+
+
+def message(channel_id, ts):
+    return {'type': 'message', 'channel': channel_id, 'user': 'U1', 'text': ts, 'ts': ts}
+
+
+class FakeHistory:
+    """
+    Serves channel histories from newest to oldest, in pages of :data:`PAGE_SIZE` messages.
+    """
+
+    def __init__(self, histories):
+        self.histories = histories
+
+    def __call__(self, data):
+        messages = [m for m in self.histories[data['channel']]
+                    if data.get('oldest', '0') < m['ts'] < data.get('latest', '9')]
+        messages.sort(key=lambda m: m['ts'], reverse=True)
+        return {'ok': True, 'messages': [{k: v for k, v in m.items() if k != 'channel'}
+                                         for m in messages[:PAGE_SIZE]],
+                'has_more': len(messages) > PAGE_SIZE}
+
+
+class RtmTestCase(TestCase):
+
+    server_options = {}
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+        self.histories = {'C1': [message('C1', '1.00000{}'.format(i)) for i in range(1, 6)],
+                          'D1': [message('D1', '1.00000{}'.format(i)) for i in range(1, 4)]}
+        self.server = FakeSlackServer(responses={'channels__history': FakeHistory(self.histories),
+                                                 'im__history': FakeHistory(self.histories)},
+                                      **self.server_options)
+        self.loop.run_until_complete(self.server.start())
+        self.bot = Bot('xoxb-fake', base_path=self.server.base_path, loop=self.loop)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.bot.close())
+        self.loop.run_until_complete(self.server.stop())
+        set_event_loop(None)
+        self.loop.close()
+
+    def drain(self, session):
+        frames = []
+        while not session.queue.empty():
+            frames.append(session.queue.get_nowait())
+        return frames
+
+
+class BackfillTests(RtmTestCase):
+
+    def test_missed_messages_in_order(self):
+        session = self.bot.rtm.create_session()
+        session.last_seen.update({'C1': '1.000001', 'D1': '1.000002'})
+
+        self.loop.run_until_complete(session.backfill())
+
+        frames = self.drain(session)
+        self.assertEqual([f['ts'] for f in frames if f['channel'] == 'C1'],
+                         ['1.000002', '1.000003', '1.000004', '1.000005'])
+        self.assertEqual([f['ts'] for f in frames if f['channel'] == 'D1'], ['1.000003'])
+        self.assertEqual(session.last_seen, {'C1': '1.000005', 'D1': '1.000003'})
+
+    def test_limit_keeps_newest(self):
+        session = self.bot.rtm.create_session(backfill_limit=3)
+        session.last_seen['C1'] = '0'
+
+        with self.assertLogs(self.bot.logger, 'WARNING') as logs:
+            self.loop.run_until_complete(session.backfill())
+
+        self.assertEqual([f['ts'] for f in self.drain(session)], ['1.000003', '1.000004', '1.000005'])
+        self.assertIn('Only last 3 are recovered', logs.output[0])
+
+    def test_failed_page(self):
+        self.server.responses['channels__history'] = {'ok': False, 'error': 'channel_not_found'}
+        session = self.bot.rtm.create_session()
+        session.last_seen['C1'] = '0'
+
+        with self.assertLogs(self.bot.logger, 'WARNING') as logs:
+            self.loop.run_until_complete(session.backfill())
+
+        self.assertEqual(self.drain(session), [])
+        self.assertIn('channel_not_found', logs.output[0])
+
+    def test_failed_request(self):
+        session = self.bot.rtm.create_session()
+        session.last_seen.update({'C1': '0', 'D1': '1.000002'})
+
+        with patch.object(self.bot.channels, 'stream_history', side_effect=ServerDisconnectedError()), \
+                self.assertLogs(self.bot.logger, 'WARNING') as logs:
+            self.loop.run_until_complete(session.backfill())
+
+        self.assertEqual([(f['channel'], f['ts']) for f in self.drain(session)], [('D1', '1.000003')])
+        self.assertIn('Unable to backfill channel C1', logs.output[0])
+
+    def test_failed_request_keeps_session(self):
+        session = self.bot.rtm.create_session()
+        frames = []
+
+        async def read(count):
+            while len(frames) < count:
+                frames.append(await session.get_raw())
+
+        async def run():
+            task = self.loop.create_task(session.run(reconnect=True, reconnect_delay=0.01))
+            try:
+                await read(1)
+                session.last_seen.update({'C1': '0', 'D1': '1.000002'})
+                # Server drops websocket, so session reconnects and backfills
+                for ws in list(self.server.websockets):
+                    await ws.close()
+                await read(3)
+                self.assertFalse(task.done())
+            finally:
+                await session.close()
+            await wait_for(task, 1)
+
+        with patch.object(self.bot.channels, 'stream_history', side_effect=ServerDisconnectedError()), \
+                self.assertLogs(self.bot.logger, 'WARNING'):
+            self.loop.run_until_complete(wait_for(run(), 5))
+
+        self.assertEqual([f['type'] for f in frames], ['hello', 'message', 'hello'])
+        self.assertEqual(frames[1]['channel'], 'D1')
+
+
+class BackfillRateLimitTests(RtmTestCase):
+
+    server_options = {'rate_limit_rate': 0.5, 'retry_after': 0, 'seed': 1}
+
+    def test_rate_limited_pages_retried(self):
+        session = self.bot.rtm.create_session()
+        session.last_seen['C1'] = '0'
+
+        self.loop.run_until_complete(session.backfill())
+
+        self.assertEqual([f['ts'] for f in self.drain(session)],
+                         ['1.000001', '1.000002', '1.000003', '1.000004', '1.000005'])
+        self.assertGreater(self.server.calls['channels__history'], 3)
+
+
+class CloseTests(RtmTestCase):
+
+    server_options = {'latency': {'rtm__connect': 2}}
+
+    def test_close_with_full_queue(self):
+        session = self.bot.rtm.create_session(queue_size=1)
+        self.loop.run_until_complete(session.feed({'type': 'hello'}))
+
+        self.loop.run_until_complete(wait_for(session.close(), 1))
+
+        self.assertEqual(self.loop.run_until_complete(session.get_raw()), {'type': 'hello'})
+        self.assertIsNone(self.loop.run_until_complete(session.get_raw()))
+        self.assertIsNone(self.loop.run_until_complete(session.get_raw()))
+
+    def test_close_wakes_consumer(self):
+        session = self.bot.rtm.create_session()
+        consumer = self.loop.create_task(session.get())
+
+        self.loop.run_until_complete(session.close())
+
+        self.assertIsNone(self.loop.run_until_complete(wait_for(consumer, 1)))
+
+    def test_close_cancels_connection(self):
+        session = self.bot.rtm.create_session()
+        run = self.loop.create_task(session.run(reconnect=True))
+        self.loop.run_until_complete(wait_for(self.wait_call('rtm__connect'), 5))
+
+        self.loop.run_until_complete(session.close())
+        self.loop.run_until_complete(wait_for(run, 0.5))
+
+        self.assertTrue(session._connect_task.cancelled())
+        self.assertIsNone(session.websocket)
+
+    async def wait_call(self, endpoint):
+        while not self.server.calls[endpoint]:
+            await sleep(0.01)
+
+
+class KeepaliveTests(RtmTestCase):
+
+    def run_session(self, session, until):
+        async def run():
+            task = self.loop.create_task(session.run())
+            try:
+                while not until() and not task.done():
+                    await sleep(0.01)
+            finally:
+                await session.close()
+            await wait_for(task, 1)
+
+        self.loop.run_until_complete(wait_for(run(), 5))
+
+    def test_ping_measures_latency(self):
+        session = self.bot.rtm.create_session(ping_interval=0.05, ping_timeout=1)
+
+        self.run_session(session, lambda: len(session.latency) >= 2)
+
+        self.assertGreaterEqual(len(session.latency), 2)
+        self.assertEqual(session.rtt, session.latency.last)
+        self.assertLess(session.rtt, 1)
+        self.assertEqual(session._pings, {})
+        self.assertEqual([f['type'] for f in self.drain(session) if f is not None], ['hello'])
+
+    def test_stalled_websocket_closed(self):
+        session = self.bot.rtm.create_session(ping_interval=0.05, ping_timeout=0.1)
+
+        async def drop(data):
+            pass
+
+        # Pings are never sent, so no pong arrives
+        session.send = drop
+
+        with self.assertLogs(self.bot.logger, 'WARNING') as logs:
+            self.run_session(session, lambda: False)
+
+        self.assertIn('no pong in 0.1 seconds', logs.output[0])
+        self.assertEqual(len(session.latency), 0)
+        self.assertTrue(session.websocket.closed)
+
+    def test_no_keepalive(self):
+        session = self.bot.rtm.create_session(ping_interval=None)
+        sent = []
+
+        async def send(data):
+            sent.append(data)
+
+        session.send = send
+
+        start = self.loop.time()
+        self.run_session(session, lambda: self.loop.time() - start > 0.2)
+
+        self.assertEqual(sent, [])
+        self.assertEqual(self.drain(session)[0], {'type': 'hello'})
+
+    def test_unknown_pong_ignored(self):
+        session = self.bot.rtm.create_session()
+        session.last_received = 1
+
+        session._on_pong({'type': 'pong', 'reply_to': 42})
+
+        self.assertEqual(len(session.latency), 0)
@@ -0,0 +1,129 @@
+from asyncio import CancelledError, gather, new_event_loop, set_event_loop, sleep
+from unittest import TestCase
+from unittest.mock import patch
+
+from aioslackbot import Bot
+from aioslackbot.utils import _Flight, request_key
+
+
+class FakeResult:
+
+    def __init__(self, data, status=200):
+        self.data = data
+        self.status = status
+
+
+class SingleFlightTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+        self.bot = Bot('xoxb-fake', rate_limit=False, cache=False, loop=self.loop)
+        self.bot.service_client.call = self.fake_call
+        self.calls = []
+        self.error = None
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.bot.close())
+        set_event_loop(None)
+        self.loop.close()
+
+    async def fake_call(self, endpoint, payload=None, **kwargs):
+        self.calls.append((endpoint, payload.export_data()))
+        await sleep(0.01)
+        if self.error is not None:
+            raise self.error
+        return FakeResult({'ok': True, 'user': {'id': payload.user}})
+
+    def test_concurrent_calls_share_one(self):
+        responses = self.loop.run_until_complete(gather(*[self.bot.users.info(user='U1') for _ in range(3)]))
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertIs(responses[0], responses[1])
+        self.assertIs(responses[0], responses[2])
+        self.assertEqual(responses[0].user.id, 'U1')
+        self.assertEqual(self.bot.users._in_flight, {})
+
+    def test_different_requests_are_not_shared(self):
+        responses = self.loop.run_until_complete(gather(self.bot.users.info(user='U1'),
+                                                        self.bot.users.info(user='U2')))
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual([r.user.id for r in responses], ['U1', 'U2'])
+
+    def test_sequential_calls_are_not_shared(self):
+        self.loop.run_until_complete(self.bot.users.info(user='U1'))
+        self.loop.run_until_complete(self.bot.users.info(user='U1'))
+
+        self.assertEqual(len(self.calls), 2)
+
+    def test_error_is_raised_to_every_caller(self):
+        self.error = ValueError('boom')
+
+        results = self.loop.run_until_complete(gather(*[self.bot.users.info(user='U1') for _ in range(2)],
+                                                      return_exceptions=True))
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertIsInstance(results[0], ValueError)
+        self.assertIs(results[0], results[1])
+        self.assertEqual(self.bot.users._in_flight, {})
+
+    def test_cancelled_follower_does_not_cancel_call(self):
+        async def check():
+            first = self.loop.create_task(self.bot.users.info(user='U1'))
+            second = self.loop.create_task(self.bot.users.info(user='U1'))
+            await sleep(0)
+            second.cancel()
+            with self.assertRaises(CancelledError):
+                await second
+            return await first
+
+        response = self.loop.run_until_complete(check())
+
+        self.assertEqual(response.user.id, 'U1')
+        self.assertEqual(len(self.calls), 1)
+
+    def test_cancelled_leader_lets_follower_call_again(self):
+        async def check():
+            first = self.loop.create_task(self.bot.users.info(user='U1'))
+            second = self.loop.create_task(self.bot.users.info(user='U1'))
+            await sleep(0)
+            first.cancel()
+            with self.assertRaises(CancelledError):
+                await first
+            return await second
+
+        response = self.loop.run_until_complete(check())
+
+        self.assertEqual(response.user.id, 'U1')
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.bot.users._in_flight, {})
+
+    def test_keys_built_once_by_call(self):
+        async def check():
+            tasks = [self.loop.create_task(self.bot.users.info(user='U{}'.format(i))) for i in range(50)]
+            await sleep(0)
+            in_flight = len(self.bot.users._in_flight['info'])
+            return in_flight, await gather(*tasks)
+
+        with patch('aioslackbot.utils.request_key', side_effect=request_key) as build_key:
+            in_flight, responses = self.loop.run_until_complete(check())
+
+        self.assertEqual(len(self.calls), 50)
+        self.assertEqual(in_flight, 50)
+        self.assertEqual(build_key.call_count, 50)
+        self.assertEqual([r.user.id for r in responses], ['U{}'.format(i) for i in range(50)])
+        self.assertEqual(self.bot.users._in_flight, {})
+
+    def test_single_flight_has_no_key(self):
+        async def check():
+            task = self.loop.create_task(self.bot.users.info(user='U1'))
+            await sleep(0)
+            flight = self.bot.users._in_flight['info']
+            await task
+            return flight
+
+        flight = self.loop.run_until_complete(check())
+
+        self.assertIsInstance(flight, _Flight)
+        self.assertIsNone(flight.key)
@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+from aioslackbot.models import SelfInfo, TeamInfo, User
+from aioslackbot.snapshot import DynamicSnapshot, Snapshot, snapshot, snapshot_class
+
+USER = {'id': 'U1', 'name': 'john', 'deleted': False, 'is_admin': True}
+
+TEAM = {'id': 'T1', 'name': 'Team', 'icon': {'image_36': 'https://.../36.png'}}
+
+SELF = {'id': 'U2', 'name': 'bot',
+        'prefs': {'emoji_mode': 'default', 'muted_channels': ['C1', 'C2'], 'sidebar': {'collapsed': True}}}
+
+
+class SnapshotTests(TestCase):
+
+    def test_fields(self):
+        user = snapshot(User(data=USER))
+
+        self.assertIsInstance(user, Snapshot)
+        self.assertIs(snapshot_class(User), type(user))
+        self.assertEqual(user.name, 'john')
+        self.assertTrue(user.is_admin)
+        self.assertIsNone(user.color)
+
+    def test_nested_model(self):
+        team = snapshot(TeamInfo(data=TEAM))
+
+        self.assertIsInstance(team.icon, Snapshot)
+        self.assertEqual(team.icon.image_36, 'https://.../36.png')
+        self.assertEqual(team.export_data(), TeamInfo(data=TEAM).export_data())
+
+    def test_read_only(self):
+        user = snapshot(User(data=USER))
+
+        with self.assertRaises(AttributeError):
+            user.name = 'jane'
+        with self.assertRaises(AttributeError):
+            del user.name
+        with self.assertRaises(AttributeError):
+            snapshot(TeamInfo(data=TEAM)).icon.image_36 = None
+
+    def test_round_trip(self):
+        model = User(data=USER)
+        user = snapshot(model)
+
+        self.assertEqual(user.export_data(), model.export_data())
+        self.assertEqual(user.to_model().export_data(), model.export_data())
+        self.assertEqual(user, snapshot(User(data=USER)))
+        self.assertEqual(hash(user), hash(snapshot(User(data=USER))))
+
+    def test_replace(self):
+        user = snapshot(User(data=USER))
+        renamed = user._replace(name='jane')
+
+        self.assertEqual(renamed.name, 'jane')
+        self.assertEqual(user.name, 'john')
+
+    def test_dynamic_model_frozen(self):
+        info = snapshot(SelfInfo(data=SELF))
+
+        self.assertIsInstance(info.prefs, DynamicSnapshot)
+        self.assertEqual(info.prefs.emoji_mode, 'default')
+        self.assertEqual(info.prefs.muted_channels, ('C1', 'C2'))
+        self.assertTrue(info.prefs.sidebar.collapsed)
+        self.assertIsNone(info.prefs.unknown)
+
+        with self.assertRaises(AttributeError):
+            info.prefs.emoji_mode = 'apple'
+        with self.assertRaises(AttributeError):
+            info.prefs.sidebar.collapsed = False
+        with self.assertRaises(TypeError):
+            info.prefs._values['emoji_mode'] = 'apple'
+
+    def test_dynamic_model_round_trip(self):
+        model = SelfInfo(data=SELF)
+        info = snapshot(model)
+
+        self.assertEqual(info.export_data(), model.export_data())
+        self.assertEqual(info.to_model().export_data(), model.export_data())
+        self.assertEqual(hash(info), hash(snapshot(SelfInfo(data=SELF))))
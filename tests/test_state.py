@@ -0,0 +1,262 @@
+from asyncio import new_event_loop, set_event_loop
+from unittest import TestCase
+
+from aioslackbot import Bot as SlackBot
+from aioslackbot.dispatcher import EventDispatcher
+from aioslackbot.models import Bot, Channel, Group, User, UsersListRequest, UsersListResponse
+from aioslackbot.snapshot import Snapshot
+from aioslackbot.state import WorkspaceState
+from aioslackbot.testing import FakeSlackServer
+
+
+def user_data(user_id, name, updated):
+    return {'id': user_id, 'name': name, 'updated': updated}
+
+
+class FakeStream:
+
+    def __init__(self, page):
+        self.page = page
+        self.response = None
+
+    async def __aiter__(self):
+        for data in self.page.get('members', ()):
+            yield 'members', data
+        self.response = UsersListResponse(data={key: value for key, value in self.page.items()
+                                                if key != 'members'})
+
+
+class FakeUsersModule:
+    """
+    Serves ``users.list`` pages keyed by request cursor.
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def stream_list_page(self, request, raw=False):
+        self.requests.append(request.export_data())
+        return FakeStream(self.pages[request.cursor])
+
+
+class SyncUsersTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+        self.state = WorkspaceState()
+        for data in (user_data('U1', 'john', 1000), user_data('U2', 'jane', 1000), user_data('U3', 'gone', 1000)):
+            self.state.set_user(User(data=data))
+
+    def tearDown(self):
+        set_event_loop(None)
+        self.loop.close()
+
+    def sync(self, pages, **kwargs):
+        users_module = FakeUsersModule(pages)
+        result = self.loop.run_until_complete(self.state.sync_users(users_module, **kwargs))
+        return result, users_module
+
+    def test_sync(self):
+        unchanged = self.state.get_user('U1')
+        pages = {None: {'ok': True, 'members': [user_data('U1', 'john', 1000), user_data('U2', 'janet', 2000)],
+                        'response_metadata': {'next_cursor': 'abc'}},
+                 'abc': {'ok': True, 'members': [user_data('U4', 'new', 1000)],
+                         'response_metadata': {'next_cursor': ''}}}
+
+        result, users_module = self.sync(pages, request=UsersListRequest(limit=2))
+
+        self.assertEqual(tuple(result), (True, 1, 1, 1, 1))
+        self.assertEqual(result.changed, 3)
+        self.assertEqual([request.get('cursor') for request in users_module.requests], [None, 'abc'])
+        self.assertEqual({request['limit'] for request in users_module.requests}, {2})
+
+        self.assertIs(self.state.get_user('U1'), unchanged)
+        self.assertEqual(self.state.get_user('U2').name, 'janet')
+        self.assertIs(self.state.get_user_by_name('janet'), self.state.get_user('U2'))
+        self.assertIsNone(self.state.get_user_by_name('jane'))
+        self.assertIsNone(self.state.get_user('U3'))
+        self.assertIsNone(self.state.get_user_by_name('gone'))
+        self.assertEqual(self.state.get_user('U4').name, 'new')
+
+    def test_keep_not_listed(self):
+        result, _ = self.sync({None: {'ok': True, 'members': [user_data('U1', 'john', 1000)]}}, remove=False)
+
+        self.assertEqual(tuple(result), (True, 0, 0, 0, 1))
+        self.assertIsNotNone(self.state.get_user('U3'))
+
+    def test_failed_page_does_not_remove(self):
+        pages = {None: {'ok': True, 'members': [user_data('U1', 'john', 2000)],
+                        'response_metadata': {'next_cursor': 'abc'}},
+                 'abc': {'ok': False, 'error': 'ratelimited'}}
+
+        result, _ = self.sync(pages)
+
+        self.assertEqual(tuple(result), (False, 0, 1, 0, 0))
+        self.assertEqual(len(self.state.users), 3)
+
+    def test_compact_users(self):
+        self.state = WorkspaceState(compact_users=True)
+        self.state.set_user(User(data=user_data('U1', 'john', 1000)))
+
+        result, _ = self.sync({None: {'ok': True, 'members': [user_data('U1', 'john', 1000),
+                                                              user_data('U2', 'jane', 1000)]}})
+
+        self.assertEqual(tuple(result), (True, 1, 0, 0, 1))
+        self.assertIsInstance(self.state.get_user('U2'), Snapshot)
+
+
+class StateEventsTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+        self.state = WorkspaceState()
+        self.dispatcher = EventDispatcher()
+        self.state.register(self.dispatcher)
+        self.state.set_channel(Channel(data={'id': 'C1', 'name': 'general', 'members': ['U1']}))
+        self.state.set_group(Group(data={'id': 'G1', 'name': 'secret', 'members': ['U1']}))
+        self.state.set_user(User(data=user_data('U1', 'john', 1000)))
+
+    def tearDown(self):
+        set_event_loop(None)
+        self.loop.close()
+
+    def dispatch(self, data):
+        self.loop.run_until_complete(self.dispatcher.dispatch(data))
+
+    def test_channel_created(self):
+        self.dispatch({'type': 'channel_created', 'channel': {'id': 'C2', 'name': 'random'}})
+
+        self.assertEqual(self.state.get_channel_by_name('random').id, 'C2')
+
+    def test_channel_rename(self):
+        channel = self.state.get_channel('C1')
+
+        self.dispatch({'type': 'channel_rename', 'channel': {'id': 'C1', 'name': 'main'}})
+
+        self.assertIs(self.state.get_channel_by_name('main'), channel)
+        self.assertIsNone(self.state.get_channel_by_name('general'))
+        self.assertEqual(list(channel.members), ['U1'])
+
+    def test_unknown_channel_rename(self):
+        self.dispatch({'type': 'channel_rename', 'channel': {'id': 'C2', 'name': 'random'}})
+
+        self.assertEqual(self.state.get_channel('C2').name, 'random')
+
+    def test_channel_deleted(self):
+        self.dispatch({'type': 'channel_deleted', 'channel': 'C1'})
+
+        self.assertIsNone(self.state.get_channel('C1'))
+        self.assertIsNone(self.state.get_channel_by_name('general'))
+
+    def test_archive(self):
+        self.dispatch({'type': 'channel_archive', 'channel': 'C1', 'user': 'U1'})
+        self.dispatch({'type': 'group_archive', 'channel': 'G1'})
+
+        self.assertTrue(self.state.get_channel('C1').is_archived)
+        self.assertTrue(self.state.get_group('G1').is_archived)
+
+        self.dispatch({'type': 'channel_unarchive', 'channel': 'C1', 'user': 'U1'})
+
+        self.assertFalse(self.state.get_channel('C1').is_archived)
+
+    def test_group_rename(self):
+        self.dispatch({'type': 'group_rename', 'channel': {'id': 'G1', 'name': 'private'}})
+
+        self.assertEqual(self.state.get_group_by_name('private').id, 'G1')
+        self.assertIsNone(self.state.get_group_by_name('secret'))
+
+    def test_group_left(self):
+        self.dispatch({'type': 'group_left', 'channel': 'G1'})
+
+        self.assertIsNone(self.state.get_group('G1'))
+        self.assertIsNone(self.state.get_group_by_name('secret'))
+
+    def test_im_created(self):
+        self.dispatch({'type': 'im_created', 'user': 'U1', 'channel': {'id': 'D1', 'user': 'U1'}})
+
+        self.assertEqual(self.state.get_im('D1').user, 'U1')
+
+    def test_member_joined_and_left(self):
+        self.dispatch({'type': 'member_joined_channel', 'channel': 'C1', 'user': 'U2'})
+        self.dispatch({'type': 'member_joined_channel', 'channel': 'C1', 'user': 'U2'})
+        self.dispatch({'type': 'member_joined_channel', 'channel': 'G1', 'user': 'U3'})
+
+        self.assertEqual(list(self.state.get_channel('C1').members), ['U1', 'U2'])
+        self.assertEqual(list(self.state.get_group('G1').members), ['U1', 'U3'])
+
+        self.dispatch({'type': 'member_left_channel', 'channel': 'C1', 'user': 'U1'})
+        self.dispatch({'type': 'member_left_channel', 'channel': 'C1', 'user': 'U9'})
+        self.dispatch({'type': 'member_left_channel', 'channel': 'C9', 'user': 'U1'})
+
+        self.assertEqual(list(self.state.get_channel('C1').members), ['U2'])
+
+    def test_user_change(self):
+        self.dispatch({'type': 'user_change', 'user': user_data('U1', 'johnny', 2000)})
+        self.dispatch({'type': 'team_join', 'user': user_data('U2', 'jane', 2000)})
+
+        self.assertEqual(self.state.get_user('U1').name, 'johnny')
+        self.assertIsNone(self.state.get_user_by_name('john'))
+        self.assertEqual(self.state.get_user_by_name('jane').id, 'U2')
+
+    def test_bot_added(self):
+        self.dispatch({'type': 'bot_added', 'bot': {'id': 'B1', 'name': 'helper'}})
+        self.dispatch({'type': 'bot_changed', 'bot': {'id': 'B1', 'name': 'assistant'}})
+
+        self.assertEqual(self.state.get_bot('B1').name, 'assistant')
+
+
+class GetFromStateTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+        self.server = FakeSlackServer(responses={
+            'users__info': lambda data: {'ok': True, 'user': user_data(data['user'], 'remote', 1000)},
+            'channels__info': lambda data: {'ok': True, 'channel': {'id': data['channel'], 'name': 'remote'}},
+            'groups__info': lambda data: {'ok': True, 'group': {'id': data['channel'], 'name': 'remote'}},
+            'bots__info': lambda data: {'ok': True, 'bot': {'id': data['bot'], 'name': 'remote'}}})
+        self.loop.run_until_complete(self.server.start())
+        self.bot = SlackBot('xoxb-fake', base_path=self.server.base_path, cache=False, loop=self.loop)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.bot.close())
+        self.loop.run_until_complete(self.server.stop())
+        set_event_loop(None)
+        self.loop.close()
+
+    def test_get(self):
+        state = self.bot.state
+        state.set_user(User(data=user_data('U1', 'john', 1000)))
+        state.set_channel(Channel(data={'id': 'C1', 'name': 'general'}))
+        state.set_group(Group(data={'id': 'G1', 'name': 'secret'}))
+        state.set_bot(Bot(data={'id': 'B1', 'name': 'helper'}))
+
+        for module, entity_id, name in ((self.bot.users, 'U1', 'john'), (self.bot.channels, 'C1', 'general'),
+                                        (self.bot.groups, 'G1', 'secret'), (self.bot.bots, 'B1', 'helper')):
+            with self.subTest(entity_id=entity_id):
+                self.assertEqual(self.loop.run_until_complete(module.get(entity_id)).name, name)
+
+        self.assertEqual(sum(self.server.calls.values()), 0)
+
+    def test_get_missing(self):
+        for module, entity_id, getter in ((self.bot.users, 'U2', 'get_user'),
+                                          (self.bot.channels, 'C2', 'get_channel'),
+                                          (self.bot.groups, 'G2', 'get_group'),
+                                          (self.bot.bots, 'B2', 'get_bot')):
+            with self.subTest(entity_id=entity_id):
+                entity = self.loop.run_until_complete(module.get(entity_id))
+
+                self.assertEqual(entity.name, 'remote')
+                self.assertIs(getattr(self.bot.state, getter)(entity_id), entity)
+                self.assertIs(self.loop.run_until_complete(module.get(entity_id)), entity)
+
+        self.assertEqual(set(self.server.calls.values()), {1})
+
+    def test_get_not_found(self):
+        self.server.responses['channels__info'] = {'ok': False, 'error': 'channel_not_found'}
+
+        self.assertIsNone(self.loop.run_until_complete(self.bot.channels.get('C3')))
+        self.assertIsNone(self.bot.state.get_channel('C3'))
@@ -0,0 +1,120 @@
+from asyncio import new_event_loop, set_event_loop
+from json import JSONDecodeError, dumps
+from unittest import TestCase
+
+from aioslackbot import Bot
+from aioslackbot.paging import PageError
+from aioslackbot.streaming import iter_json_object
+from aioslackbot.testing import FakeSlackServer
+
+DOCUMENT = {
+    'ok': True,
+    'self': {'id': 'U1', 'name': 'bot'},
+    'users': [{'id': 'U1', 'real_name': 'José \U0001f600', 'tz_offset': -18000.5},
+              {'id': 'U2', 'profile': {'title': 'say "hi", [then] {bye}\\n'}},
+              {'id': 'U3', 'deleted': False, 'has_2fa': None}],
+    'channels': [],
+    'url': 'wss://example.com/websocket/abc',
+    'cache_ts': 1483228800,
+}
+
+
+async def iter_chunks(data, size):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+class IterJsonObjectTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+
+    def tearDown(self):
+        set_event_loop(None)
+        self.loop.close()
+
+    def parse(self, data, size, stream_fields=()):
+        async def collect():
+            return [item async for item in iter_json_object(iter_chunks(data, size), stream_fields)]
+
+        return self.loop.run_until_complete(collect())
+
+    def test_whole_document(self):
+        items = self.parse(dumps(DOCUMENT).encode(), 2 ** 16)
+
+        self.assertEqual(dict(items), DOCUMENT)
+
+    def test_every_chunk_size(self):
+        # Chunks split inside strings, escapes, numbers, literals and multi-byte characters
+        data = dumps(DOCUMENT, ensure_ascii=False, indent=1).encode()
+        expected = [('ok', True), ('self', DOCUMENT['self'])]
+        expected += [('users', user) for user in DOCUMENT['users']]
+        expected += [('url', DOCUMENT['url']), ('cache_ts', DOCUMENT['cache_ts'])]
+
+        for size in range(1, 40):
+            with self.subTest(size=size):
+                self.assertEqual(self.parse(data, size, ('users', 'channels')), expected)
+
+    def test_truncated_number(self):
+        self.assertEqual(self.parse(b'{"a": 12345.5, "b": 1e10}', 3), [('a', 12345.5), ('b', 1e10)])
+
+    def test_not_streamed_field(self):
+        self.assertEqual(self.parse(b'{"users": [1, 2]}', 1), [('users', [1, 2])])
+
+    def test_empty_object(self):
+        self.assertEqual(self.parse(b' { } ', 1), [])
+
+    def test_not_object(self):
+        with self.assertRaises(ValueError):
+            self.parse(b'[1, 2]', 1)
+
+    def test_truncated_document(self):
+        with self.assertRaises(ValueError):
+            self.parse(b'{"ok": true, "users": [{"id": "U1"', 4, ('users',))
+
+    def test_invalid_value(self):
+        with self.assertRaises(JSONDecodeError):
+            self.parse(b'{"ok": tru}', 2)
+
+
+class UsersStreamTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+        self.pages = {None: {'ok': True, 'members': [{'id': 'U1'}, {'id': 'U2'}],
+                             'response_metadata': {'next_cursor': 'c2'}},
+                      'c2': {'ok': True, 'members': [{'id': 'U3'}]}}
+        self.server = FakeSlackServer(responses={'users__list': lambda data: self.pages[data.get('cursor')]})
+        self.loop.run_until_complete(self.server.start())
+        self.bot = Bot('xoxb-fake', base_path=self.server.base_path, rate_limit=False, loop=self.loop)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.bot.close())
+        self.loop.run_until_complete(self.server.stop())
+        set_event_loop(None)
+        self.loop.close()
+
+    def collect(self, users):
+        async def collect():
+            async for user in self.bot.users.stream_list():
+                users.append(user.id)
+
+        self.loop.run_until_complete(collect())
+
+    def test_stream_list(self):
+        users = []
+        self.collect(users)
+
+        self.assertEqual(users, ['U1', 'U2', 'U3'])
+
+    def test_stream_list_error(self):
+        self.pages['c2'] = {'ok': False, 'error': 'invalid_cursor'}
+        users = []
+
+        with self.assertRaises(PageError) as ctx:
+            self.collect(users)
+
+        self.assertEqual(ctx.exception.error, 'invalid_cursor')
+        self.assertEqual(users, ['U1', 'U2'])
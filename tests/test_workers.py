@@ -0,0 +1,234 @@
+import os
+from asyncio import TimeoutError, gather, new_event_loop, set_event_loop, sleep, wait_for
+from collections import Counter
+from unittest import TestCase
+
+from aioslackbot.workers import HashRing, WorkerCrashedError, WorkerSupervisor
+
+
+class HashRingTests(TestCase):
+
+    def test_empty(self):
+        with self.assertRaises(KeyError):
+            HashRing().get_node('T1')
+
+    def test_stable(self):
+        ring = HashRing(range(4))
+
+        self.assertEqual([ring.get_node('T{}'.format(i)) for i in range(100)],
+                         [HashRing(range(4)).get_node('T{}'.format(i)) for i in range(100)])
+
+    def test_balanced(self):
+        ring = HashRing(range(4))
+        counts = Counter(ring.get_node('T{}'.format(i)) for i in range(4000))
+
+        self.assertEqual(set(counts), {0, 1, 2, 3})
+        self.assertGreater(min(counts.values()), 500)
+
+    def test_add_only_moves_keys_to_new_node(self):
+        ring = HashRing(range(3))
+        before = {i: ring.get_node(i) for i in range(1000)}
+        ring.add(3)
+        after = {i: ring.get_node(i) for i in range(1000)}
+
+        moved = [i for i in before if before[i] != after[i]]
+        self.assertTrue(moved)
+        self.assertTrue(all(after[i] == 3 for i in moved))
+
+    def test_remove_only_moves_keys_of_removed_node(self):
+        ring = HashRing(range(4))
+        before = {i: ring.get_node(i) for i in range(1000)}
+        ring.remove(2)
+        after = {i: ring.get_node(i) for i in range(1000)}
+
+        self.assertTrue(all(before[i] == after[i] for i in before if before[i] != 2))
+        self.assertNotIn(2, after.values())
+
+
+class FakeResponse:
+
+    def __init__(self, data):
+        self.data = data
+
+    def export_data(self):
+        return self.data
+
+
+RTM_RUNS = {}
+"""
+Keyword arguments of RTM sessions started on worker process, by workspace.
+"""
+
+
+class FakeRtmModule:
+
+    def __init__(self, team_id):
+        self.team_id = team_id
+
+    async def run(self, **kwargs):
+        RTM_RUNS[self.team_id] = kwargs
+        await sleep(3600)
+
+
+class FakeBot:
+
+    def __init__(self, team_id):
+        self.team_id = team_id
+        self.rtm = FakeRtmModule(team_id)
+
+    async def rtm_options(self):
+        return FakeResponse(RTM_RUNS.get(self.team_id))
+
+    async def echo(self, **kwargs):
+        return FakeResponse(dict(kwargs, team_id=self.team_id, pid=os.getpid()))
+
+    async def hang(self):
+        await sleep(3600)
+
+    async def crash(self):
+        os._exit(1)
+
+    async def fail(self):
+        raise ValueError('boom')
+
+
+def setup_fake_bots(pool):
+    # Calls are served by fake bots, so no Web API request leaves worker
+    pool.get = FakeBot
+
+
+class WorkerSupervisorTests(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+        self.supervisor = WorkerSupervisor(setup=setup_fake_bots, workers=2, restart_backoff=0.1,
+                                           max_restart_backoff=1, call_timeout=5, loop=self.loop)
+        self.supervisor.start()
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.supervisor.stop())
+        set_event_loop(None)
+        self.loop.close()
+
+    def find_team(self, worker_id):
+        return next('T{}'.format(i) for i in range(100)
+                    if self.supervisor.get_worker('T{}'.format(i)).worker_id == worker_id)
+
+    def wait_dead(self, worker):
+        async def wait():
+            while worker.alive:
+                await sleep(0.01)
+
+        self.loop.run_until_complete(wait())
+
+    def test_call(self):
+        result = self.loop.run_until_complete(self.supervisor.call('T1', 'echo', text='Hello'))
+
+        self.assertEqual(result['text'], 'Hello')
+        self.assertEqual(result['team_id'], 'T1')
+        self.assertEqual(result['pid'], self.supervisor.get_worker('T1').process.pid)
+
+    def test_calls_routed_by_team(self):
+        teams = [self.find_team(0), self.find_team(1)]
+
+        results = self.loop.run_until_complete(gather(*[self.supervisor.call(team_id, 'echo')
+                                                        for team_id in teams]))
+
+        self.assertEqual([r['pid'] for r in results],
+                         [w.process.pid for w in self.supervisor.workers])
+
+    def test_call_error(self):
+        with self.assertRaisesRegex(RuntimeError, 'boom'):
+            self.loop.run_until_complete(self.supervisor.call('T1', 'fail'))
+
+    def test_call_timeout(self):
+        with self.assertRaises(TimeoutError):
+            self.loop.run_until_complete(self.supervisor.call('T1', 'hang', timeout=0.1))
+        self.assertEqual(self.supervisor._calls, {})
+
+    def test_crash_fails_pending_calls(self):
+        team_id = self.find_team(0)
+        pending = self.loop.create_task(self.supervisor.call(team_id, 'hang'))
+        self.loop.run_until_complete(sleep(0.1))
+
+        with self.assertRaises(WorkerCrashedError):
+            self.loop.run_until_complete(gather(pending, self.supervisor.call(team_id, 'crash')))
+        self.assertTrue(pending.done())
+        self.assertIsInstance(pending.exception(), WorkerCrashedError)
+
+    def test_crash_does_not_block_other_workers(self):
+        worker = self.supervisor.workers[0]
+        worker.process.kill()
+        self.wait_dead(worker)
+
+        result = self.loop.run_until_complete(self.supervisor.call(self.find_team(1), 'echo'))
+        self.assertEqual(result['pid'], self.supervisor.workers[1].process.pid)
+
+        with self.assertRaises(WorkerCrashedError):
+            self.loop.run_until_complete(self.supervisor.call(self.find_team(0), 'echo'))
+
+    def test_restart_with_backoff(self):
+        worker = self.supervisor.workers[0]
+        team_id = self.find_team(0)
+
+        async def crash_and_restart():
+            pid = worker.process.pid
+            worker.process.kill()
+            while worker.alive:
+                await sleep(0.01)
+            self.supervisor.check_workers()
+            delay = worker.restart_at - self.loop.time()
+            while not worker.alive:
+                await sleep(0.01)
+                self.supervisor.check_workers()
+            self.assertNotEqual(worker.process.pid, pid)
+            return delay
+
+        first = self.loop.run_until_complete(crash_and_restart())
+        second = self.loop.run_until_complete(crash_and_restart())
+
+        self.assertAlmostEqual(first, 0.1, delta=0.05)
+        self.assertAlmostEqual(second, 0.2, delta=0.05)
+        self.assertEqual(worker.restarts, 2)
+
+        result = self.loop.run_until_complete(self.supervisor.call(team_id, 'echo'))
+        self.assertEqual(result['pid'], worker.process.pid)
+
+    def wait_rtm_options(self, team_id):
+        async def wait():
+            while True:
+                options = await self.supervisor.call(team_id, 'rtm_options')
+                if options is not None:
+                    return options
+                await sleep(0.01)
+
+        return self.loop.run_until_complete(wait_for(wait(), 5))
+
+    def test_rtm_sessions_reconnect(self):
+        self.supervisor.add_team('T1', 'xoxb-1')
+
+        self.assertEqual(self.wait_rtm_options('T1'), {'reconnect': True})
+
+    def test_rtm_options(self):
+        self.loop.run_until_complete(self.supervisor.stop())
+        self.supervisor = WorkerSupervisor({'T1': 'xoxb-1'}, setup=setup_fake_bots, workers=1,
+                                           rtm_options={'reconnect': True, 'ping_interval': 5}, loop=self.loop)
+        self.supervisor.start()
+
+        self.assertEqual(self.wait_rtm_options('T1'), {'reconnect': True, 'ping_interval': 5})
+
+        self.supervisor.add_team('T2', 'xoxb-2')
+
+        self.assertEqual(self.wait_rtm_options('T2'), {'reconnect': True, 'ping_interval': 5})
+
+    def test_run_is_cancelled(self):
+        self.loop.run_until_complete(self.supervisor.stop())
+        task = self.loop.create_task(self.supervisor.run())
+        self.loop.run_until_complete(sleep(0.1))
+        task.cancel()
+
+        self.loop.run_until_complete(gather(task, return_exceptions=True))
+
+        self.assertTrue(task.cancelled())
+        self.assertFalse(any(worker.alive for worker in self.supervisor.workers))